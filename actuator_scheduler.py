@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Actuator Scheduler for Wire Checker
+One thread owns the status LEDs, buzzer and solenoids. Callers queue levels
+or timed sequences (beep patterns, LED blinks, solenoid pulses) and return
+at once, so the scan loop never sleeps for a beep while holding status_lock.
+
+Outputs are addressed by name and switched on/off logically; outputs listed
+as inverted (the buzzer) are on when their pin is LOW. Any new command for
+an output preempts the sequence still running on it.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+
+# Default beep timing (seconds)
+BEEP_ON = 0.1
+BEEP_OFF = 0.1
+
+# Default LED blink timing (seconds)
+BLINK_ON = 0.25
+BLINK_OFF = 0.25
+
+class ActuatorScheduler(threading.Thread):
+    """Applies queued actuator commands on its own thread"""
+
+    def __init__(self, gpio, outputs, inverted=()):
+        super().__init__(daemon=True)
+        self.gpio = gpio
+        self.outputs = dict(outputs)
+        self.inverted = set(inverted)
+        self.commands = queue.Queue()
+        # Last level written per output, for status displays
+        self.levels = {}
+
+    # Commands (safe to call from any thread)
+
+    def set(self, **levels):
+        """Switch outputs on (True) or off (False), e.g. set(red=True, green=False)"""
+        self.commands.put(('set', levels))
+
+    def play(self, name, steps):
+        """Run a sequence of (on, seconds) steps on one output"""
+        self.commands.put(('play', name, list(steps)))
+
+    def beep(self, times=1, on=BEEP_ON, off=BEEP_OFF, name='buzzer'):
+        self.play(name, [(True, on), (False, off)] * times)
+
+    def blink(self, name, times=3, on=BLINK_ON, off=BLINK_OFF):
+        self.play(name, [(True, on), (False, off)] * times)
+
+    def pulse(self, name, seconds):
+        """Switch an output on for seconds, then off (e.g. a solenoid kick)"""
+        self.play(name, [(True, seconds), (False, 0)])
+
+    def stop(self, timeout=2.0):
+        """Apply everything queued so far, then end the thread"""
+        self.commands.put(None)
+        if self.is_alive():
+            self.join(timeout)
+
+    # Scheduler thread
+
+    def _write(self, name, on):
+        high = not on if name in self.inverted else bool(on)
+        try:
+            self.gpio.output(self.outputs[name], self.gpio.HIGH if high else self.gpio.LOW)
+            self.levels[name] = bool(on)
+        except Exception as e:
+            print(f"Error setting {name}: {e}")
+
+    def _advance(self, active, now):
+        """Write every sequence step that is due; return the next due time"""
+        next_due = None
+        for name in list(active):
+            sequence = active[name]
+            while sequence[0] <= now:
+                if not sequence[1]:
+                    del active[name]
+                    break
+                on, seconds = sequence[1].popleft()
+                self._write(name, on)
+                # Step times follow the schedule, not the wake-up, so a late
+                # wake does not stretch the pattern
+                sequence[0] += seconds
+            else:
+                if next_due is None or sequence[0] < next_due:
+                    next_due = sequence[0]
+        return next_due
+
+    def run(self):
+        # name -> [due time of next step, deque of remaining steps]
+        active = {}
+        while True:
+            next_due = self._advance(active, time.monotonic())
+            timeout = None if next_due is None else max(0.0, next_due - time.monotonic())
+            try:
+                command = self.commands.get(timeout=timeout)
+            except queue.Empty:
+                continue
+
+            if command is None:
+                break
+            if command[0] == 'set':
+                for name, on in command[1].items():
+                    active.pop(name, None)
+                    self._write(name, on)
+            elif command[0] == 'play':
+                _, name, steps = command
+                active[name] = [time.monotonic(), deque(steps)]
+
+        # Never leave a buzzer or solenoid on mid-pattern
+        for name in active:
+            self._write(name, False)
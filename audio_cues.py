@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Audio Cue Engine for Wire Checker
+Decodes every cue once at startup into pygame.mixer.Sound buffers and plays
+them on a reserved mixer channel, so a verdict cue starts without disk I/O,
+extra threads or waiting on a lock.
+
+Cues have a priority. A cue cuts off a playing cue of lower or equal
+priority (NOT GOOD cuts off GOOD, a new GOOD restarts GOOD); a cue of lower
+priority is queued behind the one playing. Every play records the latency
+from the verdict to the moment the mixer accepted the cue, plus the mixer
+buffer the sound still has to pass through.
+
+A cue can be followed by pre-rendered phrases (see speech_cache.py); the
+clips are joined into one Sound so they play back to back with no gaps and
+no end-of-sound polling.
+"""
+
+import time
+from collections import deque
+from tracing import traced
+
+# Small mixer buffer keeps output latency low (frames)
+CUE_BUFFER_SIZE = 512
+CUE_FREQUENCY = 44100
+
+# Latency samples kept for statistics
+LATENCY_WINDOW = 200
+
+# Joined cue + phrase sounds kept in memory
+JOINED_CACHE_SIZE = 32
+
+class AudioCueEngine:
+    """Preloaded verdict cues on a dedicated mixer channel"""
+
+    def __init__(self, cues, priorities=None, mixer=None, buffer_size=CUE_BUFFER_SIZE):
+        # cues: {name: file path}; priorities: {name: int}, higher wins
+        if mixer is None:
+            import pygame
+            mixer = pygame.mixer
+        if not mixer.get_init():
+            mixer.init(frequency=CUE_FREQUENCY, buffer=buffer_size)
+        self.mixer = mixer
+        self.priorities = priorities or {}
+        self.buffer_latency = buffer_size / float((mixer.get_init() or (CUE_FREQUENCY,))[0])
+
+        self.sounds = {}
+        self.joined = {}
+        self.load(cues)
+
+        # Keep channel 0 out of pygame's automatic channel picking
+        mixer.set_reserved(1)
+        self.channel = mixer.Channel(0)
+        self.playing = None
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.preempted = 0
+        self.queued = 0
+
+    def load(self, cues):
+        """Decode more cues into memory; returns the names that loaded"""
+        loaded = []
+        for name, path in cues.items():
+            try:
+                self.sounds[name] = self.mixer.Sound(path)
+                loaded.append(name)
+            except Exception as e:
+                print(f"Error loading audio cue {name} ({path}): {e}")
+        return loaded
+
+    def _joined(self, names):
+        """One Sound for a cue followed by phrases, built once per combination"""
+        sound = self.joined.get(names)
+        if sound is None:
+            raw = b''.join(self.sounds[name].get_raw() for name in names if name in self.sounds)
+            sound = self.mixer.Sound(buffer=raw)
+            if len(self.joined) >= JOINED_CACHE_SIZE:
+                self.joined.pop(next(iter(self.joined)))
+            self.joined[names] = sound
+        return sound
+
+    @traced('audio', 'play_cue')
+    def play(self, name, verdict_time=None, then=()):
+        """Start cue name, followed by the phrases named in then;
+        verdict_time is time.monotonic() of the verdict.
+        Returns False if the cue could not be loaded."""
+        sound = self.sounds.get(name)
+        if sound is None:
+            return False
+        then = tuple(phrase for phrase in then if phrase in self.sounds)
+        if then:
+            sound = self._joined((name,) + then)
+
+        channel = self.channel
+        priority = self.priorities.get(name, 0)
+        if channel.get_busy() and self.playing is not None:
+            if priority < self.priorities.get(self.playing, 0):
+                channel.queue(sound)
+                self.queued += 1
+                return True
+            self.preempted += 1
+
+        channel.play(sound)
+        self.playing = name
+        if verdict_time is not None:
+            self.latencies.append(time.monotonic() - verdict_time + self.buffer_latency)
+        return True
+
+    def stop(self):
+        self.channel.stop()
+        self.playing = None
+
+    def latency_stats(self):
+        """Return {'count', 'p50_ms', 'p99_ms', 'max_ms'} over recent cues"""
+        samples = sorted(self.latencies)
+        if not samples:
+            return {'count': 0, 'p50_ms': None, 'p99_ms': None, 'max_ms': None}
+
+        def percentile(fraction):
+            return round(samples[min(len(samples) - 1, int(fraction * len(samples)))] * 1000, 2)
+
+        return {'count': len(samples), 'p50_ms': percentile(0.50),
+                'p99_ms': percentile(0.99), 'max_ms': round(samples[-1] * 1000, 2)}
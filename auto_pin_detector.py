@@ -14,6 +14,8 @@ except ImportError:
     from mock_gpio import GPIO
     RASPBERRY_PI = False
 
+from settle_calibration import DEFAULT_SETTLE_TIME, calibrate
+
 class AutoPinDetector:
     def __init__(self, root):
         self.root = root
@@ -27,6 +29,10 @@ class AutoPinDetector:
         self.available_pins = [5, 6, 7, 8, 9, 10, 11, 12, 14, 16, 17, 19, 20, 21, 22, 23, 24, 25, 26, 27]
         self.reserved_pins = [2, 3, 4, 13, 15, 18]  # LEDs, solenoids, buzzer
         
+        # Per-pin settle budgets calibrated on the detected harness (seconds);
+        # an unknown harness is always probed with DEFAULT_SETTLE_TIME
+        self.settle_times = {}
+        
         # Setup GPIO
         if RASPBERRY_PI:
             GPIO.setmode(GPIO.BCM)
@@ -162,6 +168,7 @@ class AutoPinDetector:
         """Start auto pin detection"""
         self.is_detecting = True
         self.detected_pairs = []
+        self.settle_times = {}
         
         # Update UI
         self.start_btn.config(state='disabled')
@@ -211,7 +218,9 @@ class AutoPinDetector:
                             # Test connection
                             if self.test_connection(out_pin, in_pin):
                                 connection = (out_pin, in_pin)
-                                if connection not in detected_connections:
+                                # Each wire is also found from its other end
+                                if (connection not in detected_connections and
+                                        connection[::-1] not in detected_connections):
                                     detected_connections.append(connection)
                                     self.update_results(f"✅ Found connection: GPIO{out_pin} → GPIO{in_pin}\n")
                             
@@ -229,6 +238,10 @@ class AutoPinDetector:
             # Process results
             if detected_connections:
                 self.detected_pairs = detected_connections
+                
+                # Measure settle times on the sample harness for the saved config
+                self.update_results("Calibrating settle times...\n")
+                self.settle_times = calibrate(GPIO, detected_connections)
                 self.update_results(f"\n🎉 Detection complete! Found {len(detected_connections)} connections.\n")
                 self.status_label.config(text=f"✅ Found {len(detected_connections)} pin pairs", 
                                        bg='#d4edda', fg='#155724')
@@ -251,12 +264,12 @@ class AutoPinDetector:
         try:
             # Send HIGH signal
             GPIO.output(out_pin, GPIO.HIGH)
-            time.sleep(0.01)
+            time.sleep(DEFAULT_SETTLE_TIME)
             high_received = GPIO.input(in_pin)
             
             # Send LOW signal  
             GPIO.output(out_pin, GPIO.LOW)
-            time.sleep(0.01)
+            time.sleep(DEFAULT_SETTLE_TIME)
             low_received = GPIO.input(in_pin)
             
             # Connection exists if input follows output
@@ -293,7 +306,8 @@ class AutoPinDetector:
             'product_no': product_no,
             'wire_pairs': [],
             'detection_method': 'auto_detect',
-            'detected_at': time.strftime('%Y-%m-%d %H:%M:%S')
+            'detected_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'settle_times': {}
         }
         
         for i, (out_pin, in_pin) in enumerate(self.detected_pairs):
@@ -302,6 +316,9 @@ class AutoPinDetector:
                 'pin_out': out_pin,
                 'pin_in': in_pin
             })
+            for pin in (out_pin, in_pin):
+                if pin in self.settle_times:
+                    config_data['settle_times'][str(pin)] = round(self.settle_times[pin], 6)
         
         # Save to file
         config_file = f'auto_detected_{product_no.replace("-", "_").lower()}.json'
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Database Benchmark for Wire Checker
+Times the DatabaseManager calls a station makes on every scan and UI update
+(get_current_cycle, update_cycle_count, count_export_backlog) on a scratch
+database, once with a connection per call and once with the persistent
+tuned connections (WIRE_CHECKER_DB_PERSISTENT=1), and reports p50/p99 per
+call for both.
+
+Usage:
+    python3 bench_database.py [--calls 2000] [--output bench_database.json]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+from database_manager import DatabaseManager
+
+CALLS = ('get_current_cycle', 'update_cycle_count', 'count_export_backlog')
+
+STATUSES = ("GOOD", "OPEN", "NOT GOOD", "OPEN")
+
+# Completed cycles in the scratch database, about a month of shifts
+HISTORY_CYCLES = 500
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def make_database(directory, persistent):
+    db_manager = DatabaseManager(os.path.join(directory, 'wire_checker.db'), persistent=persistent)
+    for _ in range(HISTORY_CYCLES):
+        db_manager.end_cycle(db_manager.create_new_cycle("4-pairs"))
+    for cycle_id in [cycle['cycle_id'] for cycle in db_manager.get_all_cycles(HISTORY_CYCLES)]:
+        db_manager.mark_cycle_exported(cycle_id)
+    return db_manager
+
+def time_calls(db_manager, calls):
+    """Per-call latency of each benchmarked method (seconds)"""
+    cycle_id = db_manager.create_new_cycle("4-pairs")
+    steps = {
+        'get_current_cycle': lambda n: db_manager.get_current_cycle(cycle_id),
+        'update_cycle_count': lambda n: db_manager.update_cycle_count(
+            cycle_id, STATUSES[n % len(STATUSES)]),
+        'count_export_backlog': lambda n: db_manager.count_export_backlog(),
+    }
+    samples = {name: [] for name in CALLS}
+    for n in range(calls):
+        for name in CALLS:
+            started = time.perf_counter()
+            steps[name](n)
+            samples[name].append(time.perf_counter() - started)
+    return samples
+
+def run_benchmarks(calls):
+    results = {'timestamp': datetime.now().isoformat(), 'calls': calls, 'modes': {}}
+    for mode, persistent in (('per_call', False), ('persistent', True)):
+        with tempfile.TemporaryDirectory() as directory:
+            db_manager = make_database(directory, persistent)
+            samples = time_calls(db_manager, calls)
+            db_manager.close()
+        results['modes'][mode] = {
+            name: {'p50_ms': round(percentile(values, 0.50) * 1000, 4),
+                   'p99_ms': round(percentile(values, 0.99) * 1000, 4)}
+            for name, values in samples.items()
+        }
+
+    print(f"{'call':<22}{'per call p50':>14}{'p99':>10}{'persistent p50':>16}{'p99':>10}  (ms)")
+    for name in CALLS:
+        before = results['modes']['per_call'][name]
+        after = results['modes']['persistent'][name]
+        print(f"{name:<22}{before['p50_ms']:>14.3f}{before['p99_ms']:>10.3f}"
+              f"{after['p50_ms']:>16.3f}{after['p99_ms']:>10.3f}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Wire checker database call benchmark")
+    parser.add_argument('--calls', type=int, default=2000, help="calls of each method per mode")
+    parser.add_argument('--output', default='bench_database.json')
+    args = parser.parse_args()
+
+    print("=== Database Benchmark ===\n")
+    results = run_benchmarks(args.calls)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=4)
+    print(f"\n✓ Results written to {args.output}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Scan Loop Benchmark for Wire Checker
+Runs the same scan / idle-watch loop as wire_checker_loop against simulated
+harnesses of 3, 4, 8, 16 and 24 pairs and reports:
+
+- scans per second (settle time on the simulated clock plus real CPU time)
+- p50/p99 verdict latency from harness insertion to GOOD / NOT GOOD
+- p99 latency from pulling a held GOOD harness to the scan that sees it
+- CPU time per scan (scan engine plus the simulated backend)
+
+Results are written as JSON. Pass --compare with an earlier results file to
+fail (exit 1) when any size regressed by more than --threshold.
+
+Usage:
+    python3 bench_scan.py [--output bench_results.json] [--compare baseline.json]
+"""
+
+import argparse
+import json
+import random
+import subprocess
+import sys
+import time
+from datetime import datetime
+from gpio_backend import SimulatedBackend
+from harness_simulator import HarnessNetlist, SimulatedClock
+from scan_engine import (ScanEngine, InsertionWatcher, HoldWatcher, STIMULUS_SINGLE,
+                         STIMULUS_CODED)
+
+PAIR_COUNTS = [3, 4, 8, 16, 24]
+
+# Pause between scans while a harness is in the fixture (wire_checker_loop)
+LOOP_PAUSE = 0.5
+
+# Per-pin settle budget of a calibrated fixture (seconds)
+BENCH_SETTLE_TIME = 0.001
+
+# Metrics where a higher value is better; the rest regress upwards
+HIGHER_IS_BETTER = {'scans_per_sec'}
+
+# Changes smaller than this are timer noise, whatever the percentage (ms)
+NOISE_FLOOR_MS = 0.05
+
+def make_pairs(pair_count):
+    """Synthetic wire pairs: line i drives line pair_count + i"""
+    return [(i, pair_count + i) for i in range(pair_count)]
+
+def make_engine(netlist, wire_pairs, settle_time, stimulus=STIMULUS_SINGLE):
+    backend = SimulatedBackend(netlist=netlist, clock=SimulatedClock())
+    engine = ScanEngine(backend, wire_pairs, settle_time=settle_time, stimulus=stimulus)
+    engine.setup_pins()
+    return engine
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+def measure_throughput(wire_pairs, settle_time, scans, stimulus, repeats=7):
+    """Back-to-back scans of a good harness; returns (scans/s, CPU s/scan)
+
+    The best of several blocks is kept so scheduler noise does not show up
+    as a regression.
+    """
+    engine = make_engine(HarnessNetlist(wire_pairs), wire_pairs, settle_time, stimulus)
+    clock = engine.backend.clock
+    engine.scan()
+
+    best_cpu = None
+    for _ in range(repeats):
+        cpu_start = time.process_time()
+        for _ in range(scans):
+            engine.scan()
+        cpu = (time.process_time() - cpu_start) / scans
+        if best_cpu is None or cpu < best_cpu:
+            best_cpu = cpu
+
+    # Settle time is deterministic on the simulated clock
+    sim_start = clock.monotonic()
+    engine.scan()
+    sim_per_scan = clock.monotonic() - sim_start
+    return 1.0 / (sim_per_scan + best_cpu), best_cpu
+
+def measure_verdict_latency(netlist, wire_pairs, settle_time, stimulus, expected, insert_at):
+    """Run the checker loop on an empty fixture, insert the harness at
+    insert_at (simulated seconds) and return seconds until the verdict"""
+    engine = make_engine(netlist, wire_pairs, settle_time, stimulus)
+    watcher = InsertionWatcher(engine)
+    clock = engine.backend.clock
+    inserted = {}
+
+    def insert(netlist):
+        netlist.insert()
+        inserted['cpu'] = time.process_time()
+
+    engine.backend.simulator.schedule(insert_at, insert)
+
+    while True:
+        result = engine.scan()
+        if 'cpu' in inserted and result.verdict == expected:
+            break
+        if result.is_empty:
+            watcher.wait()
+        else:
+            clock.sleep(LOOP_PAUSE)
+
+    # Simulated settle/idle time plus the real CPU spent since insertion
+    return clock.monotonic() - insert_at + time.process_time() - inserted['cpu']
+
+def measure_removal_latency(wire_pairs, settle_time, stimulus, remove_at):
+    """Hold a GOOD harness the way the checker loop does, pull it at
+    remove_at (simulated seconds) and return seconds until a scan sees it"""
+    engine = make_engine(HarnessNetlist(wire_pairs), wire_pairs, settle_time, stimulus)
+    hold = HoldWatcher(engine)
+    clock = engine.backend.clock
+    removed = {}
+
+    def remove(netlist):
+        netlist.remove()
+        removed['cpu'] = time.process_time()
+
+    engine.backend.simulator.schedule(remove_at, remove)
+
+    while True:
+        result = engine.scan()
+        if 'cpu' in removed and result.is_empty:
+            break
+        if result.verdict == "GOOD":
+            hold.wait()
+        else:
+            clock.sleep(LOOP_PAUSE)
+
+    return clock.monotonic() - remove_at + time.process_time() - removed['cpu']
+
+def bench_size(pair_count, settle_time, stimulus, scans, trials, rng):
+    wire_pairs = make_pairs(pair_count)
+    scans_per_sec, cpu_per_scan = measure_throughput(wire_pairs, settle_time, scans, stimulus)
+
+    latencies = {'GOOD': [], 'NOT GOOD': []}
+    for _ in range(trials):
+        insert_at = rng.uniform(0.0, 2.0)
+        good = HarnessNetlist(wire_pairs, inserted=False)
+        latencies['GOOD'].append(
+            measure_verdict_latency(good, wire_pairs, settle_time, stimulus, "GOOD", insert_at))
+
+        # Short between the inputs of the first two pairs
+        faulty = HarnessNetlist(wire_pairs, shorts=[(wire_pairs[0][1], wire_pairs[1][1])],
+                                inserted=False)
+        latencies['NOT GOOD'].append(
+            measure_verdict_latency(faulty, wire_pairs, settle_time, stimulus, "NOT GOOD",
+                                    insert_at))
+
+    removals = [measure_removal_latency(wire_pairs, settle_time, stimulus, rng.uniform(0.0, 2.0))
+                for _ in range(trials)]
+
+    everything = latencies['GOOD'] + latencies['NOT GOOD']
+    return {
+        'pairs': pair_count,
+        'scans_per_sec': round(scans_per_sec, 2),
+        'cpu_per_scan_ms': round(cpu_per_scan * 1000, 4),
+        'latency_p50_ms': round(percentile(everything, 0.50) * 1000, 3),
+        'latency_p99_ms': round(percentile(everything, 0.99) * 1000, 3),
+        'good_latency_p99_ms': round(percentile(latencies['GOOD'], 0.99) * 1000, 3),
+        'not_good_latency_p99_ms': round(percentile(latencies['NOT GOOD'], 0.99) * 1000, 3),
+        'removal_latency_p99_ms': round(percentile(removals, 0.99) * 1000, 3),
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def run_benchmarks(pair_counts=PAIR_COUNTS, settle_time=BENCH_SETTLE_TIME,
+                   stimulus=STIMULUS_SINGLE, scans=200, trials=50, seed=0):
+    rng = random.Random(seed)
+    results = []
+    for pair_count in pair_counts:
+        result = bench_size(pair_count, settle_time, stimulus, scans, trials, rng)
+        print(f"{pair_count:3d} pairs: {result['scans_per_sec']:8.2f} scans/s  "
+              f"p50 {result['latency_p50_ms']:8.2f} ms  p99 {result['latency_p99_ms']:8.2f} ms  "
+              f"removal p99 {result['removal_latency_p99_ms']:7.2f} ms  "
+              f"CPU {result['cpu_per_scan_ms']:.3f} ms/scan")
+        results.append(result)
+
+    return {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'settle_time': settle_time,
+        'stimulus': stimulus,
+        'scans': scans,
+        'trials': trials,
+        'results': results,
+    }
+
+def compare_results(current, baseline, threshold):
+    """Return a list of regressions larger than threshold (a fraction)"""
+    previous = {result['pairs']: result for result in baseline.get('results', [])}
+    regressions = []
+    for result in current['results']:
+        before = previous.get(result['pairs'])
+        if before is None:
+            continue
+        for metric, value in result.items():
+            if metric == 'pairs' or not before.get(metric):
+                continue
+            if metric.endswith('_ms') and abs(value - before[metric]) < NOISE_FLOOR_MS:
+                continue
+            change = (value - before[metric]) / before[metric]
+            if metric in HIGHER_IS_BETTER:
+                change = -change
+            if change > threshold:
+                regressions.append(f"{result['pairs']} pairs: {metric} "
+                                   f"{before[metric]} -> {value} ({change:.1%} worse)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Wire checker scan loop benchmark")
+    parser.add_argument('--pairs', type=int, nargs='+', default=PAIR_COUNTS)
+    parser.add_argument('--settle', type=float, default=BENCH_SETTLE_TIME,
+                        help="per-pin settle budget in seconds")
+    parser.add_argument('--stimulus', choices=[STIMULUS_SINGLE, STIMULUS_CODED],
+                        default=STIMULUS_SINGLE)
+    parser.add_argument('--scans', type=int, default=200, help="scans for throughput")
+    parser.add_argument('--trials', type=int, default=50, help="insertions per verdict")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--compare', help="earlier results JSON to check against")
+    parser.add_argument('--threshold', type=float, default=0.15,
+                        help="allowed regression as a fraction (default 0.15)")
+    args = parser.parse_args()
+
+    print("=== Scan Loop Benchmark ===\n")
+    current = run_benchmarks(args.pairs, args.settle, args.stimulus, args.scans, args.trials,
+                             args.seed)
+
+    with open(args.output, 'w') as f:
+        json.dump(current, f, indent=4)
+    print(f"\n✓ Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+        regressions = compare_results(current, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ Regressions against {args.compare} (commit {baseline.get('commit')}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"✓ No regression over {args.threshold:.0%} against {args.compare}")
+
+if __name__ == '__main__':
+    main()
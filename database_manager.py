@@ -2,97 +2,277 @@
 """
 Database Manager for Wire Checker Cycles
 Uses SQLite for lightweight, reliable storage
+
+By default every call opens and closes its own connection. With
+WIRE_CHECKER_DB_PERSISTENT=1 (set by the launcher) a manager keeps one
+writer connection, shared under a lock, and one reader connection per
+thread, all in WAL mode with synchronous=NORMAL, a larger page cache,
+memory-mapped reads and a prepared statement cache. The UI polls
+get_current_cycle every 500 ms, so this saves a connect, schema read and
+statement compile on each call (see bench_database.py).
 """
 
 import sqlite3
+import threading
 import time
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
 import os
+from tracing import traced
+from event_journal import EventJournal, STATUS_CHANGE, INSPECTION
+
+DB_PERSISTENT_ENV = 'WIRE_CHECKER_DB_PERSISTENT'
+
+# Page cache of each persistent connection (KiB)
+CACHE_SIZE_KIB = 8192
+
+# Bytes of the database file read through mmap
+MMAP_SIZE = 64 * 1024 * 1024
+
+# Compiled statements kept per persistent connection
+STATEMENT_CACHE = 64
+
+# Counter update for each status; any other status only counts as checked
+COUNT_UPDATES = {
+    status: f'''
+        UPDATE cycles SET total_checked = total_checked + 1{column}
+        WHERE cycle_id = ?
+    '''
+    for status, column in (("GOOD", ", good_count = good_count + 1"),
+                           ("NOT GOOD", ", not_good_count = not_good_count + 1"),
+                           ("OPEN", ", open_count = open_count + 1"),
+                           (None, ""))
+}
+
+# Schema upgrades, applied once each in order; PRAGMA user_version holds the
+# number applied so far. Every statement may safely run twice.
+SCHEMA_MIGRATIONS = [
+    # 1: one statistics row per day and configuration; rows doubled up by the
+    # old check-then-insert are merged (as the newest row) before the index
+    [
+        '''
+        INSERT INTO statistics (date, configuration, total_cycles, total_checked,
+                                total_good, total_not_good, total_open)
+        SELECT date, configuration, SUM(total_cycles), SUM(total_checked),
+               SUM(total_good), SUM(total_not_good), SUM(total_open)
+        FROM statistics GROUP BY date, configuration HAVING COUNT(*) > 1
+        ''',
+        '''
+        DELETE FROM statistics WHERE id NOT IN
+            (SELECT MAX(id) FROM statistics GROUP BY date, configuration)
+        ''',
+        '''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_statistics_day ON statistics (date, configuration)
+        ''',
+    ],
+    # 2: history queries stay index-backed as events grow into the millions
+    [
+        # export_cycle_data: one cycle's events in time order, without the table
+        '''
+        CREATE INDEX IF NOT EXISTS idx_cycle_events_cycle
+        ON cycle_events (cycle_id, timestamp, status, details)
+        ''',
+        # get_all_cycles: most recent first
+        '''
+        CREATE INDEX IF NOT EXISTS idx_cycles_start_time ON cycles (start_time)
+        ''',
+        # count_export_backlog
+        '''
+        CREATE INDEX IF NOT EXISTS idx_cycles_export ON cycles (status, exported_at)
+        ''',
+    ],
+    # 3: a cycle's inspections in the order the harnesses went in
+    [
+        '''
+        CREATE INDEX IF NOT EXISTS idx_inspections_cycle ON inspections (cycle_id, inserted_at)
+        ''',
+    ],
+]
 
 class DatabaseManager:
-    def __init__(self, db_path="wire_checker.db"):
+    def __init__(self, db_path="wire_checker.db", persistent=None):
         self.db_path = db_path
+        if persistent is None:
+            persistent = os.environ.get(DB_PERSISTENT_ENV, '') not in ('', '0')
+        self.persistent = persistent
+        self.write_lock = threading.RLock()
+        self.writer_connection = None
+        self.local = threading.local()
+        self.reader_connections = []
+        # Cycle events and inspections from the scan loop, written in batches
+        self.journal = EventJournal(self.write_journal)
         self.init_database()
     
+    def _open(self, writer=False):
+        """A tuned connection for persistent mode"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE)
+        if writer:
+            conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA cache_size=-{CACHE_SIZE_KIB}')
+        conn.execute(f'PRAGMA mmap_size={MMAP_SIZE}')
+        return conn
+    
+    @contextmanager
+    def writing(self):
+        """Connection for a block of writes, committed when the block ends"""
+        if not self.persistent:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                yield conn
+                conn.commit()
+            finally:
+                conn.close()
+            return
+        
+        with self.write_lock:
+            if self.writer_connection is None:
+                self.writer_connection = self._open(writer=True)
+            conn = self.writer_connection
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+    
+    @contextmanager
+    def reading(self):
+        """Connection for reads; in persistent mode one per thread"""
+        if not self.persistent:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+        
+        conn = getattr(self.local, 'connection', None)
+        if conn is None:
+            conn = self._open()
+            self.local.connection = conn
+            with self.write_lock:
+                self.reader_connections.append(conn)
+        yield conn
+    
+    def close(self):
+        """Write queued events and close the persistent connections; they
+        reopen if used again"""
+        try:
+            self.journal.close()
+        except Exception as e:
+            print(f"Error writing queued cycle events: {e}")
+        with self.write_lock:
+            connections = self.reader_connections
+            self.reader_connections = []
+            if self.writer_connection is not None:
+                connections.append(self.writer_connection)
+                self.writer_connection = None
+            self.local = threading.local()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                print(f"Error closing database connection: {e}")
+    
     def init_database(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create cycles table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS cycles (
-                cycle_id TEXT PRIMARY KEY,
-                start_time TIMESTAMP,
-                end_time TIMESTAMP,
-                configuration TEXT,
-                total_checked INTEGER DEFAULT 0,
-                good_count INTEGER DEFAULT 0,
-                not_good_count INTEGER DEFAULT 0,
-                open_count INTEGER DEFAULT 0,
-                status TEXT DEFAULT 'active'
-            )
-        ''')
-        
-        # Create cycle_events table for detailed logging
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS cycle_events (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                cycle_id TEXT,
-                timestamp TIMESTAMP,
-                status TEXT,
-                details TEXT,
-                FOREIGN KEY (cycle_id) REFERENCES cycles (cycle_id)
-            )
-        ''')
-        
-        # Create statistics table for aggregated data
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS statistics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                date DATE,
-                configuration TEXT,
-                total_cycles INTEGER DEFAULT 0,
-                total_checked INTEGER DEFAULT 0,
-                total_good INTEGER DEFAULT 0,
-                total_not_good INTEGER DEFAULT 0,
-                total_open INTEGER DEFAULT 0
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self.writing() as conn:
+            cursor = conn.cursor()
+            
+            # Create cycles table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS cycles (
+                    cycle_id TEXT PRIMARY KEY,
+                    start_time TIMESTAMP,
+                    end_time TIMESTAMP,
+                    configuration TEXT,
+                    total_checked INTEGER DEFAULT 0,
+                    good_count INTEGER DEFAULT 0,
+                    not_good_count INTEGER DEFAULT 0,
+                    open_count INTEGER DEFAULT 0,
+                    status TEXT DEFAULT 'active',
+                    exported_at TIMESTAMP
+                )
+            ''')
+            
+            # Databases created before export tracking get the column added
+            cursor.execute('PRAGMA table_info(cycles)')
+            if 'exported_at' not in [column[1] for column in cursor.fetchall()]:
+                cursor.execute('ALTER TABLE cycles ADD COLUMN exported_at TIMESTAMP')
+            
+            # Create cycle_events table for detailed logging
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS cycle_events (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cycle_id TEXT,
+                    timestamp TIMESTAMP,
+                    status TEXT,
+                    details TEXT,
+                    FOREIGN KEY (cycle_id) REFERENCES cycles (cycle_id)
+                )
+            ''')
+            
+            # Create statistics table for aggregated data
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS statistics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    date DATE,
+                    configuration TEXT,
+                    total_cycles INTEGER DEFAULT 0,
+                    total_checked INTEGER DEFAULT 0,
+                    total_good INTEGER DEFAULT 0,
+                    total_not_good INTEGER DEFAULT 0,
+                    total_open INTEGER DEFAULT 0
+                )
+            ''')
+            
+            # One row per harness tested (see inspections.py)
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS inspections (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    cycle_id TEXT,
+                    inserted_at TIMESTAMP,
+                    verdict_at TIMESTAMP,
+                    removed_at TIMESTAMP,
+                    verdict TEXT,
+                    pair_mask INTEGER,
+                    fault_mask INTEGER,
+                    pin_count INTEGER,
+                    connectivity BLOB,
+                    FOREIGN KEY (cycle_id) REFERENCES cycles (cycle_id)
+                )
+            ''')
+            
+            # Schema upgrades not applied to this file yet
+            version = cursor.execute('PRAGMA user_version').fetchone()[0]
+            for number, statements in enumerate(SCHEMA_MIGRATIONS[version:], start=version + 1):
+                for statement in statements:
+                    cursor.execute(statement)
+                cursor.execute(f'PRAGMA user_version = {number}')
     
     def create_new_cycle(self, configuration):
         """Create a new cycle and return its ID"""
         cycle_id = str(uuid.uuid4())
         start_time = datetime.now()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO cycles (cycle_id, start_time, configuration, status)
-            VALUES (?, ?, ?, 'active')
-        ''', (cycle_id, start_time, configuration))
-        
-        conn.commit()
-        conn.close()
+        with self.writing() as conn:
+            conn.execute('''
+                INSERT INTO cycles (cycle_id, start_time, configuration, status)
+                VALUES (?, ?, ?, 'active')
+            ''', (cycle_id, start_time, configuration))
         
         return cycle_id
     
+    @traced('db')
     def get_current_cycle(self, cycle_id):
         """Get current cycle data"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT * FROM cycles WHERE cycle_id = ?
-        ''', (cycle_id,))
-        
-        result = cursor.fetchone()
-        conn.close()
+        with self.reading() as conn:
+            result = conn.execute('''
+                SELECT * FROM cycles WHERE cycle_id = ?
+            ''', (cycle_id,)).fetchone()
         
         if result:
             return {
@@ -110,123 +290,94 @@ class DatabaseManager:
     
     def update_cycle_count(self, cycle_id, status):
         """Update cycle counts based on status"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get current counts
-        cursor.execute('''
-            SELECT total_checked, good_count, not_good_count, open_count 
-            FROM cycles WHERE cycle_id = ?
-        ''', (cycle_id,))
-        
-        result = cursor.fetchone()
-        if result:
-            total_checked, good_count, not_good_count, open_count = result
-            
-            # Update counts based on status
-            total_checked += 1
-            if status == "GOOD":
-                good_count += 1
-            elif status == "NOT GOOD":
-                not_good_count += 1
-            elif status == "OPEN":
-                open_count += 1
-            
-            # Update database
-            cursor.execute('''
-                UPDATE cycles 
-                SET total_checked = ?, good_count = ?, not_good_count = ?, open_count = ?
-                WHERE cycle_id = ?
-            ''', (total_checked, good_count, not_good_count, open_count, cycle_id))
-            
-            # Log the event
-            cursor.execute('''
-                INSERT INTO cycle_events (cycle_id, timestamp, status, details)
-                VALUES (?, ?, ?, ?)
-            ''', (cycle_id, datetime.now(), status, f"Status changed to {status}"))
-            
-            conn.commit()
-        
-        conn.close()
+        self.record_cycle_events([(cycle_id, status, datetime.now())])
+    
+    def record_cycle_events(self, events):
+        """Count and log (cycle_id, status, timestamp) events in one transaction"""
+        self.write_journal([(STATUS_CHANGE, event) for event in events])
+    
+    @traced('db')
+    def write_journal(self, entries):
+        """Commit a batch of EventJournal entries in one transaction"""
+        with self.writing() as conn:
+            for kind, row in entries:
+                if kind == INSPECTION:
+                    conn.execute('''
+                        INSERT INTO inspections (cycle_id, inserted_at, verdict_at, removed_at,
+                                                 verdict, pair_mask, fault_mask, pin_count,
+                                                 connectivity)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', row)
+                    continue
+                
+                cycle_id, status, timestamp = row
+                # One statement per status, so concurrent writers cannot lose a count
+                increment = COUNT_UPDATES.get(status, COUNT_UPDATES[None])
+                if conn.execute(increment, (cycle_id,)).rowcount:
+                    # Log the event
+                    conn.execute('''
+                        INSERT INTO cycle_events (cycle_id, timestamp, status, details)
+                        VALUES (?, ?, ?, ?)
+                    ''', (cycle_id, timestamp, status, f"Status changed to {status}"))
     
     def end_cycle(self, cycle_id):
         """End a cycle and mark it as completed"""
+        # Counts still queued by the scan loop belong to this cycle
+        self.journal.flush()
         end_time = datetime.now()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            UPDATE cycles 
-            SET end_time = ?, status = 'completed'
-            WHERE cycle_id = ?
-        ''', (end_time, cycle_id))
-        
-        conn.commit()
-        conn.close()
+        with self.writing() as conn:
+            conn.execute('''
+                UPDATE cycles 
+                SET end_time = ?, status = 'completed'
+                WHERE cycle_id = ?
+            ''', (end_time, cycle_id))
         
-        # Update daily statistics in separate connection
+        # Update daily statistics in a separate transaction
         self.update_daily_statistics(cycle_id)
     
+    def mark_cycle_exported(self, cycle_id):
+        """Record that a cycle has been sent to the server"""
+        with self.writing() as conn:
+            conn.execute('''
+                UPDATE cycles SET exported_at = ? WHERE cycle_id = ?
+            ''', (datetime.now(), cycle_id))
+    
+    def count_export_backlog(self):
+        """Number of completed cycles not sent to the server yet"""
+        with self.reading() as conn:
+            return conn.execute('''
+                SELECT COUNT(*) FROM cycles
+                WHERE status = 'completed' AND exported_at IS NULL
+            ''').fetchone()[0]
+    
     def update_daily_statistics(self, cycle_id):
         """Update daily statistics when cycle ends"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get cycle data
-        cursor.execute('''
-            SELECT configuration, total_checked, good_count, not_good_count, open_count
-            FROM cycles WHERE cycle_id = ?
-        ''', (cycle_id,))
-        
-        result = cursor.fetchone()
-        if result:
-            configuration, total_checked, good_count, not_good_count, open_count = result
-            today = datetime.now().date()
-            
-            # Check if statistics for today exist
-            cursor.execute('''
-                SELECT id FROM statistics WHERE date = ? AND configuration = ?
-            ''', (today, configuration))
-            
-            if cursor.fetchone():
-                # Update existing statistics
-                cursor.execute('''
-                    UPDATE statistics 
-                    SET total_cycles = total_cycles + 1,
-                        total_checked = total_checked + ?,
-                        total_good = total_good + ?,
-                        total_not_good = total_not_good + ?,
-                        total_open = total_open + ?
-                    WHERE date = ? AND configuration = ?
-                ''', (total_checked, good_count, not_good_count, open_count, today, configuration))
-            else:
-                # Create new statistics
-                cursor.execute('''
-                    INSERT INTO statistics (date, configuration, total_cycles, total_checked, 
-                                         total_good, total_not_good, total_open)
-                    VALUES (?, ?, 1, ?, ?, ?, ?)
-                ''', (today, configuration, total_checked, good_count, not_good_count, open_count))
-        
-        conn.commit()
-        conn.close()
+        with self.writing() as conn:
+            conn.execute('''
+                INSERT INTO statistics (date, configuration, total_cycles, total_checked,
+                                        total_good, total_not_good, total_open)
+                SELECT ?, configuration, 1, total_checked, good_count, not_good_count, open_count
+                FROM cycles WHERE cycle_id = ?
+                ON CONFLICT (date, configuration) DO UPDATE
+                SET total_cycles = total_cycles + 1,
+                    total_checked = total_checked + excluded.total_checked,
+                    total_good = total_good + excluded.total_good,
+                    total_not_good = total_not_good + excluded.total_not_good,
+                    total_open = total_open + excluded.total_open
+            ''', (datetime.now().date(), cycle_id))
     
     def get_daily_statistics(self, date=None):
         """Get statistics for a specific date (default: today)"""
         if date is None:
             date = datetime.now().date()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT configuration, total_cycles, total_checked, total_good, 
-                   total_not_good, total_open
-            FROM statistics WHERE date = ?
-        ''', (date,))
-        
-        results = cursor.fetchall()
-        conn.close()
+        with self.reading() as conn:
+            results = conn.execute('''
+                SELECT configuration, total_cycles, total_checked, total_good, 
+                       total_not_good, total_open
+                FROM statistics WHERE date = ?
+            ''', (date,)).fetchall()
         
         return [
             {
@@ -242,19 +393,14 @@ class DatabaseManager:
     
     def get_all_cycles(self, limit=50):
         """Get recent cycles"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT cycle_id, start_time, end_time, configuration, 
-                   total_checked, good_count, not_good_count, open_count, status
-            FROM cycles 
-            ORDER BY start_time DESC 
-            LIMIT ?
-        ''', (limit,))
-        
-        results = cursor.fetchall()
-        conn.close()
+        with self.reading() as conn:
+            results = conn.execute('''
+                SELECT cycle_id, start_time, end_time, configuration, 
+                       total_checked, good_count, not_good_count, open_count, status
+                FROM cycles 
+                ORDER BY start_time DESC 
+                LIMIT ?
+            ''', (limit,)).fetchall()
         
         return [
             {
@@ -271,27 +417,49 @@ class DatabaseManager:
             for row in results
         ]
     
+    def get_inspections(self, cycle_id):
+        """Harnesses tested in a cycle, in the order they went in"""
+        with self.reading() as conn:
+            results = conn.execute('''
+                SELECT inserted_at, verdict_at, removed_at, verdict, pair_mask, fault_mask,
+                       pin_count, connectivity
+                FROM inspections WHERE cycle_id = ?
+                ORDER BY inserted_at
+            ''', (cycle_id,)).fetchall()
+        
+        return [
+            {
+                'inserted_at': row[0],
+                'verdict_at': row[1],
+                'removed_at': row[2],
+                'verdict': row[3],
+                'pair_mask': row[4],
+                'fault_mask': row[5],
+                'pin_count': row[6],
+                'connectivity': row[7]
+            }
+            for row in results
+        ]
+    
     def export_cycle_data(self, cycle_id):
         """Export cycle data for server transmission"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get cycle data
-        cursor.execute('''
-            SELECT * FROM cycles WHERE cycle_id = ?
-        ''', (cycle_id,))
-        
-        cycle_data = cursor.fetchone()
-        
-        # Get cycle events
-        cursor.execute('''
-            SELECT * FROM cycle_events WHERE cycle_id = ?
-            ORDER BY timestamp
-        ''', (cycle_id,))
-        
-        events_data = cursor.fetchall()
-        
-        conn.close()
+        with self.reading() as conn:
+            cursor = conn.cursor()
+            
+            # Get cycle data
+            cursor.execute('''
+                SELECT * FROM cycles WHERE cycle_id = ?
+            ''', (cycle_id,))
+            
+            cycle_data = cursor.fetchone()
+            
+            # Get cycle events
+            cursor.execute('''
+                SELECT * FROM cycle_events WHERE cycle_id = ?
+                ORDER BY timestamp
+            ''', (cycle_id,))
+            
+            events_data = cursor.fetchall()
         
         if cycle_data:
             return {
@@ -315,6 +483,11 @@ class DatabaseManager:
                         'details': event[4]
                     }
                     for event in events_data
+                ],
+                # Connectivity blobs as hex, for JSON
+                'inspections': [
+                    dict(inspection, connectivity=inspection['connectivity'].hex())
+                    for inspection in self.get_inspections(cycle_id)
                 ]
             }
-        return None 
\ No newline at end of file
+        return None
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Event Journal for Wire Checker
+Write-behind queue for cycle status events and inspection records. The scan
+loop appends an entry under status_lock and carries on; a writer thread
+commits the queue to the database in batches of up to BATCH_SIZE entries,
+or FLUSH_INTERVAL after the first entry of a batch arrived, so verdict
+latency no longer depends on how fast the SD card syncs a transaction.
+
+Each batch updates the cycle counters and logs the events in the same
+transaction, so the cycles table trails the scan loop by at most
+FLUSH_INTERVAL and never disagrees with cycle_events. flush() writes
+everything queued so far (end_cycle calls it), and close() or interpreter
+exit drains the queue on a clean shutdown.
+"""
+
+import atexit
+import threading
+import time
+from collections import deque
+from datetime import datetime
+import instrumentation
+
+# Kinds of entry; an entry is (kind, row)
+STATUS_CHANGE = 'status'   # row: (cycle_id, status, timestamp)
+INSPECTION = 'inspection'  # row: (cycle_id,) + inspections.Inspection
+
+# Entries committed in one transaction at most
+BATCH_SIZE = 50
+
+# Longest time an entry waits in the queue before a write (seconds)
+FLUSH_INTERVAL = 0.25
+
+# Entries queued at most; past this the scan loop writes in place
+CAPACITY = 10000
+
+# Wait before retrying a batch the database refused (seconds)
+RETRY_DELAY = 1.0
+
+# Longest wait for the writer thread to stop on close (seconds)
+CLOSE_TIMEOUT = 5.0
+
+class EventJournal:
+    """Bounded queue of (kind, row) entries, written in batches
+
+    write is called with a list of entries from one thread at a time, e.g.
+    DatabaseManager.write_journal.
+    """
+
+    def __init__(self, write, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 capacity=CAPACITY, phase_timers=None):
+        self.write = write
+        # Each commit is timed as the db_write phase
+        self.timers = phase_timers or instrumentation.timers
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.capacity = capacity
+        self.entries = deque()
+        self.condition = threading.Condition()
+        self.write_lock = threading.Lock()
+        self.thread = None
+        self.stopping = False
+        self.exit_hook = False
+        self.appended = 0   # entries accepted into the queue
+        self.written = 0    # of those, entries committed
+        self.batches = 0
+        self.overflows = 0
+
+    def append(self, cycle_id, status):
+        """Queue a status change; returns False if it had to be written in place"""
+        return self._queue((STATUS_CHANGE, (cycle_id, status, datetime.now())))
+
+    def append_inspection(self, cycle_id, inspection):
+        """Queue the record of a harness that has been pulled"""
+        return self._queue((INSPECTION, (cycle_id,) + tuple(inspection)))
+
+    def _queue(self, entry):
+        with self.condition:
+            if len(self.entries) < self.capacity:
+                self.entries.append(entry)
+                self.appended += 1
+                if self.thread is None:
+                    self._start()
+                elif len(self.entries) == 1 or len(self.entries) >= self.batch_size:
+                    # Starts the flush deadline, or ends the wait with a full batch
+                    self.condition.notify_all()
+                return True
+            self.overflows += 1
+        # The writer is this far behind: slow the loop down rather than drop counts
+        self._write([entry], queued=False)
+        return False
+
+    def pending(self):
+        with self.condition:
+            return len(self.entries)
+
+    def _start(self):
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, name='event-journal', daemon=True)
+        self.thread.start()
+        if not self.exit_hook:
+            atexit.register(self.close)
+            self.exit_hook = True
+
+    def _take_batch(self):
+        """Wait for a full batch or the flush deadline; None once stopping"""
+        with self.condition:
+            while not self.entries and not self.stopping:
+                self.condition.wait()
+            if self.stopping:
+                return None
+            deadline = time.monotonic() + self.flush_interval
+            while len(self.entries) < self.batch_size and not self.stopping:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            count = min(len(self.entries), self.batch_size)
+            return [self.entries.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            batch = self._take_batch()
+            if batch is None:
+                return
+            try:
+                self._write(batch)
+            except Exception as e:
+                print(f"Error writing journal batch, retrying: {e}")
+                with self.condition:
+                    self.entries.extendleft(reversed(batch))
+                    self.condition.wait(RETRY_DELAY)
+
+    def _write(self, batch, queued=True):
+        with self.write_lock:
+            started = self.timers.start()
+            self.write(batch)
+            self.timers.stop('db_write', started)
+            with self.condition:
+                if queued:
+                    self.written += len(batch)
+                self.batches += 1
+                self.condition.notify_all()
+
+    def flush(self):
+        """Write every entry queued so far before returning"""
+        with self.condition:
+            target = self.appended
+            batch = list(self.entries)
+            self.entries.clear()
+        if batch:
+            try:
+                self._write(batch)
+            except Exception:
+                with self.condition:
+                    self.entries.extendleft(reversed(batch))
+                raise
+        # A batch the writer thread took earlier may still be committing
+        with self.condition:
+            while self.written < target and self.thread is not None and self.thread.is_alive():
+                if not self.condition.wait(CLOSE_TIMEOUT):
+                    break
+
+    def close(self):
+        """Stop the writer thread and write what is left; append() restarts it"""
+        with self.condition:
+            thread = self.thread
+            self.stopping = True
+            self.condition.notify_all()
+        if thread is not None:
+            thread.join(CLOSE_TIMEOUT)
+        try:
+            self.flush()
+        finally:
+            with self.condition:
+                self.thread = None
+                if self.entries:  # appended while closing
+                    self._start()
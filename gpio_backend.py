@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+GPIO Backends for Wire Checker
+A harness scan only needs two bulk operations: drive a set of lines while
+every other line is a pulled-down input (write_mask), and read every line
+at once (read_all). Lines are addressed by their index in the claimed pin
+list, so bit k of every mask is pin k.
+
+Backends:
+- RPiGPIOBackend: wraps RPi.GPIO (or mock_gpio), one call per pin
+- GpiochipBackend: Linux GPIO character device, one ioctl per bulk operation
+- SimulatedBackend: in-process harness from a netlist, no hardware needed
+
+Select with WIRE_CHECKER_GPIO_BACKEND=rpi|gpiochip|sim (default rpi).
+"""
+
+import ctypes
+import fcntl
+import os
+import select
+import threading
+import time
+from harness_simulator import HarnessNetlist, HarnessSimulator, SimulatedClock
+
+class GPIOBackend:
+    """Base class for bulk harness line access"""
+
+    supports_edge_events = False
+
+    # Source of sleep()/monotonic()/perf_counter(); simulated backends
+    # substitute a virtual clock
+    clock = time
+
+    def __init__(self):
+        self.pins = []
+        self.drive_mask = 0
+        self.level_mask = 0
+
+    def claim(self, pins):
+        """Take ownership of pins and leave them all as pulled-down inputs"""
+        self.pins = list(pins)
+        self.drive_mask = 0
+        self.level_mask = 0
+
+    def index(self, pin):
+        return self.pins.index(pin)
+
+    def write_mask(self, drive_mask, level_mask=None):
+        """Drive lines in drive_mask (HIGH where level_mask is set, default all
+        HIGH); every other line becomes a pulled-down input"""
+        raise NotImplementedError
+
+    def read_all(self):
+        """Return the level of every claimed line as a bitmask"""
+        raise NotImplementedError
+
+    def wait_for_edge(self, watch_mask, timeout):
+        """Block until a rising edge on a line in watch_mask; True if seen"""
+        raise NotImplementedError
+
+    def release(self):
+        """Give the lines back, leaving them as inputs"""
+        if self.pins:
+            self.write_mask(0)
+
+class RPiGPIOBackend(GPIOBackend):
+    """Per-pin backend over the RPi.GPIO API (also works with mock_gpio)"""
+
+    def __init__(self, gpio):
+        super().__init__()
+        self.gpio = gpio
+        self.supports_edge_events = hasattr(gpio, 'add_event_detect')
+
+    def claim(self, pins):
+        super().claim(pins)
+        for pin in self.pins:
+            self.gpio.setup(pin, self.gpio.IN, pull_up_down=self.gpio.PUD_DOWN)
+
+    def write_mask(self, drive_mask, level_mask=None):
+        gpio = self.gpio
+        if level_mask is None:
+            level_mask = drive_mask
+
+        # Only touch lines whose direction or level actually changes
+        released = self.drive_mask & ~drive_mask
+        for k, pin in enumerate(self.pins):
+            bit = 1 << k
+            if released & bit:
+                gpio.output(pin, gpio.LOW)
+                gpio.setup(pin, gpio.IN, pull_up_down=gpio.PUD_DOWN)
+            elif drive_mask & bit:
+                if not self.drive_mask & bit:
+                    gpio.setup(pin, gpio.OUT)
+                elif (self.level_mask ^ level_mask) & bit == 0:
+                    continue
+                gpio.output(pin, gpio.HIGH if level_mask & bit else gpio.LOW)
+
+        self.drive_mask = drive_mask
+        self.level_mask = level_mask & drive_mask
+
+    def read_all(self):
+        gpio_input = self.gpio.input
+        mask = 0
+        for k, pin in enumerate(self.pins):
+            if gpio_input(pin):
+                mask |= 1 << k
+        return mask
+
+    def wait_for_edge(self, watch_mask, timeout):
+        gpio = self.gpio
+        edge = threading.Event()
+        watched = [pin for k, pin in enumerate(self.pins) if watch_mask & (1 << k)]
+        armed = []
+        try:
+            for pin in watched:
+                gpio.add_event_detect(pin, gpio.RISING, callback=lambda channel: edge.set())
+                armed.append(pin)
+        except (AttributeError, RuntimeError) as e:
+            self.supports_edge_events = False
+            raise NotImplementedError(f"Edge detection unavailable: {e}")
+        else:
+            return edge.wait(timeout)
+        finally:
+            for pin in armed:
+                try:
+                    gpio.remove_event_detect(pin)
+                except Exception:
+                    pass
+
+# Linux GPIO character device uAPI v2 (include/uapi/linux/gpio.h)
+GPIO_V2_LINES_MAX = 64
+GPIO_MAX_NAME_SIZE = 32
+GPIO_V2_LINE_NUM_ATTRS_MAX = 10
+
+GPIO_V2_LINE_FLAG_INPUT = 1 << 2
+GPIO_V2_LINE_FLAG_OUTPUT = 1 << 3
+GPIO_V2_LINE_FLAG_EDGE_RISING = 1 << 4
+GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN = 1 << 9
+
+GPIO_V2_LINE_ATTR_ID_FLAGS = 1
+GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES = 2
+
+class _LineAttribute(ctypes.Structure):
+    # The kernel union of flags/values/debounce_period_us is 64 bits wide
+    _fields_ = [('id', ctypes.c_uint32),
+                ('padding', ctypes.c_uint32),
+                ('value', ctypes.c_uint64)]
+
+class _LineConfigAttribute(ctypes.Structure):
+    _fields_ = [('attr', _LineAttribute),
+                ('mask', ctypes.c_uint64)]
+
+class _LineConfig(ctypes.Structure):
+    _fields_ = [('flags', ctypes.c_uint64),
+                ('num_attrs', ctypes.c_uint32),
+                ('padding', ctypes.c_uint32 * 5),
+                ('attrs', _LineConfigAttribute * GPIO_V2_LINE_NUM_ATTRS_MAX)]
+
+class _LineRequest(ctypes.Structure):
+    _fields_ = [('offsets', ctypes.c_uint32 * GPIO_V2_LINES_MAX),
+                ('consumer', ctypes.c_char * GPIO_MAX_NAME_SIZE),
+                ('config', _LineConfig),
+                ('num_lines', ctypes.c_uint32),
+                ('event_buffer_size', ctypes.c_uint32),
+                ('padding', ctypes.c_uint32 * 5),
+                ('fd', ctypes.c_int32)]
+
+class _LineValues(ctypes.Structure):
+    _fields_ = [('bits', ctypes.c_uint64),
+                ('mask', ctypes.c_uint64)]
+
+# sizeof(struct gpio_v2_line_event)
+GPIO_V2_LINE_EVENT_SIZE = 48
+
+def _iowr(nr, struct_type):
+    return (3 << 30) | (ctypes.sizeof(struct_type) << 16) | (0xB4 << 8) | nr
+
+GPIO_V2_GET_LINE_IOCTL = _iowr(0x07, _LineRequest)
+GPIO_V2_LINE_SET_CONFIG_IOCTL = _iowr(0x0D, _LineConfig)
+GPIO_V2_LINE_GET_VALUES_IOCTL = _iowr(0x0E, _LineValues)
+
+class GpiochipBackend(GPIOBackend):
+    """Bulk backend on /dev/gpiochipN: all harness lines in one line request
+
+    BCM GPIO numbers are the line offsets of gpiochip0 on a Raspberry Pi.
+    """
+
+    supports_edge_events = True
+
+    def __init__(self, chip_path='/dev/gpiochip0', consumer='wire-checker'):
+        super().__init__()
+        self.chip_path = chip_path
+        self.consumer = consumer.encode()[:GPIO_MAX_NAME_SIZE - 1]
+        self.request_fd = None
+        self.values = _LineValues()
+
+    def _config(self, drive_mask, level_mask, edge_mask=0):
+        config = _LineConfig()
+        config.flags = GPIO_V2_LINE_FLAG_INPUT | GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN
+        attrs = []
+        if drive_mask:
+            attrs.append((GPIO_V2_LINE_ATTR_ID_FLAGS, GPIO_V2_LINE_FLAG_OUTPUT, drive_mask))
+            attrs.append((GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES, level_mask, drive_mask))
+        if edge_mask:
+            attrs.append((GPIO_V2_LINE_ATTR_ID_FLAGS,
+                          GPIO_V2_LINE_FLAG_INPUT | GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN |
+                          GPIO_V2_LINE_FLAG_EDGE_RISING, edge_mask))
+        for i, (attr_id, value, mask) in enumerate(attrs):
+            config.attrs[i].attr.id = attr_id
+            config.attrs[i].attr.value = value
+            config.attrs[i].mask = mask
+        config.num_attrs = len(attrs)
+        return config
+
+    def claim(self, pins):
+        pins = list(pins)
+        if len(pins) > GPIO_V2_LINES_MAX:
+            raise ValueError(f"At most {GPIO_V2_LINES_MAX} lines per request")
+        if self.request_fd is not None:
+            if pins == self.pins:
+                self.write_mask(0)
+                return
+            self.close()
+
+        super().claim(pins)
+        request = _LineRequest()
+        for i, pin in enumerate(pins):
+            request.offsets[i] = pin
+        request.num_lines = len(pins)
+        request.consumer = self.consumer
+        request.config = self._config(0, 0)
+
+        chip_fd = os.open(self.chip_path, os.O_RDWR | os.O_CLOEXEC)
+        try:
+            fcntl.ioctl(chip_fd, GPIO_V2_GET_LINE_IOCTL, request)
+        finally:
+            os.close(chip_fd)
+        self.request_fd = request.fd
+
+    def write_mask(self, drive_mask, level_mask=None):
+        if level_mask is None:
+            level_mask = drive_mask
+        level_mask &= drive_mask
+        if drive_mask == self.drive_mask and level_mask == self.level_mask:
+            return
+        fcntl.ioctl(self.request_fd, GPIO_V2_LINE_SET_CONFIG_IOCTL,
+                    self._config(drive_mask, level_mask))
+        self.drive_mask = drive_mask
+        self.level_mask = level_mask
+
+    def read_all(self):
+        values = self.values
+        values.mask = (1 << len(self.pins)) - 1
+        fcntl.ioctl(self.request_fd, GPIO_V2_LINE_GET_VALUES_IOCTL, values)
+        return values.bits
+
+    def wait_for_edge(self, watch_mask, timeout):
+        fcntl.ioctl(self.request_fd, GPIO_V2_LINE_SET_CONFIG_IOCTL,
+                    self._config(self.drive_mask, self.level_mask, watch_mask & ~self.drive_mask))
+        try:
+            readable, _, _ = select.select([self.request_fd], [], [], timeout)
+            if readable:
+                # Drain queued edge events so the next wait starts clean
+                os.read(self.request_fd, GPIO_V2_LINE_EVENT_SIZE * 16)
+            return bool(readable)
+        finally:
+            fcntl.ioctl(self.request_fd, GPIO_V2_LINE_SET_CONFIG_IOCTL,
+                        self._config(self.drive_mask, self.level_mask))
+
+    def close(self):
+        if self.request_fd is not None:
+            os.close(self.request_fd)
+            self.request_fd = None
+
+    def release(self):
+        self.close()
+
+class SimulatedBackend(GPIOBackend):
+    """In-process harness resolved by harness_simulator, every input pulled down
+
+    Pass plain wires for a simple harness, or a HarnessNetlist (with opens,
+    shorts, intermittents and RC delays) and a SimulatedClock for fast,
+    deterministic runs.
+    """
+
+    supports_edge_events = True
+
+    def __init__(self, wires=(), netlist=None, clock=None, seed=0):
+        super().__init__()
+        self.pin_bits = {}
+        if netlist is None:
+            netlist = HarnessNetlist(())
+            for wire in wires:
+                self._add_wire(netlist, wire)
+        self.netlist = netlist
+        self.simulator = HarnessSimulator(netlist, clock, seed)
+        self.clock = self.simulator.clock
+        self.changed = threading.Condition(self.simulator.lock)
+        self.simulator.add_listener(self.changed.notify_all)
+
+    @staticmethod
+    def _add_wire(netlist, wire):
+        wire = tuple(wire)
+        for pin1, pin2 in zip(wire, wire[1:]):
+            netlist.add_wire(pin1, pin2)
+
+    def connect(self, *wire):
+        """Add a wire between pins (e.g. when a harness is inserted)"""
+        with self.changed:
+            self._add_wire(self.netlist, wire)
+            self.simulator.changed()
+
+    def disconnect_all(self):
+        """Remove every wire (harness pulled out)"""
+        with self.changed:
+            self.netlist.clear()
+            self.simulator.changed()
+
+    def claim(self, pins):
+        super().claim(pins)
+        self.pin_bits = {pin: 1 << k for k, pin in enumerate(self.pins)}
+
+    def write_mask(self, drive_mask, level_mask=None):
+        if level_mask is None:
+            level_mask = drive_mask
+        level_mask &= drive_mask
+        with self.changed:
+            changed = self.level_mask ^ level_mask
+            while changed:
+                bit = changed & -changed
+                self.simulator.drive(self.pins[bit.bit_length() - 1], level_mask & bit)
+                changed ^= bit
+            self.drive_mask = drive_mask
+            self.level_mask = level_mask
+
+    def read_all(self):
+        pin_bits = self.pin_bits
+        mask = 0
+        for pin in self.simulator.high_pins():
+            mask |= pin_bits.get(pin, 0)
+        return mask
+
+    def wait_for_edge(self, watch_mask, timeout):
+        clock = self.clock
+        simulated = isinstance(clock, SimulatedClock)
+        deadline = clock.monotonic() + timeout
+        with self.changed:
+            while not self.read_all() & watch_mask:
+                now = clock.monotonic()
+                if now >= deadline:
+                    return False
+                # Sleep until the next scheduled netlist change or pending
+                # RC edge, whichever comes first
+                wake = deadline
+                next_change = self.simulator.next_change_time()
+                if next_change is not None:
+                    wake = min(wake, next_change)
+                if simulated:
+                    clock.advance_to(wake)
+                else:
+                    self.changed.wait(wake - now)
+            return True
+
+def as_backend(gpio):
+    """Return gpio unchanged if it already is a backend, else wrap it"""
+    if isinstance(gpio, GPIOBackend):
+        return gpio
+    return RPiGPIOBackend(gpio)
+
+def get_backend(gpio=None):
+    """Create the backend selected by WIRE_CHECKER_GPIO_BACKEND"""
+    name = os.environ.get('WIRE_CHECKER_GPIO_BACKEND', 'rpi').lower()
+    if name == 'gpiochip':
+        return GpiochipBackend(os.environ.get('WIRE_CHECKER_GPIOCHIP', '/dev/gpiochip0'))
+    if name == 'sim':
+        return SimulatedBackend()
+    if gpio is None:
+        try:
+            import RPi.GPIO as gpio
+        except ImportError:
+            from mock_gpio import GPIO as gpio
+    return RPiGPIOBackend(gpio)
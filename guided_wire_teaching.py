@@ -12,6 +12,8 @@ except ImportError:
     from mock_gpio import GPIO
     RASPBERRY_PI = False
 
+from settle_calibration import DEFAULT_SETTLE_TIME, calibrate
+
 class GuidedWireTeaching:
     def __init__(self, root):
         self.root = root
@@ -28,6 +30,10 @@ class GuidedWireTeaching:
         # Available pins
         self.available_pins = [5, 6, 7, 8, 9, 10, 11, 12, 14, 16, 17, 19, 20, 21, 22, 23, 24, 25, 26, 27]
         
+        # Per-pin settle budgets calibrated on the wires taught so far (seconds);
+        # an unknown wire is always probed with DEFAULT_SETTLE_TIME
+        self.settle_times = {}
+        
         # Setup GPIO
         if RASPBERRY_PI:
             GPIO.setmode(GPIO.BCM)
@@ -259,6 +265,9 @@ class GuidedWireTeaching:
                 
                 self.wire_definitions.append(wire_info)
                 
+                # Measure how fast this wire settles for the saved config
+                self.settle_times.update(calibrate(GPIO, [detected_connection]))
+                
                 result_text = f"✅ {wire_name} ({wire_color}): GPIO{detected_connection[0]} → GPIO{detected_connection[1]}\n"
                 result_text += f"   Function: {wire_function}\n"
                 result_text += f"   Notes: {self.wire_notes_entry.get().strip()}\n\n"
@@ -290,11 +299,11 @@ class GuidedWireTeaching:
         """Test if two pins are connected"""
         try:
             GPIO.output(out_pin, GPIO.HIGH)
-            time.sleep(0.01)
+            time.sleep(DEFAULT_SETTLE_TIME)
             high_received = GPIO.input(in_pin)
             
             GPIO.output(out_pin, GPIO.LOW)
-            time.sleep(0.01)
+            time.sleep(DEFAULT_SETTLE_TIME)
             low_received = GPIO.input(in_pin)
             
             return high_received and not low_received
@@ -362,7 +371,8 @@ class GuidedWireTeaching:
             'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
             'total_wires': len(self.wire_definitions),
             'wire_definitions': self.wire_definitions,
-            'wire_pairs': []
+            'wire_pairs': [],
+            'settle_times': {}
         }
         
         # Convert to wire pairs format
@@ -376,6 +386,9 @@ class GuidedWireTeaching:
                 'wire_function': wire['function'],
                 'wire_notes': wire['notes']
             })
+            for pin in (wire['pin_out'], wire['pin_in']):
+                if pin in self.settle_times:
+                    config_data['settle_times'][str(pin)] = round(self.settle_times[pin], 6)
         
         # Save to file
         config_file = f'guided_teaching_{product_no.replace("-", "_").lower()}.json'
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Harness Simulator for Wire Checker
+Resolves pin levels from a netlist (wire pairs plus injected faults) and the
+currently driven outputs, so scans can run deterministically off-hardware.
+
+Every undriven pin is pulled down. A pin reads HIGH once a HIGH driver's
+level has propagated to it through the wires, each wire adding its RC settle
+delay; after the driver is released the pin stays HIGH for the same delay.
+With a SimulatedClock, sleeps only advance virtual time, so thousands of
+scans run in milliseconds.
+"""
+
+import heapq
+import random
+import threading
+import time
+
+# Virtual time consumed by one bulk read (seconds)
+READ_COST = 0.000005
+
+class SimulatedClock:
+    """Virtual clock: sleep() advances time instantly"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+        self.lock = threading.Lock()
+
+    def monotonic(self):
+        return self.now
+
+    perf_counter = monotonic
+    time = monotonic
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            with self.lock:
+                self.now += seconds
+
+    def advance_to(self, when):
+        with self.lock:
+            if when > self.now:
+                self.now = when
+
+class Wire:
+    def __init__(self, settle=0.0, contact=1.0):
+        # settle: RC delay across the wire (seconds)
+        # contact: chance the wire conducts on any one read (intermittents)
+        self.settle = settle
+        self.contact = contact
+
+class HarnessNetlist:
+    """Wires of one harness, including injected faults"""
+
+    def __init__(self, wire_pairs, opens=(), shorts=(), cross_wires=(),
+                 intermittents=None, settle=0.0, inserted=True):
+        self.wire_pairs = list(wire_pairs)
+        self.wires = {}
+        self.inserted = inserted
+        # Bumped on every change so simulators can cache propagation delays
+        self.version = 0
+
+        for out_pin, in_pin in self.wire_pairs:
+            self.add_wire(out_pin, in_pin, settle)
+        for pair in opens:
+            self.open_pair(pair)
+        for pair1, pair2 in cross_wires:
+            self.cross_wire(pair1, pair2)
+        for pin1, pin2 in shorts:
+            self.add_wire(pin1, pin2, settle)
+        for (pin1, pin2), contact in (intermittents or {}).items():
+            self.add_wire(pin1, pin2, settle, contact)
+
+    def add_wire(self, pin1, pin2, settle=0.0, contact=1.0):
+        self.wires[frozenset((pin1, pin2))] = Wire(settle, contact)
+        self.version += 1
+
+    def remove_wire(self, pin1, pin2):
+        self.wires.pop(frozenset((pin1, pin2)), None)
+        self.version += 1
+
+    def clear(self):
+        """Remove every wire"""
+        self.wires.clear()
+        self.version += 1
+
+    def open_pair(self, pair):
+        """Break the wire of pair index `pair`"""
+        self.remove_wire(*self.wire_pairs[pair])
+
+    def cross_wire(self, pair1, pair2):
+        """Swap the inputs of two pairs (each output lands on the other input)"""
+        out1, in1 = self.wire_pairs[pair1]
+        out2, in2 = self.wire_pairs[pair2]
+        self.remove_wire(out1, in1)
+        self.remove_wire(out2, in2)
+        self.add_wire(out1, in2)
+        self.add_wire(out2, in1)
+
+    def set_settle(self, pin1, pin2, settle):
+        self.wires[frozenset((pin1, pin2))].settle = settle
+        self.version += 1
+
+    def set_intermittent(self, pin1, pin2, contact):
+        self.wires[frozenset((pin1, pin2))].contact = contact
+        self.version += 1
+
+    def insert(self):
+        self.inserted = True
+        self.version += 1
+
+    def remove(self):
+        self.inserted = False
+        self.version += 1
+
+    @property
+    def has_intermittents(self):
+        return any(wire.contact < 1.0 for wire in self.wires.values())
+
+class HarnessSimulator:
+    """Drive state of the fixture plus a netlist, resolved on every read"""
+
+    def __init__(self, netlist, clock=None, seed=0, read_cost=READ_COST):
+        self.netlist = netlist
+        self.clock = clock or time
+        self.random = random.Random(seed)
+        self.read_cost = read_cost if isinstance(self.clock, SimulatedClock) else 0
+        self.lock = threading.RLock()
+        # pin -> [high_since, released_at or None]
+        self.high_windows = {}
+        self.events = []
+        self.event_count = 0
+        self.listeners = []
+        # Earliest time a pending RC edge lands, from the last resolution
+        self.next_edge = None
+        # Propagation delays per source for one netlist version; skipped
+        # while intermittents make every read different
+        self.cached_version = None
+        self.delay_cache = {}
+        self.intermittent = False
+        self.max_delay = 0.0
+
+    # Drive state
+
+    def drive(self, pin, level):
+        with self.lock:
+            now = self.clock.monotonic()
+            window = self.high_windows.get(pin)
+            is_high = window is not None and window[1] is None
+            if level and not is_high:
+                self.high_windows[pin] = [now, None]
+            elif not level and is_high:
+                window[1] = now
+            self._notify()
+
+    def release(self, pin):
+        self.drive(pin, False)
+
+    # Scheduled netlist changes (e.g. insertion at a virtual time)
+
+    def schedule(self, when, action):
+        with self.lock:
+            self.event_count += 1
+            heapq.heappush(self.events, (when, self.event_count, action))
+
+    def next_change_time(self):
+        """Earliest future time a level can change without new drive activity"""
+        with self.lock:
+            times = [self.next_edge]
+            if self.events:
+                times.append(self.events[0][0])
+            times = [t for t in times if t is not None]
+            return min(times) if times else None
+
+    def _run_due_events(self, now):
+        ran = False
+        while self.events and self.events[0][0] <= now:
+            _, _, action = heapq.heappop(self.events)
+            action(self.netlist)
+            ran = True
+        return ran
+
+    def add_listener(self, callback):
+        """callback() runs whenever drive state or the netlist changes"""
+        self.listeners.append(callback)
+
+    def _notify(self):
+        for callback in self.listeners:
+            callback()
+
+    def changed(self):
+        """Call after editing the netlist directly"""
+        with self.lock:
+            self._notify()
+
+    # Level resolution
+
+    def _adjacency(self):
+        adjacency = {}
+        if not self.netlist.inserted:
+            return adjacency
+        rand = self.random.random
+        for pins, wire in self.netlist.wires.items():
+            if wire.contact < 1.0 and rand() >= wire.contact:
+                continue
+            pin1, pin2 = tuple(pins)
+            adjacency.setdefault(pin1, []).append((pin2, wire.settle))
+            adjacency.setdefault(pin2, []).append((pin1, wire.settle))
+        return adjacency
+
+    @staticmethod
+    def _delays_from(source, adjacency):
+        delays = {source: 0.0}
+        queue = [(0.0, source)]
+        while queue:
+            delay, pin = heapq.heappop(queue)
+            if delay > delays.get(pin, float('inf')):
+                continue
+            for other, settle in adjacency.get(pin, ()):
+                total = delay + settle
+                if total < delays.get(other, float('inf')):
+                    delays[other] = total
+                    heapq.heappush(queue, (total, other))
+        return delays
+
+    def _delay_maps(self, sources):
+        """Return {source: {pin: delay}} for the wires conducting right now"""
+        netlist = self.netlist
+        if self.cached_version != netlist.version:
+            self.cached_version = netlist.version
+            self.delay_cache = {}
+            self.intermittent = netlist.has_intermittents
+            self.max_delay = sum(wire.settle for wire in netlist.wires.values())
+
+        if self.intermittent:
+            adjacency = self._adjacency()
+            return {source: self._delays_from(source, adjacency) for source in sources}
+
+        missing = [source for source in sources if source not in self.delay_cache]
+        if missing:
+            adjacency = self._adjacency()
+            for source in missing:
+                self.delay_cache[source] = self._delays_from(source, adjacency)
+        return self.delay_cache
+
+    def high_pins(self):
+        """Return the set of pins reading HIGH right now"""
+        with self.lock:
+            if self.read_cost:
+                self.clock.sleep(self.read_cost)
+            now = self.clock.monotonic()
+            if self._run_due_events(now):
+                self._notify()
+
+            delay_maps = self._delay_maps(list(self.high_windows))
+            high = set()
+            next_edge = None
+            for source, (since, released) in list(self.high_windows.items()):
+                if released is not None and released + self.max_delay < now:
+                    # Fully discharged, forget it
+                    del self.high_windows[source]
+                    continue
+                for pin, delay in delay_maps[source].items():
+                    rises = since + delay
+                    falls = None if released is None else released + delay
+                    if rises <= now and (falls is None or falls > now):
+                        high.add(pin)
+                    for edge in (rises, falls):
+                        if edge is not None and edge > now and (next_edge is None or edge < next_edge):
+                            next_edge = edge
+            self.next_edge = next_edge
+            return high
+
+    def level(self, pin):
+        return pin in self.high_pins()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Inspection Records for Wire Checker
+Follows each harness from insertion to removal across the checker loop's
+scans and produces one inspections row for it: when it was inserted, when
+its final verdict was first reached, when it was pulled, that verdict and
+the full connectivity matrix behind it.
+
+The matrix is stored as a compact blob: the baseline followed by one row
+per pin (outputs then inputs, as in HarnessLayout.pins), each a little-endian
+bitmask of the pins it reached, (pin_count + 7) // 8 bytes wide. A 4-pair
+harness takes 9 bytes. pair_mask and fault_mask are kept as columns too, so
+"which pair failed" can be asked in SQL:
+
+    SELECT verdict, COUNT(*) FROM inspections WHERE pair_mask & 4 = 0 GROUP BY verdict
+"""
+
+from collections import namedtuple
+from datetime import datetime
+
+Inspection = namedtuple('Inspection', 'inserted_at verdict_at removed_at verdict '
+                                      'pair_mask fault_mask pin_count connectivity')
+
+def pack_connectivity(baseline, rows):
+    """Blob of the baseline and connectivity rows of one scan"""
+    width = (len(rows) + 7) // 8
+    return b''.join(value.to_bytes(width, 'little') for value in [baseline] + list(rows))
+
+def unpack_connectivity(blob, pin_count):
+    """(baseline, rows) from a blob written by pack_connectivity"""
+    width = (pin_count + 7) // 8
+    values = [int.from_bytes(blob[i:i + width], 'little') for i in range(0, len(blob), width)]
+    return values[0], values[1:]
+
+class InspectionTracker:
+    """Turns the stable scans of the checker loop into one record per harness
+
+    The final verdict is the last GOOD or NOT GOOD seen while the harness
+    was in (a reseated harness counts by its last result); a harness that
+    never got past OPEN is recorded as OPEN with its last scan.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.inserted_at = None
+        self.verdict = None
+        self.verdict_at = None
+        self.result = None
+
+    def observe(self, result, now=None):
+        """Feed a stable scan; returns an Inspection once the harness is pulled"""
+        now = now or datetime.now()
+        if result.is_empty:
+            return self.finish(now)
+
+        if self.inserted_at is None:
+            self.inserted_at = now
+        verdict = result.verdict
+        if verdict != "OPEN":
+            if verdict != self.verdict:
+                self.verdict = verdict
+                self.verdict_at = now
+                self.result = result
+        elif self.verdict is None:
+            self.result = result
+        return None
+
+    def finish(self, removed_at=None):
+        """Record for the harness in the fixture, if any, and start over;
+        removed_at is None when the checker stops with the harness still in"""
+        if self.inserted_at is None:
+            return None
+        result = self.result
+        inspection = Inspection(self.inserted_at, self.verdict_at, removed_at,
+                                self.verdict or "OPEN", result.pair_mask, result.fault_mask,
+                                len(result.rows), pack_connectivity(result.baseline, result.rows))
+        self.reset()
+        return inspection
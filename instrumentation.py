@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+Loop Instrumentation for Wire Checker
+Times each phase of a wire_checker_loop pass into fixed-size HDR-style
+histograms (log-linear buckets, about 6% precision from 1 us to over an
+hour), so p50/p99/max of the hot path can be read on the line without
+print statements.
+
+Phases: scan (drive and read the connectivity matrix), classify (building
+the ScanResult, i.e. pair and fault masks from the matrix; included in scan
+on a thread, and the rebuild from the published scan with the scan worker),
+actuator (LED, solenoid and buzzer commands), journal_append (queueing the
+cycle count update) and loop (the whole pass, without the idle wait after
+it). verdict runs from the
+start of the scan to the committed verdict; with the scan worker that start
+is the worker's own timestamp, so the poll for its result is included.
+db_write is the event journal's batched commit, timed on its writer thread.
+Stable scans are also counted (scans), whether timing is on or not.
+
+Timing is off unless WIRE_CHECKER_INSTRUMENT=1 or the debug overlay is
+opened with F12 on a checker screen; while off, start() and stop() return
+straight away. A running station dumps the histograms to
+instrumentation_dump.json on SIGUSR1:
+
+    python3 instrumentation.py [--pid PID]
+"""
+
+import argparse
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from datetime import datetime
+
+INSTRUMENT_ENV = 'WIRE_CHECKER_INSTRUMENT'
+DUMP_FILE = 'instrumentation_dump.json'
+PID_FILE = 'instrumentation.pid'
+
+PHASES = ('loop', 'scan', 'classify', 'actuator', 'journal_append', 'verdict', 'db_write')
+
+# Histogram layout: values below 2 x SUB_BUCKETS us are exact, above that
+# each power of two is split into SUB_BUCKETS linear buckets
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+BUCKET_COUNT = SUB_BUCKETS * 30  # up to 2^33 us
+
+# Longest wait for a running station to write its dump (seconds)
+DUMP_TIMEOUT = 3.0
+
+def bucket_index(value):
+    """Bucket of a non-negative integer value"""
+    shift = max(0, value.bit_length() - SUB_BUCKET_BITS - 1)
+    return min(SUB_BUCKETS * shift + (value >> shift), BUCKET_COUNT - 1)
+
+def bucket_range(index):
+    """Lowest and highest value counted in a bucket"""
+    shift = max(0, index // SUB_BUCKETS - 1)
+    low = (index - SUB_BUCKETS * shift) << shift
+    return low, low + (1 << shift) - 1
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of microsecond durations"""
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.reset()
+
+    def reset(self):
+        for i in range(BUCKET_COUNT):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def record(self, microseconds):
+        value = int(microseconds)
+        self.counts[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, fraction):
+        """Highest value of the bucket holding the given fraction of samples"""
+        if not self.count:
+            return 0
+        target = max(1, int(fraction * self.count + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(bucket_range(index)[1], self.max)
+        return self.max
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean_us': round(self.total / self.count, 1) if self.count else 0,
+            'p50_us': self.percentile(0.50),
+            'p99_us': self.percentile(0.99),
+            'p999_us': self.percentile(0.999),
+            'max_us': self.max,
+        }
+
+class PhaseTimers:
+    """One histogram per phase; near free while disabled
+
+        started = timers.start()
+        ...
+        timers.stop('scan', started)
+    """
+
+    def __init__(self, phases=PHASES, enabled=False):
+        self.histograms = {phase: LatencyHistogram() for phase in phases}
+        self.enabled = enabled
+        self.enabled_at = time.time() if enabled else None
+        # tracing.Tracer that also gets every phase as a span, set by tracing
+        self.tracer = None
+        # Stable scans evaluated since start-up; never reset
+        self.scans = 0
+
+    def count_scan(self):
+        self.scans += 1
+
+    def enable(self, enabled=True):
+        if enabled and not self.enabled:
+            self.enabled_at = time.time()
+        self.enabled = enabled
+
+    def start(self):
+        if self.enabled or self.tracer is not None:
+            return time.perf_counter()
+        return 0.0
+
+    def stop(self, phase, started):
+        if started:
+            elapsed = time.perf_counter() - started
+            if self.enabled:
+                self.histograms[phase].record(elapsed * 1e6)
+            if self.tracer is not None:
+                self.tracer.complete(phase, 'loop', started, elapsed)
+
+    def record(self, phase, seconds):
+        """Add a duration measured elsewhere (e.g. by the scan worker) that
+        has just ended"""
+        if self.enabled:
+            self.histograms[phase].record(seconds * 1e6)
+        if self.tracer is not None:
+            self.tracer.complete(phase, 'loop', time.perf_counter() - seconds, seconds)
+
+    def reset(self):
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def summary(self):
+        return {phase: histogram.summary() for phase, histogram in self.histograms.items()}
+
+    def report_lines(self):
+        """Fixed-width table for the overlay and the dump command"""
+        lines = [f"{'phase':<10}{'count':>8}{'p50':>9}{'p99':>9}{'max':>9}  (us)"]
+        for phase, stats in self.summary().items():
+            lines.append(f"{phase:<10}{stats['count']:>8}{stats['p50_us']:>9}"
+                         f"{stats['p99_us']:>9}{stats['max_us']:>9}")
+        return lines
+
+    def dump(self, path=DUMP_FILE):
+        data = {
+            'timestamp': datetime.now().isoformat(),
+            'pid': os.getpid(),
+            'enabled': self.enabled,
+            'enabled_at': self.enabled_at,
+            'phases': self.summary(),
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=4)
+        return data
+
+# Shared by the checker running in this process
+timers = PhaseTimers(enabled=os.environ.get(INSTRUMENT_ENV, '') not in ('', '0'))
+
+def install_dump_signal(pid_file=PID_FILE, dump_file=DUMP_FILE):
+    """Dump the histograms on SIGUSR1 and note this process for the dump command"""
+    if not hasattr(signal, 'SIGUSR1') or threading.current_thread() is not threading.main_thread():
+        return False
+
+    def on_signal(signum, frame):
+        try:
+            timers.dump(dump_file)
+        except Exception as e:
+            print(f"Error writing instrumentation dump: {e}")
+
+    signal.signal(signal.SIGUSR1, on_signal)
+    try:
+        with open(pid_file, 'w') as f:
+            f.write(str(os.getpid()))
+    except OSError as e:
+        print(f"Error writing {pid_file}: {e}")
+    return True
+
+class DebugOverlay:
+    """Phase timing table drawn over a checker screen; F12 shows and hides it"""
+
+    def __init__(self, parent, phase_timers=timers):
+        import tkinter as tk
+        self.timers = phase_timers
+        self.label = tk.Label(parent, font=('Courier', 11), justify='left', anchor='nw',
+                              bg='#212529', fg='#f8f9fa', padx=8, pady=6)
+        self.visible = False
+
+    def toggle(self, event=None):
+        """Show or hide; showing turns timing on"""
+        self.visible = not self.visible
+        if self.visible:
+            self.timers.enable()
+            self.refresh()
+            self.label.place(relx=1.0, rely=0.0, anchor='ne')
+            self.label.lift()
+        else:
+            self.label.place_forget()
+
+    def refresh(self):
+        """Redraw from the current histograms; call from the UI update loop"""
+        if self.visible:
+            self.label.config(text="\n".join(self.timers.report_lines()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Dump loop timing from a running wire checker")
+    parser.add_argument('--pid', type=int, help=f"station process (default: from {PID_FILE})")
+    args = parser.parse_args()
+
+    pid = args.pid
+    if pid is None:
+        try:
+            with open(PID_FILE, 'r') as f:
+                pid = int(f.read().strip())
+        except (OSError, ValueError):
+            print(f"No running wire checker found ({PID_FILE} missing) - pass --pid")
+            sys.exit(1)
+
+    before = os.path.getmtime(DUMP_FILE) if os.path.exists(DUMP_FILE) else 0
+    try:
+        os.kill(pid, signal.SIGUSR1)
+    except OSError as e:
+        print(f"Could not signal process {pid}: {e}")
+        sys.exit(1)
+
+    deadline = time.monotonic() + DUMP_TIMEOUT
+    while not (os.path.exists(DUMP_FILE) and os.path.getmtime(DUMP_FILE) > before):
+        if time.monotonic() > deadline:
+            print(f"Process {pid} did not write {DUMP_FILE}")
+            sys.exit(1)
+        time.sleep(0.05)
+
+    with open(DUMP_FILE, 'r') as f:
+        data = json.load(f)
+    print(f"Process {data['pid']} at {data['timestamp']}"
+          f"{'' if data['enabled'] else ' (timing off: F12 or WIRE_CHECKER_INSTRUMENT=1)'}\n")
+    print(f"{'phase':<10}{'count':>8}{'p50':>9}{'p99':>9}{'p999':>9}{'max':>9}  (us)")
+    for phase, stats in data['phases'].items():
+        print(f"{phase:<10}{stats['count']:>8}{stats['p50_us']:>9}{stats['p99_us']:>9}"
+              f"{stats['p999_us']:>9}{stats['max_us']:>9}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Metrics Endpoint for Wire Checker
+Serves station throughput and health in Prometheus text format on
+http://<station>:9731/metrics (WIRE_CHECKER_METRICS_PORT, set by the
+launcher; unset or 0 turns the endpoint off).
+
+Every value is read from state the station already keeps: the loop phase
+histograms (instrumentation), the checker's status and cycle, and the
+database, whose figures are cached for DB_CACHE_TIME. A scrape never takes
+a lock the scan loop uses, so scraping every 5 s does not disturb it.
+"""
+
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import instrumentation
+from instrumentation import bucket_range
+
+METRICS_PORT_ENV = 'WIRE_CHECKER_METRICS_PORT'
+METRICS_ADDRESS_ENV = 'WIRE_CHECKER_METRICS_ADDRESS'
+DEFAULT_ADDRESS = '0.0.0.0'
+
+# Histogram buckets of verdict and DB write latency (seconds)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Database figures are re-read at most this often (seconds)
+DB_CACHE_TIME = 4.0
+
+STATUSES = ('INITIALIZING', 'GOOD', 'OPEN', 'NOT GOOD')
+
+def prometheus_histogram(name, help_text, histogram, bounds=LATENCY_BUCKETS):
+    """Lines of a Prometheus histogram (seconds) from a LatencyHistogram (us)"""
+    counts = list(histogram.counts)  # copy once; the scan loop keeps recording
+    total = sum(counts)
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+    index = 0
+    cumulative = 0
+    for bound in bounds:
+        limit = bound * 1e6
+        while index < len(counts) and bucket_range(index)[1] <= limit:
+            cumulative += counts[index]
+            index += 1
+        lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{le="+Inf"}} {total}')
+    lines.append(f"{name}_sum {histogram.total / 1e6:.6f}")
+    lines.append(f"{name}_count {total}")
+    return lines
+
+def label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"')
+
+class StationMetrics:
+    """Builds the /metrics page
+
+    checker_state is a callable returning the running checker's
+    {'configuration', 'status', 'cycle_id'}, or None on other screens.
+    """
+
+    def __init__(self, db_manager, checker_state=lambda: None,
+                 phase_timers=instrumentation.timers):
+        self.db_manager = db_manager
+        self.checker_state = checker_state
+        self.timers = phase_timers
+        self.started_at = time.time()
+        self.last_rate_sample = None
+        self.db_cache = {}
+        self.db_read_at = None
+
+    def scans_per_second(self, scans):
+        """Average since the previous scrape"""
+        now = time.monotonic()
+        previous = self.last_rate_sample
+        self.last_rate_sample = (now, scans)
+        if previous is None or now <= previous[0]:
+            return 0.0
+        return max(0, scans - previous[1]) / (now - previous[0])
+
+    def database_figures(self, cycle_id):
+        """Cycle counts and export backlog, cached for DB_CACHE_TIME"""
+        now = time.monotonic()
+        if (self.db_read_at is not None and now - self.db_read_at < DB_CACHE_TIME and
+                self.db_cache.get('cycle_id') == cycle_id):
+            return self.db_cache
+        figures = {'cycle_id': cycle_id, 'cycle': None, 'export_backlog': None}
+        try:
+            if cycle_id:
+                figures['cycle'] = self.db_manager.get_current_cycle(cycle_id)
+            figures['export_backlog'] = self.db_manager.count_export_backlog()
+        except Exception as e:
+            print(f"Error reading metrics from database: {e}")
+        self.db_cache = figures
+        self.db_read_at = now
+        return figures
+
+    def render(self):
+        histograms = self.timers.histograms
+        scans = self.timers.scans
+        state = self.checker_state() or {}
+        figures = self.database_figures(state.get('cycle_id'))
+
+        lines = [
+            "# HELP wire_checker_up Station process is running",
+            "# TYPE wire_checker_up gauge",
+            "wire_checker_up 1",
+            "# HELP wire_checker_uptime_seconds Time since the metrics endpoint started",
+            "# TYPE wire_checker_uptime_seconds gauge",
+            f"wire_checker_uptime_seconds {time.time() - self.started_at:.0f}",
+            "# HELP wire_checker_scans_total Stable scans evaluated by the checker loop",
+            "# TYPE wire_checker_scans_total counter",
+            f"wire_checker_scans_total {scans}",
+            "# HELP wire_checker_scans_per_second Scan rate since the previous scrape",
+            "# TYPE wire_checker_scans_per_second gauge",
+            f"wire_checker_scans_per_second {self.scans_per_second(scans):.2f}",
+        ]
+        lines += prometheus_histogram(
+            'wire_checker_verdict_latency_seconds',
+            "Start of the scan to committed verdict", histograms['verdict'])
+        lines += prometheus_histogram(
+            'wire_checker_db_write_latency_seconds',
+            "Batched commit of cycle counts and inspections", histograms['db_write'])
+
+        status = state.get('status')
+        lines += ["# HELP wire_checker_status Current verdict of the running checker",
+                  "# TYPE wire_checker_status gauge"]
+        for name in STATUSES:
+            lines.append(f'wire_checker_status{{status="{name}"}} {int(status == name)}')
+
+        cycle = figures['cycle']
+        if cycle:
+            labels = (f'cycle="{label(cycle["cycle_id"][:8])}",'
+                      f'configuration="{label(cycle["configuration"])}"')
+            lines += ["# HELP wire_checker_cycle_checks Harnesses counted in the current cycle",
+                      "# TYPE wire_checker_cycle_checks gauge"]
+            for name, key in (('GOOD', 'good_count'), ('NOT GOOD', 'not_good_count'),
+                              ('OPEN', 'open_count')):
+                lines.append(f'wire_checker_cycle_checks{{{labels},status="{name}"}} '
+                             f'{cycle[key]}')
+
+        if figures['export_backlog'] is not None:
+            lines += ["# HELP wire_checker_export_backlog Completed cycles not yet sent to the server",
+                      "# TYPE wire_checker_export_backlog gauge",
+                      f"wire_checker_export_backlog {figures['export_backlog']}"]
+
+        # Only once the lock manager is in use; reading it never starts one
+        rfid_manager = sys.modules.get('rfid_manager')
+        lock_manager = getattr(rfid_manager, 'solenoid_lock_manager', None)
+        if lock_manager is not None:
+            lines += ["# HELP wire_checker_rfid_locked Solenoids locked until an authorized card",
+                      "# TYPE wire_checker_rfid_locked gauge",
+                      f"wire_checker_rfid_locked {int(lock_manager.is_locked)}"]
+
+        return "\n".join(lines) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    metrics = None
+
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        try:
+            body = self.metrics.render().encode('utf-8')
+        except Exception as e:
+            print(f"Error rendering metrics: {e}")
+            self.send_error(500)
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # one line per scrape would flood the console
+
+def start_metrics_server(metrics, port=None, address=None):
+    """Serve metrics from a daemon thread; returns the server, or None when
+    the endpoint is off or the port is taken"""
+    if port is None:
+        port = int(os.environ.get(METRICS_PORT_ENV, '0') or 0)
+    if not port:
+        return None
+    address = address or os.environ.get(METRICS_ADDRESS_ENV, DEFAULT_ADDRESS)
+
+    handler = type('MetricsHandler', (_MetricsHandler,), {'metrics': metrics})
+    try:
+        server = HTTPServer((address, port), handler)
+    except OSError as e:
+        print(f"Metrics endpoint not started on {address}:{port}: {e}")
+        return None
+    # The histograms are the source of scan and latency figures; timing
+    # only goes on once someone can scrape them
+    metrics.timers.enable()
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    print(f"Metrics on http://{address}:{server.server_address[1]}/metrics")
+    return server
@@ -9,9 +9,16 @@ class MockGPIO:
     HIGH = True
     LOW = False
     PUD_DOWN = "PUD_DOWN"
+    RISING = "RISING"
+    FALLING = "FALLING"
+    BOTH = "BOTH"
     
     _pin_states = {}
     _pin_modes = {}
+    _event_callbacks = {}
+    _event_flags = {}
+    _simulator = None
+    _high_pins = set()
     
     @classmethod
     def setmode(cls, mode):
@@ -21,25 +28,89 @@ class MockGPIO:
     def setwarnings(cls, state):
         pass
     
+    @classmethod
+    def attach_netlist(cls, netlist, clock=None, seed=0):
+        """Resolve inputs from a harness_simulator netlist instead of at random"""
+        from harness_simulator import HarnessSimulator
+        cls._simulator = HarnessSimulator(netlist, clock, seed)
+        cls._high_pins = set()
+        cls._simulator.add_listener(cls._check_edges)
+        return cls._simulator
+    
+    @classmethod
+    def detach_netlist(cls):
+        cls._simulator = None
+    
+    @classmethod
+    def _check_edges(cls):
+        # Fire callbacks for watched pins that went HIGH since the last check
+        if not cls._event_callbacks:
+            return
+        high = cls._simulator.high_pins()
+        for pin in high - cls._high_pins:
+            cls.simulate_edge(pin)
+        cls._high_pins = high
+    
     @classmethod
     def setup(cls, pin, mode, pull_up_down=None):
         cls._pin_modes[pin] = mode
         if mode == cls.OUT:
             cls._pin_states[pin] = cls.LOW
+        if cls._simulator:
+            cls._simulator.release(pin)
     
     @classmethod
     def output(cls, pin, state):
         cls._pin_states[pin] = state
+        if cls._simulator and cls._pin_modes.get(pin) == cls.OUT:
+            cls._simulator.drive(pin, state)
     
     @classmethod
     def input(cls, pin):
+        if cls._simulator:
+            return cls._simulator.level(pin)
         # Simulate random input for testing
         return random.choice([True, False])
     
+    @classmethod
+    def add_event_detect(cls, pin, edge, callback=None, bouncetime=None):
+        if cls._simulator and not cls._event_callbacks:
+            cls._high_pins = cls._simulator.high_pins()
+        cls._event_flags[pin] = False
+        cls._event_callbacks[pin] = [callback] if callback else []
+    
+    @classmethod
+    def add_event_callback(cls, pin, callback):
+        cls._event_callbacks.setdefault(pin, []).append(callback)
+    
+    @classmethod
+    def remove_event_detect(cls, pin):
+        cls._event_callbacks.pop(pin, None)
+        cls._event_flags.pop(pin, None)
+    
+    @classmethod
+    def event_detected(cls, pin):
+        detected = cls._event_flags.get(pin, False)
+        if pin in cls._event_flags:
+            cls._event_flags[pin] = False
+        return detected
+    
+    @classmethod
+    def simulate_edge(cls, pin):
+        """Fire the edge callbacks registered on pin, as RPi.GPIO would"""
+        if pin not in cls._event_callbacks:
+            return
+        cls._event_flags[pin] = True
+        for callback in list(cls._event_callbacks[pin]):
+            callback(pin)
+    
     @classmethod
     def cleanup(cls):
         cls._pin_states.clear()
         cls._pin_modes.clear()
+        cls._event_callbacks.clear()
+        cls._event_flags.clear()
+        cls._high_pins = set()
 
 # Create mock GPIO instance
 GPIO = MockGPIO()
\ No newline at end of file
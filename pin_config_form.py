@@ -491,7 +491,9 @@ Product No: {product_no}
         try:
             self.root.destroy()
             
-            subprocess.run([sys.executable, 'wire_checker_main.py'])
+            # Started from the resident station, which reappears on its own
+            if not os.environ.get('WIRE_CHECKER_STATION'):
+                subprocess.run([sys.executable, 'wire_checker_main.py'])
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to return to main menu: {e}")
@@ -614,7 +616,7 @@ def wire_checker_loop():
                 # Update database
                 if db_manager and cycle_id and current_status != previous_status:
                     if current_status in ["GOOD", "OPEN"]:
-                        db_manager.update_cycle_count(cycle_id, current_status)
+                        db_manager.journal.append(cycle_id, current_status)
                 
                 previous_status = current_status
             
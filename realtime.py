@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Real-time Scheduling for Wire Checker
+Puts the scan worker on its own core (an isolcpus core when the kernel has
+one), raises it to SCHED_FIFO and locks its memory, so settle windows are
+not stretched by the desktop, page faults or other processes. Enabled with
+WIRE_CHECKER_REALTIME=1; each step is skipped with a message where the OS
+does not permit it (SCHED_FIFO and mlockall need root, CAP_SYS_NICE /
+CAP_IPC_LOCK or matching rtprio / memlock limits).
+
+Run as a script to measure settle jitter (actual vs requested settle time)
+on the fixture, first with normal scheduling, then real-time:
+
+    python3 realtime.py [--seconds 10] [--output jitter_report.json]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import json
+import os
+from collections import deque
+from datetime import datetime
+
+REALTIME_ENV = 'WIRE_CHECKER_REALTIME'
+PRIORITY_ENV = 'WIRE_CHECKER_RT_PRIORITY'
+CPU_ENV = 'WIRE_CHECKER_SCAN_CPU'
+
+# SCHED_FIFO priority of the scan worker (1-99); stays below the kernel's
+# own threaded IRQ handlers (50) so GPIO interrupts still get through
+DEFAULT_PRIORITY = 40
+
+ISOLATED_CPUS_FILE = '/sys/devices/system/cpu/isolated'
+
+# mlockall flags (sys/mman.h)
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+
+# Settle windows kept by a SettleJitter
+JITTER_SAMPLES = 20000
+
+# Pairs measured by the jitter report without a saved pin configuration
+DEFAULT_WIRE_PAIRS = [(17, 27), (22, 10), (9, 11), (5, 6)]
+
+def realtime_enabled():
+    """True when the scan worker should use real-time scheduling"""
+    return os.environ.get(REALTIME_ENV, '') not in ('', '0')
+
+def parse_cpu_list(text):
+    """Parse a kernel CPU list such as "2-3,5" into a sorted list"""
+    cpus = set()
+    for part in text.strip().split(','):
+        if not part:
+            continue
+        first, _, last = part.partition('-')
+        cpus.update(range(int(first), int(last or first) + 1))
+    return sorted(cpus)
+
+def isolated_cpus(path=ISOLATED_CPUS_FILE):
+    """Cores reserved with isolcpus=, empty when there are none"""
+    try:
+        with open(path, 'r') as f:
+            return parse_cpu_list(f.read())
+    except (OSError, ValueError):
+        return []
+
+def default_cpu():
+    """Core for the scan worker: WIRE_CHECKER_SCAN_CPU, else the last
+    isolated core, else the last core (None on a single core)"""
+    if os.environ.get(CPU_ENV):
+        return int(os.environ[CPU_ENV])
+    isolated = isolated_cpus()
+    if isolated:
+        return isolated[-1]
+    count = os.cpu_count() or 1
+    return count - 1 if count > 1 else None
+
+def pin_to_cpu(cpu):
+    """Pin the calling process to one core, where the OS allows it"""
+    if cpu is None or not hasattr(os, 'sched_setaffinity'):
+        return False
+    try:
+        os.sched_setaffinity(0, {cpu})
+        return True
+    except OSError as e:
+        print(f"Could not pin scan worker to CPU {cpu}: {e}")
+        return False
+
+def set_fifo_priority(priority):
+    """Switch the calling process to SCHED_FIFO at priority"""
+    if not hasattr(os, 'SCHED_FIFO'):
+        return False
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        return True
+    except OSError as e:
+        print(f"SCHED_FIFO not permitted ({e}) - needs CAP_SYS_NICE or an rtprio limit")
+        return False
+
+def lock_memory():
+    """Lock current and future pages in RAM so the scan never page-faults"""
+    libc_name = ctypes.util.find_library('c')
+    if libc_name is None:
+        return False
+    libc = ctypes.CDLL(libc_name, use_errno=True)
+    if libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+        errno = ctypes.get_errno()
+        print(f"mlockall failed ({os.strerror(errno)}) - needs CAP_IPC_LOCK or a memlock limit")
+        return False
+    return True
+
+def apply(cpu=None, priority=None, lock=True):
+    """Pin, raise and lock the calling process; returns what took effect"""
+    if priority is None:
+        priority = int(os.environ.get(PRIORITY_ENV, DEFAULT_PRIORITY))
+    return {
+        'cpu': cpu if pin_to_cpu(cpu) else None,
+        'fifo_priority': priority if set_fifo_priority(priority) else None,
+        'memory_locked': lock_memory() if lock else False,
+    }
+
+class SettleJitter:
+    """Records how long each settle wait actually took against the request
+
+    Attach one to ScanEngine.jitter; while it is None the scan sleeps as
+    before and nothing is recorded.
+    """
+
+    def __init__(self, size=JITTER_SAMPLES):
+        self.requested = deque(maxlen=size)
+        self.actual = deque(maxlen=size)
+
+    def sleep(self, clock, seconds):
+        start = clock.perf_counter()
+        clock.sleep(seconds)
+        self.requested.append(seconds)
+        self.actual.append(clock.perf_counter() - start)
+
+    def clear(self):
+        self.requested.clear()
+        self.actual.clear()
+
+    def report(self):
+        """Overshoot (actual - requested) percentiles in microseconds"""
+        overshoot = sorted((actual - requested) * 1e6
+                           for requested, actual in zip(self.requested, self.actual))
+        if not overshoot:
+            return {'samples': 0}
+
+        def percentile(fraction):
+            return round(overshoot[min(len(overshoot) - 1, int(fraction * len(overshoot)))], 1)
+
+        return {
+            'samples': len(overshoot),
+            'requested_us': round(sum(self.requested) / len(self.requested) * 1e6, 1),
+            'p50_us': percentile(0.50),
+            'p99_us': percentile(0.99),
+            'p999_us': percentile(0.999),
+            'max_us': round(overshoot[-1], 1),
+        }
+
+def measure_jitter(engine, seconds):
+    """Scan for seconds and return the settle jitter report"""
+    clock = engine.backend.clock
+    jitter = SettleJitter()
+    engine.jitter = jitter
+    try:
+        deadline = clock.monotonic() + seconds
+        while clock.monotonic() < deadline:
+            engine.scan()
+    finally:
+        engine.jitter = None
+        engine.backend.write_mask(0)
+    return jitter.report()
+
+def load_wire_pairs():
+    """Wire pairs of the saved pin configuration, or the 4-pair default"""
+    from settle_calibration import CONFIG_FILE
+    if not os.path.exists(CONFIG_FILE):
+        return DEFAULT_WIRE_PAIRS
+    with open(CONFIG_FILE, 'r') as f:
+        config_data = json.load(f)
+    return [(pair['pin_out'], pair['pin_in'])
+            for pair in config_data.get('wire_pairs', [])] or DEFAULT_WIRE_PAIRS
+
+def main():
+    from gpio_backend import get_backend, RPiGPIOBackend
+    from scan_engine import ScanEngine
+    from settle_calibration import load_settle_times
+
+    parser = argparse.ArgumentParser(description="Settle jitter: normal vs real-time scheduling")
+    parser.add_argument('--seconds', type=float, default=10.0, help="scan time per phase")
+    parser.add_argument('--cpu', type=int, default=None)
+    parser.add_argument('--priority', type=int, default=None)
+    parser.add_argument('--output', default='jitter_report.json')
+    args = parser.parse_args()
+
+    backend = get_backend()
+    if isinstance(backend, RPiGPIOBackend):
+        # RPi.GPIO refuses to set up pins until the numbering mode is chosen
+        backend.gpio.setmode(backend.gpio.BCM)
+        backend.gpio.setwarnings(False)
+    engine = ScanEngine(backend, load_wire_pairs(), settle_times=load_settle_times())
+    engine.setup_pins()
+
+    try:
+        print(f"Scanning {args.seconds:.0f} s with normal scheduling...")
+        normal = measure_jitter(engine, args.seconds)
+        cpu = default_cpu() if args.cpu is None else args.cpu
+        applied = apply(cpu, args.priority)
+        print(f"Scanning {args.seconds:.0f} s real-time "
+              f"(cpu {applied['cpu']}, fifo {applied['fifo_priority']}, "
+              f"locked {applied['memory_locked']})...")
+        realtime = measure_jitter(engine, args.seconds)
+    finally:
+        engine.backend.release()
+
+    print(f"\n{'settle overshoot':<18}{'normal':>12}{'realtime':>12}")
+    for key in ('p50_us', 'p99_us', 'p999_us', 'max_us'):
+        print(f"{key[:-3]:<18}{normal.get(key, 0):>10.1f}us{realtime.get(key, 0):>10.1f}us")
+
+    report = {
+        'timestamp': datetime.now().isoformat(),
+        'seconds': args.seconds,
+        'applied': applied,
+        'normal': normal,
+        'realtime': realtime,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=4)
+    print(f"\n✓ Jitter report saved to {args.output}")
+
+if __name__ == '__main__':
+    main()
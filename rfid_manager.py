@@ -1,16 +1,9 @@
-# Handle serial import for Windows compatibility
-try:
-    import serial
-    SERIAL_AVAILABLE = True
-except ImportError:
-    print("pyserial not available - using simulation mode")
-    SERIAL_AVAILABLE = False
-    
 import time
 import json
 import os
 import threading
 from datetime import datetime
+from startup_profile import fast_start
 
 # Handle GPIO import
 try:
@@ -25,6 +18,7 @@ class RFIDManager:
         self.port = port
         self.baudrate = baudrate
         self.serial_conn = None
+        self.serial_ready = False
         self.is_reading = False
         self.authorized_cards = []
         self.lock_status = False
@@ -33,18 +27,29 @@ class RFIDManager:
         # Load authorized cards
         self.load_authorized_cards()
         
-        # Initialize serial connection
-        self.init_serial()
+        # Initialize serial connection (fast start: on the first card read,
+        # which runs on the reader thread)
+        if not fast_start():
+            self.init_serial()
     
     def init_serial(self):
         """Initialize serial connection to RDM6300"""
+        self.serial_ready = True
+        if not RASPBERRY_PI:
+            print("RFID Reader simulation mode (Windows/No Serial)")
+            return
+        
+        # Handle serial import for Windows compatibility (pyserial is only
+        # loaded once the reader is actually opened)
         try:
-            if RASPBERRY_PI and SERIAL_AVAILABLE:
-                self.serial_conn = serial.Serial(self.port, self.baudrate, timeout=1)
-                print(f"RFID Reader connected on {self.port}")
-            else:
-                print("RFID Reader simulation mode (Windows/No Serial)")
-                self.serial_conn = None
+            import serial
+        except ImportError:
+            print("pyserial not available - using simulation mode")
+            return
+        
+        try:
+            self.serial_conn = serial.Serial(self.port, self.baudrate, timeout=1)
+            print(f"RFID Reader connected on {self.port}")
         except Exception as e:
             print(f"Failed to connect RFID Reader: {e}")
             self.serial_conn = None
@@ -120,6 +125,8 @@ class RFIDManager:
     
     def read_card(self):
         """Read RF ID card from RDM6300"""
+        if not self.serial_ready:
+            self.init_serial()
         if not self.serial_conn:
             # Simulation mode for Windows testing
             return self.simulate_card_read()
@@ -0,0 +1,523 @@
+#!/usr/bin/env python3
+"""
+Scan Engine for Wire Checker
+Drives each harness pin once and reads every other pin in the same settle
+window, so a single pass builds the full connectivity matrix
+
+Pins are indexed outputs first, then inputs. Every row of the matrix is an
+integer bitmask (bit k set = pin k read HIGH), and the expected netlist built
+from WIRE_PAIRS is kept in the same form, so classification and diffing are
+plain AND/XOR operations on a handful of integers.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from gpio_backend import as_backend
+from settle_calibration import DEFAULT_SETTLE_TIME, SettleMonitor, calibrate
+
+# Time to let a driven line settle before sampling when a pin has no
+# calibrated budget (seconds)
+SETTLE_TIME = DEFAULT_SETTLE_TIME
+
+# Reads taken back to back at the end of each settle window, and how many
+# of them must agree before a pin's level counts (N of M). A pin that gets
+# neither N HIGH nor N LOW votes is undecided and the scan is not stable.
+SCAN_SAMPLES = 5
+SCAN_VOTES = 4
+
+# Stimulus modes: drive every pin on its own, or drive binary-coded net
+# patterns and single-drive only the pins that disagree with them.
+# WIRE_CHECKER_STIMULUS selects the default.
+STIMULUS_SINGLE = 'single'
+STIMULUS_CODED = 'coded'
+
+# Idle insertion watch: sentinel poll rate without interrupts, and the
+# longest wait before a full rescan anyway (seconds)
+IDLE_POLL_INTERVAL = 0.05
+MAX_IDLE_TIME = 5.0
+
+# Longest a watcher blocks on an edge before checking for cancel() (seconds)
+CANCEL_CHECK_INTERVAL = 0.1
+
+# Holding a GOOD harness: continuity check rate, and the longest hold
+# before a full rescan anyway (seconds)
+HOLD_POLL_INTERVAL = 0.02
+MAX_HOLD_TIME = 5.0
+
+def iter_bits(mask):
+    """Yield the index of every set bit in mask, lowest first"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+def count_bits(mask):
+    """Return the number of set bits in mask"""
+    return bin(mask).count('1')
+
+class MajorityVote:
+    """N-of-M vote per pin over a ring buffer of bulk reads
+
+    Each buffer entry is one read of every pin, so bit k across the entries
+    holds pin k's last M samples.
+    """
+
+    def __init__(self, samples=SCAN_SAMPLES, votes=SCAN_VOTES):
+        if not samples / 2 < votes <= samples:
+            raise ValueError(f"Need a majority: {votes} of {samples} votes")
+        self.samples = deque(maxlen=samples)
+        self.votes = votes
+
+    def add(self, levels):
+        self.samples.append(levels)
+
+    def clear(self):
+        self.samples.clear()
+
+    def at_least(self, count):
+        """Mask of pins read HIGH in at least count of the buffered samples"""
+        # at_least[j]: pins HIGH in j or more samples so far (-1 = every pin)
+        at_least = [-1] + [0] * count
+        for sample in self.samples:
+            for j in range(count, 0, -1):
+                at_least[j] |= at_least[j - 1] & sample
+        return at_least[count]
+
+    def decide(self, pin_mask):
+        """Return (high, undecided) masks for the pins in pin_mask"""
+        high = self.at_least(self.votes)
+        # Fewer HIGH samples than this means the LOW votes won
+        not_low = self.at_least(len(self.samples) - self.votes + 1)
+        return high & pin_mask, not_low & ~high & pin_mask
+
+class ScanResult:
+    """Connectivity matrix of one scan and the verdicts derived from it"""
+
+    def __init__(self, layout, rows, baseline, drive_steps=None, undecided=0):
+        self.wire_pairs = layout.wire_pairs
+        self.pair_count = layout.pair_count
+        self.expected = layout.expected
+        self.output_mask = layout.output_mask
+        self.input_mask = layout.input_mask
+        self.all_pairs_mask = layout.all_pairs_mask
+        self.rows = rows
+        self.baseline = baseline
+        self.drive_steps = len(rows) if drive_steps is None else drive_steps
+        # Pins whose samples were too split to vote on in any drive step
+        self.undecided = undecided
+
+        pair_count = self.pair_count
+
+        # Bit i set when pair i's input follows its output and idles LOW
+        pair_mask = 0
+        for i in range(pair_count):
+            if (rows[i] >> (pair_count + i)) & 1:
+                pair_mask |= 1 << i
+        self.pair_mask = pair_mask & ~(baseline >> pair_count)
+
+        # Bit k set when driving pin k reached a pin it should not
+        fault_mask = 0
+        for k, row in enumerate(rows):
+            if row & ~self.expected[k]:
+                fault_mask |= 1 << k
+        self.fault_mask = fault_mask
+
+    @property
+    def is_stable(self):
+        """False when some pin could not be outvoted; the verdict of an
+        unstable scan should not be committed"""
+        return self.undecided == 0
+
+    @property
+    def open_mask(self):
+        """Bit i set for every pair that is not connected"""
+        return self.all_pairs_mask & ~self.pair_mask
+
+    @property
+    def all_connected(self):
+        return self.pair_mask == self.all_pairs_mask
+
+    @property
+    def has_cross_connections(self):
+        return self.fault_mask != 0
+
+    @property
+    def is_empty(self):
+        """True when no pin reached any other pin: the fixture is empty"""
+        return not self.baseline and not any(self.rows)
+
+    @property
+    def verdict(self):
+        """Return "NOT GOOD", "GOOD" or "OPEN" for this scan"""
+        if self.fault_mask:
+            return "NOT GOOD"
+        if self.pair_mask == self.all_pairs_mask:
+            return "GOOD"
+        return "OPEN"
+
+    def changed_pins(self, previous):
+        """Return a mask of pins whose readings differ from a previous scan"""
+        if previous is None:
+            return (1 << len(self.rows)) - 1
+        changed = self.baseline ^ previous.baseline
+        for k, row in enumerate(self.rows):
+            if row != previous.rows[k]:
+                changed |= 1 << k
+        return changed
+
+    def _faults(self, driven_mask, read_mask):
+        pair_count = self.pair_count
+        faults = []
+        for k in iter_bits(self.fault_mask & driven_mask):
+            unexpected = self.rows[k] & read_mask & ~self.expected[k]
+            for j in iter_bits(unexpected):
+                faults.append((k % pair_count, j % pair_count))
+        return faults
+
+    # List views kept for the UI and diagnostics; built only on access
+
+    @property
+    def pair_results(self):
+        return [bool((self.pair_mask >> i) & 1) for i in range(self.pair_count)]
+
+    @property
+    def cross_connections(self):
+        return self._faults(self.output_mask, self.input_mask)
+
+    @property
+    def in_to_in_connections(self):
+        return self._faults(self.input_mask, self.input_mask)
+
+    @property
+    def out_to_out_connections(self):
+        return self._faults(self.output_mask, self.output_mask)
+
+class HarnessLayout:
+    """Pin order and expected netlist of a set of wire pairs; all a
+    ScanResult needs, so results can be rebuilt away from the pins"""
+
+    def __init__(self, wire_pairs):
+        self.wire_pairs = list(wire_pairs)
+        self.pins = ([out_pin for out_pin, _ in self.wire_pairs] +
+                     [in_pin for _, in_pin in self.wire_pairs])
+        self.bits = [1 << k for k in range(len(self.pins))]
+        self.pin_mask = (1 << len(self.pins)) - 1
+
+        # Expected netlist: each output should only reach its own input
+        pair_count = len(self.wire_pairs)
+        self.pair_count = pair_count
+        self.output_mask = (1 << pair_count) - 1
+        self.input_mask = self.output_mask << pair_count
+        self.all_pairs_mask = self.output_mask
+        self.expected = ([1 << (pair_count + i) for i in range(pair_count)] +
+                         [1 << i for i in range(pair_count)])
+
+class ScanEngine(HarnessLayout):
+    def __init__(self, gpio, wire_pairs, settle_time=SETTLE_TIME, settle_times=None,
+                 stimulus=None, samples=SCAN_SAMPLES, votes=SCAN_VOTES):
+        super().__init__(wire_pairs)
+        # Accepts a GPIOBackend or a plain RPi.GPIO style module
+        self.backend = as_backend(gpio)
+        self.stimulus = stimulus or os.environ.get('WIRE_CHECKER_STIMULUS', STIMULUS_SINGLE)
+        if self.stimulus not in (STIMULUS_SINGLE, STIMULUS_CODED):
+            raise ValueError(f"Unknown stimulus mode: {self.stimulus}")
+        self.settle_time = settle_time
+
+        # Per-pin settle budgets from calibration, default for the rest
+        self.set_settle_times(settle_times or {})
+        self.monitor = SettleMonitor()
+        self.recalibration_due = False
+        self.vote = MajorityVote(samples, votes)
+        self.undecided = 0
+        # Optional realtime.SettleJitter recording actual settle waits
+        self.jitter = None
+        # Time the last scan spent deriving verdicts from its matrix (seconds)
+        self.classify_seconds = 0.0
+        pair_count = self.pair_count
+
+        # Coded stimulus: net i (both pins of pair i) carries code i. Each
+        # pattern drives the nets with that code bit set; since any two nets
+        # differ in some bit, every short between nets makes a pin read a
+        # level its own net did not have
+        self.coded_patterns = []
+        for b in range(max(pair_count - 1, 0).bit_length()):
+            drive = 0
+            for i in range(pair_count):
+                if (i >> b) & 1:
+                    drive |= self.bits[i] | self.bits[pair_count + i]
+            self.coded_patterns.append(drive)
+
+    def set_settle_times(self, settle_times):
+        """Apply {pin: seconds} budgets; pins not listed use settle_time"""
+        self.settle_budgets = [settle_times.get(pin, self.settle_time) for pin in self.pins]
+        self.baseline_settle = max(self.settle_budgets) if self.settle_budgets else 0
+
+    def recalibrate(self):
+        """Re-measure settle budgets; call only with a GOOD harness inserted"""
+        settle_times = calibrate(self.backend, self.wire_pairs)
+        self.set_settle_times(settle_times)
+        self.setup_pins()
+        self.monitor.reset()
+        self.recalibration_due = False
+        return settle_times
+
+    def setup_pins(self):
+        """Put every harness pin in its idle state (input, pulled down)"""
+        self.backend.claim(self.pins)
+
+    def read_levels(self):
+        """Read every harness pin into a bitmask"""
+        return self.backend.read_all()
+
+    def _sample(self, drive_mask, settle):
+        """Drive drive_mask, wait settle seconds and return the voted levels
+        of every pin; pins without a majority are added to self.undecided"""
+        backend = self.backend
+        vote = self.vote
+        # One bulk write releases the previous pins and drives these
+        backend.write_mask(drive_mask)
+        if self.jitter is None:
+            backend.clock.sleep(settle)
+        else:
+            self.jitter.sleep(backend.clock, settle)
+
+        vote.clear()
+        first = backend.read_all()
+        vote.add(first)
+        unstable = False
+        for _ in range(vote.samples.maxlen - 1):
+            levels = backend.read_all()
+            vote.add(levels)
+            unstable = unstable or levels != first
+
+        # Reads straight after the settle window must agree, otherwise the
+        # lines were still moving when sampled
+        self.monitor.record(unstable)
+        if not unstable:
+            return first & self.pin_mask
+
+        high, undecided = vote.decide(self.pin_mask)
+        self.undecided |= undecided
+        return high
+
+    def scan(self):
+        """Scan with the configured stimulus and return the ScanResult"""
+        if self.stimulus == STIMULUS_CODED:
+            return self.scan_coded()
+        return self.scan_single()
+
+    def scan_single(self):
+        """Drive each pin once and return the resulting ScanResult"""
+        self.undecided = 0
+
+        # Nothing driven: every pin should idle LOW
+        baseline = self._sample(0, self.baseline_settle)
+
+        rows = []
+        for bit, settle in zip(self.bits, self.settle_budgets):
+            rows.append(self._sample(bit, settle) & ~bit)
+
+        self.backend.write_mask(0)
+        self._check_settle_errors()
+        return self._result(rows, baseline)
+
+    def scan_coded(self):
+        """Drive log2(pairs) coded patterns plus one continuity step, then
+        single-drive only the pins that disagreed with a pattern
+
+        Gives the same rows as scan_single. Confirmed pins are driven on their
+        own. Any other pin either shares a confirmed pin's net (a wire joins
+        both ends, so its row follows from that one) or touches nothing
+        outside its own pair, where the continuity step tells whether the
+        pair is connected.
+        """
+        self.undecided = 0
+
+        baseline = self._sample(0, self.baseline_settle)
+        baseline_undecided = self.undecided
+
+        mismatched = baseline
+        for drive in self.coded_patterns:
+            mismatched |= self._sample(drive, self.baseline_settle) ^ drive
+
+        # All outputs at once: an input that stays LOW is open
+        connected = self._sample(self.output_mask, self.baseline_settle) >> self.pair_count
+
+        # Pins left undecided by a pattern are confirmed on their own; only
+        # the baseline and the confirm reads can make the scan unstable
+        mismatched |= self.undecided
+        self.undecided = baseline_undecided
+
+        # Confirm both ends of every pin that disagreed, so the row of a
+        # shorted pin's partner is measured rather than assumed
+        suspicious = mismatched
+        for k in iter_bits(mismatched):
+            suspicious |= self.expected[k]
+
+        rows = [0] * len(self.pins)
+        components = []
+        covered = 0
+        for k in iter_bits(suspicious):
+            bit = self.bits[k]
+            rows[k] = self._sample(bit, self.settle_budgets[k]) & ~bit
+            components.append(rows[k] | bit)
+            covered |= rows[k] | bit
+
+        self.backend.write_mask(0)
+
+        for k in iter_bits(self.pin_mask & ~suspicious):
+            bit = self.bits[k]
+            if covered & bit:
+                for component in components:
+                    if component & bit:
+                        rows[k] = component & ~bit
+                        break
+                continue
+            # Outside every confirmed net, a pin can only reach its partner,
+            # and only if the partner is outside them too
+            partner = self.expected[k]
+            pair = k % self.pair_count
+            row = partner if not covered & partner and (connected >> pair) & 1 else 0
+            rows[k] = row | (baseline & ~bit)
+
+        self._check_settle_errors()
+        return self._result(rows, baseline, len(self.coded_patterns) + 1 + count_bits(suspicious))
+
+    def _result(self, rows, baseline, drive_steps=None):
+        """ScanResult of a finished scan; times the classification"""
+        started = time.perf_counter()
+        result = ScanResult(self, rows, baseline, drive_steps, self.undecided)
+        self.classify_seconds = time.perf_counter() - started
+        return result
+
+    def _check_settle_errors(self):
+        monitor = self.monitor
+        if monitor.needs_recalibration and not self.recalibration_due:
+            # Too many unstable reads: go back to the safe default until
+            # the budgets can be re-measured on a good harness
+            print(f"Settle error rate {monitor.error_rate:.1%} - recalibration needed")
+            self.set_settle_times({})
+            self.recalibration_due = True
+
+class InsertionWatcher:
+    """Waits for a harness to be inserted while the fixture is empty
+
+    The sentinel outputs are held HIGH and their inputs watched for a rising
+    edge, so the full scan runs the moment continuity appears. Backends
+    without edge detection fall back to polling the sentinel inputs, which
+    is still far cheaper than a full scan.
+    """
+
+    def __init__(self, engine, sentinel_pairs=None, poll_interval=IDLE_POLL_INTERVAL,
+                 max_idle=MAX_IDLE_TIME):
+        self.engine = engine
+        # By default every pair is a sentinel, so any wire of the harness
+        # triggers the scan even if one pair happens to be open
+        pairs = range(engine.pair_count) if sentinel_pairs is None else sentinel_pairs
+        self.sentinel_outputs = 0
+        self.sentinel_inputs = 0
+        for i in pairs:
+            self.sentinel_outputs |= 1 << i
+            self.sentinel_inputs |= 1 << (engine.pair_count + i)
+        self.poll_interval = poll_interval
+        self.max_idle = max_idle
+        self.use_interrupts = engine.backend.supports_edge_events
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """Make a wait in progress (and any later one) return False promptly"""
+        self.cancelled.set()
+
+    def reset(self):
+        self.cancelled.clear()
+
+    def wait(self):
+        """Block until continuity appears or max_idle passes; True if inserted"""
+        backend = self.engine.backend
+        clock = backend.clock
+        cancelled = self.cancelled
+        backend.write_mask(self.sentinel_outputs)
+        try:
+            # Continuity may already exist before the edge detector is armed
+            clock.sleep(self.engine.baseline_settle)
+            if backend.read_all() & self.sentinel_inputs:
+                return True
+
+            deadline = clock.monotonic() + self.max_idle
+            if self.use_interrupts:
+                try:
+                    while not cancelled.is_set():
+                        remaining = deadline - clock.monotonic()
+                        if remaining <= 0:
+                            return False
+                        if backend.wait_for_edge(self.sentinel_inputs,
+                                                 min(remaining, CANCEL_CHECK_INTERVAL)):
+                            return True
+                        # An edge between two waits is not queued; catch it by level
+                        if backend.read_all() & self.sentinel_inputs:
+                            return True
+                    return False
+                except NotImplementedError as e:
+                    print(f"{e} - polling for insertion")
+                    self.use_interrupts = False
+
+            while clock.monotonic() < deadline and not cancelled.is_set():
+                clock.sleep(self.poll_interval)
+                if backend.read_all() & self.sentinel_inputs:
+                    return True
+            return False
+
+        finally:
+            backend.write_mask(0)
+
+class HoldWatcher:
+    """Holds a GOOD verdict with a cheap continuity check
+
+    After a passing scan all outputs are driven together and every pin is
+    re-read at a high rate; a GOOD harness reads all HIGH. The full scan only
+    runs again once a reading changes (harness pulled or disturbed) or
+    max_hold passes, which also bounds how long a fault that continuity
+    cannot see (e.g. a new IN-to-IN short) goes unnoticed.
+    """
+
+    def __init__(self, engine, poll_interval=HOLD_POLL_INTERVAL, max_hold=MAX_HOLD_TIME):
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self.max_hold = max_hold
+        self.expected = engine.output_mask | engine.input_mask
+        self.checks = 0
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        """Make a wait in progress (and any later one) return False promptly"""
+        self.cancelled.set()
+
+    def reset(self):
+        self.cancelled.clear()
+
+    def wait(self):
+        """Block while the harness still reads GOOD; True if max_hold passed,
+        False as soon as a reading changed"""
+        backend = self.engine.backend
+        clock = backend.clock
+        backend.write_mask(self.engine.output_mask)
+        try:
+            clock.sleep(self.engine.baseline_settle)
+            self.checks = 1
+            if backend.read_all() != self.expected:
+                return False
+
+            deadline = clock.monotonic() + self.max_hold
+            while clock.monotonic() < deadline:
+                if self.cancelled.is_set():
+                    return False
+                clock.sleep(self.poll_interval)
+                self.checks += 1
+                if backend.read_all() != self.expected:
+                    return False
+            return True
+
+        finally:
+            backend.write_mask(0)
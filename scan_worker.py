@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Scan Worker for Wire Checker
+Runs the scan loop in its own process, pinned to its own CPU core, so Tk
+redraws, audio, sqlite writes and the garbage collector of the UI process
+never stretch a settle window or delay a verdict. With
+WIRE_CHECKER_REALTIME=1 it also runs SCHED_FIFO with locked memory (see
+realtime.py).
+
+The worker publishes every stable scan (verdict, per-pair masks, the raw
+connectivity rows and its counters) into a shared memory block guarded by
+a sequence counter (a seqlock): the worker makes the counter odd, writes,
+then makes it even again; a reader copies the block and retries if the
+counter was odd or moved meanwhile. Readers take no lock, so a slow UI can
+never block the scanner.
+
+The worker is started with the 'spawn' method: a fresh interpreter, not a
+fork() of the UI process, whose Tk, actuator, journal and metrics threads
+and sqlite connections would be copied mid-flight. Everything it is given
+must pickle (the backend factory is a module-level function or a
+functools.partial of one), and it attaches to the status block by name.
+Spawning re-imports the main script, so that must be safe to import:
+wire_checker_main.py is, and a checker run on its own scans on a thread.
+
+Enabled with WIRE_CHECKER_SCAN_WORKER=1 (the launcher sets it). Needs
+Python 3.8+ (multiprocessing.shared_memory); without it the checkers keep
+scanning on a thread.
+"""
+
+import multiprocessing
+import os
+import struct
+import threading
+import time
+from collections import namedtuple
+from gpio_backend import get_backend, RPiGPIOBackend
+import realtime
+from scan_engine import HarnessLayout, ScanEngine, ScanResult, InsertionWatcher, HoldWatcher
+from settle_calibration import save_settle_times
+
+SCAN_WORKER_ENV = 'WIRE_CHECKER_SCAN_WORKER'
+
+# Parent side: how often to look for a new scan, and how long to wait for
+# the worker to exit before killing it (seconds)
+RESULT_POLL_INTERVAL = 0.005
+STOP_TIMEOUT = 2.0
+
+VERDICTS = ('INITIALIZING', 'GOOD', 'OPEN', 'NOT GOOD')
+
+# seq | scans, good, not_good, verdict, pair_mask, fault_mask, baseline,
+# undecided, published_at, scan_seconds | one uint64 row per pin
+SEQ = struct.Struct('<Q')
+HEADER = struct.Struct('<QQQQQQQQdd')
+
+ScanSnapshot = namedtuple('ScanSnapshot', 'seq scans good not_good verdict pair_mask '
+                                          'fault_mask baseline undecided published_at '
+                                          'scan_seconds rows')
+
+def scan_worker_enabled():
+    """True when the scan loop should run in a worker process"""
+    if os.environ.get(SCAN_WORKER_ENV, '') in ('', '0'):
+        return False
+    try:
+        from multiprocessing import shared_memory  # noqa: F401 (3.8+)
+    except ImportError:
+        print("Scan worker needs Python 3.8+ - scanning on a thread")
+        return False
+    return True
+
+class StatusBlock:
+    """Seqlock-guarded scan status in shared memory; one writer, any readers
+
+    Created by the parent; the worker attaches to it with name=block.name.
+    """
+
+    def __init__(self, pin_count, name=None):
+        from multiprocessing import shared_memory
+        self.pin_count = pin_count
+        self.rows = struct.Struct(f'<{pin_count}Q')
+        self.size = SEQ.size + HEADER.size + self.rows.size
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=self.size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+        self.seq = 0
+        if self.owner:
+            SEQ.pack_into(self.buf, 0, 0)
+
+    def publish(self, result, scans, good, not_good, scan_seconds=0.0):
+        """Write one scan (worker process only)"""
+        buf = self.buf
+        SEQ.pack_into(buf, 0, self.seq + 1)  # odd: write in progress
+        HEADER.pack_into(buf, SEQ.size, scans, good, not_good,
+                         VERDICTS.index(result.verdict), result.pair_mask,
+                         result.fault_mask, result.baseline, result.undecided, time.time(),
+                         scan_seconds)
+        self.rows.pack_into(buf, SEQ.size + HEADER.size, *result.rows)
+        self.seq += 2
+        SEQ.pack_into(buf, 0, self.seq)
+
+    def read(self):
+        """Return a consistent ScanSnapshot without blocking the writer"""
+        buf = self.buf
+        while True:
+            seq = SEQ.unpack_from(buf, 0)[0]
+            if seq & 1:
+                time.sleep(0)
+                continue
+            data = bytes(buf[SEQ.size:self.size])
+            if SEQ.unpack_from(buf, 0)[0] == seq:
+                break
+        fields = HEADER.unpack_from(data, 0)
+        rows = self.rows.unpack_from(data, HEADER.size)
+        return ScanSnapshot(seq, fields[0], fields[1], fields[2], VERDICTS[fields[3]],
+                            *fields[4:], rows)
+
+    def close(self):
+        """Detach; the creating side also frees the block"""
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+def _cancel_on_stop(stop, watchers):
+    stop.wait()
+    for watcher in watchers:
+        watcher.cancel()
+
+def _worker_main(block_name, pin_count, wire_pairs, settle_times, product, backend_factory,
+                 stop, cpu):
+    """Scan loop of the worker process"""
+    block = StatusBlock(pin_count, name=block_name)
+    if realtime.realtime_enabled():
+        applied = realtime.apply(cpu)
+        print(f"Scan worker real-time: {applied}")
+    else:
+        realtime.pin_to_cpu(cpu)
+    backend = backend_factory()
+    if isinstance(backend, RPiGPIOBackend):
+        # A spawned interpreter starts without the parent's pin numbering
+        backend.gpio.setmode(backend.gpio.BCM)
+        backend.gpio.setwarnings(False)
+    engine = ScanEngine(backend, wire_pairs, settle_times=settle_times)
+    insertion_watcher = InsertionWatcher(engine)
+    hold_watcher = HoldWatcher(engine)
+    threading.Thread(target=_cancel_on_stop, args=(stop, [insertion_watcher, hold_watcher]),
+                     daemon=True).start()
+    engine.setup_pins()
+
+    scans = good = not_good = 0
+    previous = None
+    try:
+        while not stop.is_set():
+            try:
+                started = time.perf_counter()
+                result = engine.scan()
+                scan_seconds = time.perf_counter() - started
+                if not result.is_stable:
+                    continue
+                if engine.recalibration_due and result.verdict == "GOOD":
+                    save_settle_times(engine.recalibrate(), product)
+
+                # Same rule as the checkers: a cycle counts on leaving OPEN
+                verdict = result.verdict
+                if previous == "OPEN":
+                    if verdict == "GOOD":
+                        good += 1
+                    elif verdict == "NOT GOOD":
+                        not_good += 1
+                previous = verdict
+                scans += 1
+                block.publish(result, scans, good, not_good, scan_seconds)
+
+                if result.is_empty:
+                    insertion_watcher.wait()
+                elif verdict == "GOOD":
+                    hold_watcher.wait()
+                else:
+                    stop.wait(0.5)
+
+            except Exception as e:
+                print(f"Error in scan worker: {e}")
+                stop.wait(1)
+    finally:
+        engine.backend.release()
+        block.close()
+
+class ScanWorker:
+    """Parent-side handle: starts the worker process and reads what it publishes"""
+
+    def __init__(self, wire_pairs, settle_times=None, product=None, backend_factory=get_backend,
+                 cpu=None):
+        self.layout = HarnessLayout(wire_pairs)
+        self.settle_times = settle_times
+        # Whose budgets a recalibration in the worker updates (settle_calibration)
+        self.product = product
+        self.backend_factory = backend_factory
+        self.cpu = realtime.default_cpu() if cpu is None else cpu
+        self.process = None
+        self.block = None
+        self.stop_event = None
+        # Blocks of stopped workers a scan loop may still be reading
+        self.retired_blocks = []
+        # Serializes start, stop and the restart in next_result()
+        self.lock = threading.RLock()
+        self.last_seq = 0
+        # Scan time of the result next_result() last returned (seconds), and
+        # when that scan started (time.time())
+        self.last_scan_seconds = 0.0
+        self.last_scan_started = 0.0
+        # Time spent rebuilding that ScanResult in this process (seconds)
+        self.last_classify_seconds = 0.0
+
+    def start(self):
+        """Start the worker; it claims the harness pins in its own process"""
+        with self.lock:
+            if self.process is not None:
+                return
+            context = multiprocessing.get_context('spawn')
+            self.block = StatusBlock(len(self.layout.pins))
+            self.stop_event = context.Event()
+            self.last_seq = 0
+            self.process = context.Process(
+                target=_worker_main, name='scan-worker', daemon=True,
+                args=(self.block.name, self.block.pin_count, self.layout.wire_pairs,
+                      self.settle_times, self.product, self.backend_factory, self.stop_event,
+                      self.cpu))
+            self.process.start()
+
+    def stop(self, timeout=STOP_TIMEOUT, free_block=True):
+        """Stop the worker process; the pins are released when it returns
+
+        The shared block is freed too, unless free_block is False because
+        the thread calling next_result() has not parked and may still be
+        reading it; it is then freed by the next stop().
+        """
+        with self.lock:
+            process, block = self.process, self.block
+            if process is not None:
+                self.stop_event.set()
+                process.join(timeout)
+                if process.is_alive():
+                    print("Scan worker did not stop in time - terminating")
+                    process.terminate()
+                    process.join()
+                self.process = None
+                self.block = None
+                self.retired_blocks.append(block)
+            if free_block:
+                for block in self.retired_blocks:
+                    block.close()
+                self.retired_blocks = []
+
+    def snapshot(self):
+        """Latest published scan (seq 0 before the first), or None if stopped"""
+        block = self.block
+        return block.read() if block is not None else None
+
+    def result(self, snapshot):
+        """Rebuild the ScanResult of a snapshot, for the existing verdict code"""
+        return ScanResult(self.layout, list(snapshot.rows), snapshot.baseline,
+                          undecided=snapshot.undecided)
+
+    def next_result(self, timeout):
+        """Wait up to timeout for a scan not returned before; ScanResult or None"""
+        deadline = time.monotonic() + timeout
+        while True:
+            process = self.process
+            snapshot = self.snapshot()
+            if process is None or snapshot is None:
+                return None
+            if snapshot.seq != self.last_seq:
+                self.last_seq = snapshot.seq
+                self.last_scan_seconds = snapshot.scan_seconds
+                self.last_scan_started = snapshot.published_at - snapshot.scan_seconds
+                started = time.perf_counter()
+                result = self.result(snapshot)
+                self.last_classify_seconds = time.perf_counter() - started
+                return result
+            if not process.is_alive():
+                with self.lock:
+                    # Not when stop() ended it meanwhile
+                    if self.process is process:
+                        print("Scan worker exited - restarting")
+                        self.stop()
+                        self.start()
+                return None
+            if time.monotonic() >= deadline:
+                return None
+            time.sleep(RESULT_POLL_INTERVAL)
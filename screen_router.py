@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Screen Router for Wire Checker
+Runs the whole station in one long-lived process with a single Tk root.
+Screens (menu, checkers, statistics) are frames swapped inside that root,
+so GPIO setup, the scan engine, the database connection and preloaded
+audio stay warm across product changeovers instead of being rebuilt by a
+fresh interpreter for every screen.
+
+A screen is built by a factory(parent, router, **kwargs) that fills the
+parent frame and returns an object; if that object has a close() method it
+is called before the frame is destroyed.
+
+CheckerRunner parks a checker's scan loop while its screen is not shown and
+resumes it when it comes back, so only one checker drives the harness pins
+at a time.
+"""
+
+import os
+import subprocess
+import threading
+import tkinter as tk
+from database_manager import DatabaseManager
+
+# Longest wait for a scan loop to park when its screen is closed (seconds)
+PARK_TIMEOUT = 2.0
+
+# Set for programs started by run_external, so they exit back to the
+# station instead of launching another main menu
+STATION_ENV = 'WIRE_CHECKER_STATION'
+
+class ScreenRouter:
+    """Swaps screen frames inside one Tk root"""
+
+    def __init__(self, root, db_manager=None):
+        self.root = root
+        self.db_manager = db_manager or DatabaseManager()
+        self.screens = {}
+        self.shutdown_hooks = []
+        self.current_name = None
+        self.current_frame = None
+        self.current_screen = None
+
+    def register(self, name, factory):
+        self.screens[name] = factory
+
+    def add_shutdown_hook(self, hook):
+        """Run hook once when the station exits"""
+        if hook not in self.shutdown_hooks:
+            self.shutdown_hooks.append(hook)
+
+    def show(self, name, **kwargs):
+        """Close the current screen and build screen name in its place"""
+        self.close_current()
+        frame = tk.Frame(self.root, bg='#f0f0f0')
+        frame.pack(expand=True, fill='both')
+        self.current_name = name
+        self.current_frame = frame
+        self.current_screen = self.screens[name](frame, self, **kwargs)
+        return self.current_screen
+
+    def close_current(self):
+        screen, frame = self.current_screen, self.current_frame
+        self.current_name = self.current_frame = self.current_screen = None
+        close = getattr(screen, 'close', None)
+        if close:
+            try:
+                close()
+            except Exception as e:
+                print(f"Error closing screen: {e}")
+        if frame is not None:
+            frame.destroy()
+
+    def run_external(self, command):
+        """Hide the station window while a separate program runs, then come back"""
+        env = os.environ.copy()
+        env[STATION_ENV] = '1'
+        self.root.withdraw()
+        try:
+            subprocess.run(command, env=env)
+        finally:
+            self.root.deiconify()
+
+    def shutdown(self):
+        """Close the current screen, release hardware and end the mainloop"""
+        self.close_current()
+        for hook in self.shutdown_hooks:
+            try:
+                hook()
+            except Exception as e:
+                print(f"Error during shutdown: {e}")
+        self.db_manager.close()
+        self.root.destroy()
+
+class CheckerRunner:
+    """Starts a checker's scan loop thread once, then parks and resumes it
+
+    The loop calls checkpoint() at the top of every pass and pause() instead
+    of time.sleep(), so stop() returns as soon as the pass in progress ends.
+    Watchers passed in are cancelled on stop() so an idle insertion or GOOD
+    hold wait does not hold the harness pins.
+    """
+
+    def __init__(self, loop, watchers=()):
+        self.loop = loop
+        self.watchers = list(watchers)
+        self.running = threading.Event()
+        self.stopping = threading.Event()
+        self.parked = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Start the loop thread, or resume a parked one"""
+        for watcher in self.watchers:
+            watcher.reset()
+        self.stopping.clear()
+        self.parked.clear()
+        self.running.set()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.loop, daemon=True)
+            self.thread.start()
+
+    def stop(self, timeout=PARK_TIMEOUT):
+        """Park the loop; True once it is parked"""
+        self.running.clear()
+        self.stopping.set()
+        for watcher in self.watchers:
+            watcher.cancel()
+        if self.thread is None:
+            return True
+        return self.parked.wait(timeout)
+
+    def checkpoint(self):
+        """Block while stopped; True if the loop was just resumed"""
+        if self.running.is_set():
+            return False
+        self.parked.set()
+        self.running.wait()
+        return True
+
+    def pause(self, seconds):
+        """Sleep between scans, cut short by stop()"""
+        self.stopping.wait(seconds)
@@ -5,11 +5,13 @@ Handles sending cycle data to external server
 """
 
 import json
-import requests
 from database_manager import DatabaseManager
 from datetime import datetime
 import os
 
+# requests is imported inside the methods that use it: it is slow to load
+# and most sessions never talk to the server
+
 class ServerExporter:
     def __init__(self, server_url=None, api_key=None):
         self.server_url = server_url or os.environ.get('WIRE_CHECKER_SERVER_URL')
@@ -18,6 +20,8 @@ class ServerExporter:
     
     def export_cycle_to_server(self, cycle_id):
         """Export a specific cycle to the server"""
+        import requests
+        
         if not self.server_url:
             print("Warning: No server URL configured")
             return False
@@ -47,6 +51,7 @@ class ServerExporter:
             )
             
             if response.status_code == 200:
+                self.db_manager.mark_cycle_exported(cycle_id)
                 print(f"✓ Cycle {cycle_id[:8]}... exported successfully")
                 return True
             else:
@@ -91,6 +96,8 @@ class ServerExporter:
     
     def export_daily_statistics(self, date=None):
         """Export daily statistics to server"""
+        import requests
+        
         if not self.server_url:
             print("Warning: No server URL configured")
             return False
@@ -143,6 +150,8 @@ class ServerExporter:
     
     def test_server_connection(self):
         """Test server connectivity"""
+        import requests
+        
         if not self.server_url:
             print("Warning: No server URL configured")
             return False
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Settle Time Calibration for Wire Checker
+Measures how long each harness line actually takes to settle after an edge
+and stores a per-pin settle budget for each product
+
+Budgets are per product because the same BCM pin carries a different wire
+in each harness. The product saved in pin_configuration.json keeps its
+budgets in that file next to its wire pairs; the fixed-pair checkers keep
+theirs in settle_times.json under their configuration name ("4-pairs", ...).
+"""
+
+import json
+import os
+import sys
+from collections import deque
+from datetime import datetime
+from gpio_backend import as_backend, get_backend
+
+# Hard-coded probe delay used before calibration existed (seconds)
+DEFAULT_SETTLE_TIME = 0.01
+
+# Budget = worst measured settle time x margin, clamped to these bounds
+SAFETY_MARGIN = 3.0
+MIN_SETTLE_TIME = 0.0002
+
+# Consecutive identical reads that count as "settled"
+STABLE_READS = 5
+
+CONFIG_FILE = 'pin_configuration.json'
+SETTLE_FILE = 'settle_times.json'
+
+def measure_edge(backend, out_bit, in_bit, level, timeout=DEFAULT_SETTLE_TIME * 5,
+                 stable_reads=STABLE_READS):
+    """Drive (level True) or release (level False) the out line and return
+    seconds until the in line reads that level steadily"""
+    perf_counter = backend.clock.perf_counter
+    backend.write_mask(out_bit if level else 0)
+    start = perf_counter()
+    settled_at = None
+    stable = 0
+
+    while True:
+        now = perf_counter()
+        if bool(backend.read_all() & in_bit) == level:
+            if stable == 0:
+                settled_at = now
+            stable += 1
+            if stable >= stable_reads:
+                return settled_at - start
+        else:
+            stable = 0
+
+        if now - start > timeout:
+            return None
+
+def measure_settle_time(backend, out_pin, in_pin, repeats=20):
+    """Return the worst rising/falling settle time seen over repeats, or None
+
+    The falling edge is measured the way the scan engine releases a pin:
+    back to a pulled-down input rather than actively driven LOW.
+    """
+    out_bit = 1 << backend.index(out_pin)
+    in_bit = 1 << backend.index(in_pin)
+    backend.write_mask(0)
+
+    worst = 0.0
+    try:
+        for _ in range(repeats):
+            for level in (True, False):
+                elapsed = measure_edge(backend, out_bit, in_bit, level)
+                if elapsed is None:
+                    return None
+                worst = max(worst, elapsed)
+    finally:
+        backend.write_mask(0)
+
+    return worst
+
+def settle_budget(measured, margin=SAFETY_MARGIN):
+    """Turn a measured settle time into a runtime budget"""
+    if measured is None:
+        return DEFAULT_SETTLE_TIME
+    return min(DEFAULT_SETTLE_TIME, max(MIN_SETTLE_TIME, measured * margin))
+
+def calibrate(gpio, wire_pairs, repeats=20, margin=SAFETY_MARGIN):
+    """Measure every pair in both directions and return {pin: budget}
+
+    Needs a known-good harness in the fixture. Pairs that never settle keep
+    the default budget.
+    """
+    backend = as_backend(gpio)
+    pins = [pin for pair in wire_pairs for pin in pair]
+    if not all(pin in backend.pins for pin in pins):
+        backend.claim(pins)
+
+    settle_times = {}
+    for out_pin, in_pin in wire_pairs:
+        # The scan engine drives both ends of a pair, so measure both ways
+        settle_times[out_pin] = settle_budget(
+            measure_settle_time(backend, out_pin, in_pin, repeats), margin)
+        settle_times[in_pin] = settle_budget(
+            measure_settle_time(backend, in_pin, out_pin, repeats), margin)
+    return settle_times
+
+def load_settle_times(product=None, config_file=None):
+    """Load per-pin settle budgets of a product
+
+    product None is the product in pin_configuration.json; a checker passes
+    its configuration name to read its entry in settle_times.json.
+    """
+    config_file = config_file or (CONFIG_FILE if product is None else SETTLE_FILE)
+    if not os.path.exists(config_file):
+        return {}
+    try:
+        with open(config_file, 'r') as f:
+            config_data = json.load(f)
+        if product is not None:
+            config_data = config_data.get(product, {})
+        return {int(pin): float(seconds)
+                for pin, seconds in config_data.get('settle_times', {}).items()}
+    except Exception as e:
+        print(f"Error loading settle times: {e}")
+        return {}
+
+def save_settle_times(settle_times, product=None, config_file=None):
+    """Store per-pin settle budgets of a product (see load_settle_times)
+
+    The budgets of the pin_configuration.json product are only added to an
+    existing configuration; without one there are no wire pairs to go with.
+    """
+    config_file = config_file or (CONFIG_FILE if product is None else SETTLE_FILE)
+    config_data = {}
+    if os.path.exists(config_file):
+        with open(config_file, 'r') as f:
+            config_data = json.load(f)
+    elif product is None:
+        print(f"Settle times not saved: {config_file} not found")
+        return
+
+    entry = config_data if product is None else config_data.setdefault(product, {})
+    stored = entry.get('settle_times', {})
+    stored.update({str(pin): round(seconds, 6) for pin, seconds in settle_times.items()})
+    entry['settle_times'] = stored
+    entry['settle_calibrated_at'] = datetime.now().isoformat()
+
+    with open(config_file, 'w') as f:
+        json.dump(config_data, f, indent=4)
+
+class SettleMonitor:
+    """Tracks unstable reads and flags when the settle budget is too tight"""
+
+    def __init__(self, window=500, max_error_rate=0.01):
+        self.samples = deque(maxlen=window)
+        self.max_error_rate = max_error_rate
+        self.errors = 0
+
+    def record(self, unstable):
+        if len(self.samples) == self.samples.maxlen:
+            self.errors -= self.samples[0]
+        self.samples.append(1 if unstable else 0)
+        self.errors += 1 if unstable else 0
+
+    @property
+    def error_rate(self):
+        if not self.samples:
+            return 0.0
+        return self.errors / len(self.samples)
+
+    @property
+    def needs_recalibration(self):
+        # Wait for a full window so a single glitch right after start-up
+        # does not trigger a calibration run
+        return (len(self.samples) == self.samples.maxlen and
+                self.error_rate > self.max_error_rate)
+
+    def reset(self):
+        self.samples.clear()
+        self.errors = 0
+
+def main():
+    """Calibrate the fixture with a known-good harness inserted"""
+    try:
+        import RPi.GPIO as GPIO
+    except ImportError:
+        print("RPi.GPIO not found. Calibration needs the real fixture.")
+        sys.exit(1)
+
+    if not os.path.exists(CONFIG_FILE):
+        print(f"Error: {CONFIG_FILE} not found. Save a pin configuration first.")
+        sys.exit(1)
+
+    with open(CONFIG_FILE, 'r') as f:
+        config_data = json.load(f)
+    wire_pairs = [(pair['pin_out'], pair['pin_in']) for pair in config_data.get('wire_pairs', [])]
+
+    GPIO.setmode(GPIO.BCM)
+    GPIO.setwarnings(False)
+
+    print(f"Calibrating {len(wire_pairs)} pairs - keep a GOOD harness inserted...")
+    settle_times = calibrate(get_backend(GPIO), wire_pairs)
+    for pin, seconds in sorted(settle_times.items()):
+        print(f"  GPIO{pin}: {seconds * 1000:.2f} ms")
+
+    save_settle_times(settle_times)
+    print(f"✓ Settle times saved to {CONFIG_FILE}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Spoken Diagnostics Cache for Wire Checker
+Pre-renders a speech clip for every diagnostic phrase a wire pair
+configuration can produce (each open pair, each cross, IN-to-IN and
+OUT-to-OUT short) so the speech checker can play them with no TTS process
+at runtime.
+
+Clips live in speech_cache/<hash>/, where the hash covers the wire pairs,
+the voice settings and the phrase wording. A manifest.json in that
+directory maps each phrase key to its text and clip file.
+
+Usage:
+    python3 speech_cache.py                      # default 4-pair fixture
+    python3 speech_cache.py --config pin_configuration.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+from scan_engine import iter_bits
+
+CACHE_DIR = 'speech_cache'
+MANIFEST_FILE = 'manifest.json'
+
+# espeak settings used for every clip (same register as the GOOD/NOT GOOD cues)
+DEFAULT_VOICE = {'voice': 'en-us', 'speed': 130, 'pitch': 45, 'amplitude': 90}
+
+# Bump when phrase wording changes so old caches are not reused
+PHRASE_VERSION = 1
+
+# Longest spoken diagnostic, in phrases; the screen shows the rest
+MAX_SPOKEN_PHRASES = 4
+
+DEFAULT_WIRE_PAIRS = [(17, 27), (22, 10), (9, 11), (5, 6)]
+
+def diagnostic_phrases(wire_pairs):
+    """Return {key: text} for every diagnostic the configuration can produce"""
+    pair_count = len(wire_pairs)
+    phrases = {}
+    for i in range(pair_count):
+        phrases[f"open_{i}"] = f"Pair {i + 1} open"
+    for i in range(pair_count):
+        for j in range(pair_count):
+            if i != j:
+                phrases[f"cross_{i}_{j}"] = f"Pair {i + 1} output wired to pair {j + 1} input"
+    for i in range(pair_count):
+        for j in range(i + 1, pair_count):
+            phrases[f"in_in_{i}_{j}"] = f"Pair {i + 1} input shorted to pair {j + 1} input"
+            phrases[f"out_out_{i}_{j}"] = f"Pair {i + 1} output shorted to pair {j + 1} output"
+    return phrases
+
+def diagnostic_keys(result, limit=MAX_SPOKEN_PHRASES):
+    """Return the phrase keys describing a ScanResult, most useful first"""
+    keys = []
+    if result.fault_mask:
+        keys += [f"cross_{i}_{j}" for i, j in result.cross_connections]
+        for prefix, faults in (('in_in', result.in_to_in_connections),
+                               ('out_out', result.out_to_out_connections)):
+            # Both ends of a short report it; speak it once
+            for i, j in sorted({tuple(sorted(fault)) for fault in faults}):
+                keys.append(f"{prefix}_{i}_{j}")
+    keys += [f"open_{i}" for i in iter_bits(result.open_mask)]
+    return keys[:limit]
+
+def config_hash(wire_pairs, voice=DEFAULT_VOICE):
+    """Stable hash of everything that changes the rendered clips"""
+    material = json.dumps({'wire_pairs': [list(pair) for pair in wire_pairs],
+                           'voice': voice, 'phrase_version': PHRASE_VERSION},
+                          sort_keys=True)
+    return hashlib.sha256(material.encode()).hexdigest()[:16]
+
+def espeak_render(text, path, voice=DEFAULT_VOICE):
+    """Render text to a WAV file with espeak"""
+    subprocess.run(['espeak', '-w', path,
+                    '-v', voice['voice'],
+                    '-s', str(voice['speed']),
+                    '-p', str(voice['pitch']),
+                    '-a', str(voice['amplitude']),
+                    text], check=True, capture_output=True)
+
+def cache_path(wire_pairs, voice=DEFAULT_VOICE, root=CACHE_DIR):
+    return os.path.join(root, config_hash(wire_pairs, voice))
+
+def build_cache(wire_pairs, voice=DEFAULT_VOICE, root=CACHE_DIR, render=None):
+    """Render every missing clip and write the manifest; returns the manifest"""
+    render = render or espeak_render
+    directory = cache_path(wire_pairs, voice, root)
+    os.makedirs(directory, exist_ok=True)
+
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    clips = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            clips = json.load(f).get('clips', {})
+
+    rendered = 0
+    for key, text in diagnostic_phrases(wire_pairs).items():
+        file_name = f"{key}.wav"
+        existing = clips.get(key)
+        if (existing and existing['text'] == text and
+                os.path.exists(os.path.join(directory, file_name))):
+            continue
+        render(text, os.path.join(directory, file_name), voice)
+        clips[key] = {'text': text, 'file': file_name}
+        rendered += 1
+
+    manifest = {
+        'config_hash': config_hash(wire_pairs, voice),
+        'wire_pairs': [list(pair) for pair in wire_pairs],
+        'voice': voice,
+        'phrase_version': PHRASE_VERSION,
+        'created_at': datetime.now().isoformat(),
+        'clips': clips,
+    }
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=4)
+
+    print(f"✓ {rendered} clip(s) rendered, {len(clips)} in {directory}")
+    return manifest
+
+def load_clips(wire_pairs, voice=DEFAULT_VOICE, root=CACHE_DIR):
+    """Return {key: clip path} for a configuration, or {} if not built"""
+    directory = cache_path(wire_pairs, voice, root)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        return {}
+    try:
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+        return {key: os.path.join(directory, clip['file'])
+                for key, clip in manifest.get('clips', {}).items()
+                if os.path.exists(os.path.join(directory, clip['file']))}
+    except Exception as e:
+        print(f"Error loading speech cache: {e}")
+        return {}
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-render spoken wire checker diagnostics")
+    parser.add_argument('--config', help="pin configuration JSON (default: 4-pair fixture)")
+    parser.add_argument('--voice', default=DEFAULT_VOICE['voice'], help="espeak voice")
+    args = parser.parse_args()
+
+    wire_pairs = DEFAULT_WIRE_PAIRS
+    if args.config:
+        with open(args.config, 'r') as f:
+            config_data = json.load(f)
+        wire_pairs = [(pair['pin_out'], pair['pin_in']) for pair in config_data.get('wire_pairs', [])]
+
+    voice = dict(DEFAULT_VOICE, voice=args.voice)
+    try:
+        build_cache(wire_pairs, voice)
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"Error running espeak: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
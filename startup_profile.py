@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Startup Profile for Wire Checker
+Measures a cold boot of the station, from wire_checker_launcher.sh starting
+Python to the first completed scan, against a time budget, and lists the
+slowest imports from a python -X importtime log.
+
+Also holds the fast-start switch (WIRE_CHECKER_FAST_START, on by default in
+the launcher): audio decoding, the RFID serial port and network libraries
+are set up on first use instead of delaying the first scan.
+
+Usage:
+    ./wire_checker_launcher.sh --profile-startup [screen]
+    python3 startup_profile.py startup_importtime.log
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+FAST_START_ENV = 'WIRE_CHECKER_FAST_START'
+LAUNCH_TIME_ENV = 'WIRE_CHECKER_LAUNCH_TIME'  # epoch seconds, set by the launcher
+BUDGET_ENV = 'WIRE_CHECKER_STARTUP_BUDGET'
+
+# Launcher start to first scan (seconds)
+STARTUP_BUDGET = 3.0
+
+REPORT_FILE = 'startup_profile.json'
+
+# Imports listed by the report
+TOP_IMPORTS = 15
+
+def _launch_time():
+    try:
+        return float(os.environ[LAUNCH_TIME_ENV])
+    except (KeyError, ValueError):
+        return None
+
+# None unless started by the launcher; then every milestone is timed from it
+LAUNCHED_AT = _launch_time()
+
+# Milestones recorded this run: name -> seconds since launch
+marks = {}
+finished = threading.Event()
+
+def fast_start():
+    """True when slow, non-scan setup should wait until first use"""
+    return os.environ.get(FAST_START_ENV, '') not in ('', '0')
+
+def mark(name):
+    """Record a startup milestone once"""
+    if LAUNCHED_AT is not None and name not in marks:
+        marks[name] = time.time() - LAUNCHED_AT
+
+def finish(name='first_scan', report_file=REPORT_FILE):
+    """Record the last milestone, write the report and check the budget.
+    Cheap to call on every scan; only the first call does anything."""
+    if LAUNCHED_AT is None or finished.is_set():
+        return
+    mark(name)
+    budget = float(os.environ.get(BUDGET_ENV, STARTUP_BUDGET))
+    elapsed = marks[name]
+    report = {
+        'marks': {key: round(value, 3) for key, value in marks.items()},
+        'budget': budget,
+        'within_budget': elapsed <= budget,
+        'fast_start': fast_start(),
+    }
+    try:
+        with open(report_file, 'w') as f:
+            json.dump(report, f, indent=4)
+    except Exception as e:
+        print(f"Error saving startup profile: {e}")
+
+    print(f"Startup: {name} {elapsed:.2f} s after launch (budget {budget:.2f} s)")
+    if elapsed > budget:
+        print(f"Warning: startup over budget by {elapsed - budget:.2f} s")
+    finished.set()
+
+def parse_importtime(lines):
+    """Return [(module, self_us, cumulative_us, depth)] from -X importtime output"""
+    rows = []
+    for line in lines:
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3:
+            continue
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # column header
+        name = fields[2].rstrip()[1:]
+        depth = (len(name) - len(name.lstrip(' '))) // 2
+        rows.append((name.strip(), self_us, cumulative_us, depth))
+    return rows
+
+def top_imports(rows, count=TOP_IMPORTS):
+    """Slowest imports made directly by our code, by cumulative time"""
+    direct = [row for row in rows if row[3] == 0]
+    return sorted(direct, key=lambda row: row[2], reverse=True)[:count]
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python3 startup_profile.py IMPORTTIME_LOG")
+        sys.exit(2)
+
+    with open(sys.argv[1], 'r', errors='replace') as f:
+        rows = parse_importtime(f)
+    total_us = sum(row[2] for row in rows if row[3] == 0)
+
+    print(f"Imports: {total_us / 1000:.0f} ms in {len(rows)} modules\n")
+    print(f"{'module':<36}{'cumulative':>12}{'self':>10}")
+    for name, self_us, cumulative_us, _ in top_imports(rows):
+        print(f"{name:<36}{cumulative_us / 1000:>10.1f}ms{self_us / 1000:>8.1f}ms")
+
+    if not os.path.exists(REPORT_FILE):
+        print("\nNo startup report (no scan completed)")
+        sys.exit(1)
+    with open(REPORT_FILE, 'r') as f:
+        report = json.load(f)
+    print(f"\nMilestones (fast start {'on' if report['fast_start'] else 'off'}):")
+    for name, elapsed in report['marks'].items():
+        print(f"  {name:<20}{elapsed:>8.2f} s")
+    status = "within" if report['within_budget'] else "OVER"
+    print(f"Budget {report['budget']:.2f} s: {status}")
+    sys.exit(0 if report['within_budget'] else 1)
+
+if __name__ == '__main__':
+    main()
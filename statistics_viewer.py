@@ -11,20 +11,25 @@ from datetime import datetime, date
 import os
 
 class StatisticsViewer:
-    def __init__(self, root):
-        self.root = root
+    def __init__(self, parent, router=None):
+        # parent is the Tk root when run on its own, or a screen frame
+        # when shown by the screen router
+        self.router = router
+        self.root = parent.winfo_toplevel()
         self.root.title("Wire Checker Statistics")
-        self.root.geometry("1024x768")  # Optimized for 7-inch TFT
-        self.root.configure(bg='#f0f0f0')
         
-        # Initialize database manager
-        self.db_manager = DatabaseManager()
+        if router is None:
+            self.root.geometry("1024x768")  # Optimized for 7-inch TFT
+            self.root.configure(bg='#f0f0f0')
+            
+            # Center the window
+            self.root.eval('tk::PlaceWindow . center')
         
-        # Center the window
-        self.root.eval('tk::PlaceWindow . center')
+        # Reuse the station's database connection when routed
+        self.db_manager = router.db_manager if router else DatabaseManager()
         
         # Create main frame
-        main_frame = tk.Frame(root, bg='#f0f0f0')
+        main_frame = tk.Frame(parent, bg='#f0f0f0')
         main_frame.pack(expand=True, fill='both', padx=50, pady=50)
         
         # Title
@@ -170,6 +175,9 @@ class StatisticsViewer:
     
     def back_to_main(self):
         """Return to main menu"""
+        if self.router:
+            self.router.show('main')
+            return
         self.root.destroy()
         import subprocess
         subprocess.run(['python3', 'wire_checker_main.py'])
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script for the Actuator Scheduler
+Queues LED, buzzer and solenoid commands against a recording fake GPIO
+"""
+
+import sys
+import threading
+import time
+from actuator_scheduler import ActuatorScheduler
+
+class RecordingGPIO:
+    """GPIO double that logs every output call with a timestamp"""
+    HIGH = True
+    LOW = False
+
+    def __init__(self):
+        self.writes = []
+        self.lock = threading.Lock()
+
+    def output(self, pin, state):
+        with self.lock:
+            self.writes.append((time.monotonic(), pin, state))
+
+    def levels_of(self, pin):
+        with self.lock:
+            return [state for _, p, state in self.writes if p == pin]
+
+def make_scheduler(gpio):
+    scheduler = ActuatorScheduler(gpio, {'red': 2, 'green': 4, 'buzzer': 18, 'solenoid': 13},
+                                  inverted={'buzzer'})
+    scheduler.start()
+    return scheduler
+
+def test_commands_return_immediately():
+    """Test that a long beep pattern does not block the caller"""
+    print("Testing non-blocking commands...")
+    gpio = RecordingGPIO()
+    scheduler = make_scheduler(gpio)
+    start = time.monotonic()
+    scheduler.beep(5)
+    scheduler.set(red=True, green=False)
+    assert time.monotonic() - start < 0.01
+    time.sleep(0.05)
+    assert gpio.levels_of(2) == [True]
+    assert gpio.levels_of(4) == [False]
+    print("✓ beep(5) queued without sleeping; LEDs set while it plays")
+
+    time.sleep(1.1)
+    # Buzzer is active low: on = LOW
+    assert gpio.levels_of(18) == [False, True] * 5
+    scheduler.stop()
+    print("✓ Five beeps played on the scheduler thread")
+
+def test_preemption_and_stop():
+    """Test that new commands preempt a running pattern and stop() turns it off"""
+    print("\nTesting preemption...")
+    gpio = RecordingGPIO()
+    scheduler = make_scheduler(gpio)
+    scheduler.beep(5)
+    time.sleep(0.05)
+    scheduler.beep(1)
+    time.sleep(0.5)
+    assert gpio.levels_of(18) == [False, False, True]
+    print("✓ A new beep replaces the rest of the previous pattern")
+
+    scheduler.pulse('solenoid', 5.0)
+    time.sleep(0.05)
+    scheduler.stop()
+    assert not scheduler.is_alive()
+    assert gpio.levels_of(13) == [True, False]
+    assert scheduler.levels['solenoid'] is False
+    print("✓ stop() switches off an output left on mid-pattern")
+
+def main():
+    """Run all tests"""
+    print("=== Actuator Scheduler Test Suite ===\n")
+
+    try:
+        test_commands_return_immediately()
+        test_preemption_and_stop()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for the Audio Cue Engine
+Uses a fake pygame.mixer, so no audio device or pygame install is needed
+"""
+
+import sys
+import time
+from audio_cues import AudioCueEngine
+
+class FakeChannel:
+    def __init__(self):
+        self.current = None
+        self.queued = None
+        self.log = []
+
+    def get_busy(self):
+        return self.current is not None
+
+    def play(self, sound):
+        self.current = sound
+        self.queued = None
+        self.log.append(('play', sound.path))
+
+    def queue(self, sound):
+        self.queued = sound
+        self.log.append(('queue', sound.path))
+
+    def stop(self):
+        self.current = None
+
+class FakeMixer:
+    """Just enough of pygame.mixer for the cue engine"""
+
+    def __init__(self):
+        self.initialised = None
+        self.loads = []
+        self.channel = FakeChannel()
+
+    def get_init(self):
+        return self.initialised
+
+    def init(self, frequency=44100, buffer=512):
+        self.initialised = (frequency, -16, 2)
+
+    def set_reserved(self, count):
+        pass
+
+    def Channel(self, index):
+        return self.channel
+
+    def Sound(self, path=None, buffer=None):
+        if buffer is not None:
+            path = buffer.decode()
+        elif path.endswith('missing.mp3'):
+            raise FileNotFoundError(path)
+        self.loads.append(path)
+        sound = type('Sound', (), {})()
+        sound.path = path
+        sound.get_raw = lambda: path.encode()
+        return sound
+
+CUES = {'good': 'sound/good.mp3', 'not_good': 'sound/not_good.mp3'}
+PRIORITIES = {'good': 1, 'not_good': 2}
+
+def test_preload():
+    """Test that cues are decoded once and replayed from memory"""
+    print("Testing cue preloading...")
+    mixer = FakeMixer()
+    engine = AudioCueEngine(CUES, PRIORITIES, mixer=mixer)
+    for _ in range(5):
+        assert engine.play('good')
+    assert mixer.loads == ['sound/good.mp3', 'sound/not_good.mp3']
+    print("✓ Each cue file decoded once for many plays")
+
+    engine = AudioCueEngine({'good': 'sound/missing.mp3'}, mixer=FakeMixer())
+    assert not engine.play('good')
+    print("✓ Missing cue reports failure instead of raising")
+
+def test_preemption():
+    """Test that NOT GOOD cuts off GOOD but not the other way round"""
+    print("\nTesting cue preemption...")
+    mixer = FakeMixer()
+    engine = AudioCueEngine(CUES, PRIORITIES, mixer=mixer)
+    engine.play('good')
+    engine.play('not_good')
+    assert mixer.channel.current.path == 'sound/not_good.mp3'
+    assert engine.preempted == 1
+    print("✓ NOT GOOD replaces a playing GOOD immediately")
+
+    engine.play('good')
+    assert mixer.channel.current.path == 'sound/not_good.mp3'
+    assert mixer.channel.queued.path == 'sound/good.mp3'
+    print("✓ GOOD waits for a playing NOT GOOD to finish")
+
+def test_phrases():
+    """Test that a cue followed by phrases plays as one joined sound"""
+    print("\nTesting cue phrases...")
+    mixer = FakeMixer()
+    engine = AudioCueEngine(CUES, PRIORITIES, mixer=mixer)
+    assert engine.load({'open_0': 'a.wav', 'open_1': 'b.wav'}) == ['open_0', 'open_1']
+    engine.play('not_good', then=['open_0', 'unknown', 'open_1'])
+    assert mixer.channel.current.path == 'sound/not_good.mp3a.wavb.wav'
+    engine.play('not_good', then=['open_0', 'open_1'])
+    assert mixer.loads.count('sound/not_good.mp3a.wavb.wav') == 1
+    print("✓ Cue and phrases joined once, unknown phrases skipped")
+
+def test_latency_stats():
+    """Test verdict-to-playback latency recording"""
+    print("\nTesting cue latency...")
+    engine = AudioCueEngine(CUES, PRIORITIES, mixer=FakeMixer())
+    assert engine.latency_stats()['count'] == 0
+    for _ in range(10):
+        engine.play('not_good', verdict_time=time.monotonic())
+    stats = engine.latency_stats()
+    assert stats['count'] == 10
+    # Includes the 512-frame mixer buffer at 44.1 kHz (~11.6 ms)
+    assert 11.0 < stats['p50_ms'] <= stats['p99_ms'] <= stats['max_ms'] < 50
+    print(f"✓ Cue latency p50 {stats['p50_ms']} ms, p99 {stats['p99_ms']} ms")
+
+def main():
+    """Run all tests"""
+    print("=== Audio Cue Engine Test Suite ===\n")
+
+    try:
+        test_preload()
+        test_preemption()
+        test_phrases()
+        test_latency_stats()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
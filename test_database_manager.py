@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Test script for the Database Manager connection modes
+Checks persistent WAL connections against per-call connections
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from database_manager import DatabaseManager, SCHEMA_MIGRATIONS
+
+def run_cycle(db_manager):
+    """A short cycle; returns its final counts"""
+    cycle_id = db_manager.create_new_cycle("4-pairs")
+    for status in ("GOOD", "OPEN", "NOT GOOD", "GOOD"):
+        db_manager.update_cycle_count(cycle_id, status)
+    db_manager.end_cycle(cycle_id)
+    cycle = db_manager.get_current_cycle(cycle_id)
+    return cycle_id, (cycle['total_checked'], cycle['good_count'],
+                      cycle['not_good_count'], cycle['open_count'], cycle['status'])
+
+def test_modes_agree():
+    """Test that both modes store the same cycle"""
+    print("Testing per-call and persistent modes...")
+    with tempfile.TemporaryDirectory() as directory:
+        per_call = DatabaseManager(os.path.join(directory, 'a.db'), persistent=False)
+        persistent = DatabaseManager(os.path.join(directory, 'b.db'), persistent=True)
+        expected = (4, 2, 1, 1, 'completed')
+        assert run_cycle(per_call)[1] == expected
+        cycle_id, counts = run_cycle(persistent)
+        assert counts == expected
+        assert persistent.get_daily_statistics()[0]['total_good'] == 2
+        assert len(persistent.export_cycle_data(cycle_id)['events']) == 4
+        assert persistent.count_export_backlog() == 1
+        persistent.close()
+    print("✓ Same counts, statistics and events in both modes")
+
+def test_persistent_connections():
+    """Test the shared writer, per-thread readers and pragmas"""
+    print("\nTesting persistent connections...")
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = DatabaseManager(os.path.join(directory, 'wire_checker.db'), persistent=True)
+        cycle_id = db_manager.create_new_cycle("3-pairs")
+        writer = db_manager.writer_connection
+        assert writer.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert writer.execute('PRAGMA synchronous').fetchone()[0] == 1  # NORMAL
+
+        db_manager.update_cycle_count(cycle_id, "GOOD")
+        assert db_manager.writer_connection is writer
+        with db_manager.reading() as first, db_manager.reading() as second:
+            assert first is second
+        print("✓ One writer and one reader per thread, WAL and synchronous=NORMAL")
+
+        # Checker loop thread writes while the UI thread polls
+        def count(status):
+            for _ in range(50):
+                db_manager.update_cycle_count(cycle_id, status)
+        threads = [threading.Thread(target=count, args=(status,)) for status in ("GOOD", "OPEN")]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            assert db_manager.get_current_cycle(cycle_id)['total_checked'] >= 1
+        for thread in threads:
+            thread.join()
+        cycle = db_manager.get_current_cycle(cycle_id)
+        assert (cycle['total_checked'], cycle['good_count'], cycle['open_count']) == (101, 51, 50)
+        assert len(db_manager.reader_connections) == 1
+        print("✓ Writes from other threads seen by the polling reader")
+
+        db_manager.close()
+        assert db_manager.writer_connection is None and not db_manager.reader_connections
+        assert db_manager.get_current_cycle(cycle_id)['total_checked'] == 101
+        db_manager.close()
+    print("✓ Closed connections reopen on the next call")
+
+def test_counters_and_statistics():
+    """Test atomic counts from two managers and the statistics upsert"""
+    print("\nTesting counter updates and daily statistics...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'wire_checker.db')
+        # Two managers stand in for two station processes sharing a database
+        stations = [DatabaseManager(path, persistent=False), DatabaseManager(path, persistent=False)]
+        cycle_id = stations[0].create_new_cycle("4-pairs")
+
+        def count(db_manager, status):
+            for _ in range(40):
+                db_manager.update_cycle_count(cycle_id, status)
+        threads = [threading.Thread(target=count, args=(db_manager, status))
+                   for db_manager, status in zip(stations, ("GOOD", "NOT GOOD"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stations[0].update_cycle_count(cycle_id, "INITIALIZING")
+        stations[0].update_cycle_count("no-such-cycle", "GOOD")
+        cycle = stations[1].get_current_cycle(cycle_id)
+        assert (cycle['total_checked'], cycle['good_count'], cycle['not_good_count'],
+                cycle['open_count']) == (81, 40, 40, 0)
+        assert len(stations[0].export_cycle_data(cycle_id)['events']) == 81
+        print("✓ No increments lost between two writers")
+
+        stations[0].end_cycle(cycle_id)
+        run_cycle(stations[1])
+        statistics = stations[0].get_daily_statistics()
+        assert len(statistics) == 1
+        assert (statistics[0]['total_cycles'], statistics[0]['total_checked'],
+                statistics[0]['total_good']) == (2, 85, 42)
+        print("✓ One statistics row per day and configuration")
+
+def test_statistics_migration():
+    """Test merging duplicate statistics rows of an older database"""
+    print("\nTesting statistics migration...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'wire_checker.db')
+        conn = sqlite3.connect(path)
+        conn.execute('''
+            CREATE TABLE statistics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, date DATE, configuration TEXT,
+                total_cycles INTEGER DEFAULT 0, total_checked INTEGER DEFAULT 0,
+                total_good INTEGER DEFAULT 0, total_not_good INTEGER DEFAULT 0,
+                total_open INTEGER DEFAULT 0)
+        ''')
+        conn.executemany('''
+            INSERT INTO statistics (date, configuration, total_cycles, total_checked,
+                                    total_good, total_not_good, total_open)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', [('2024-05-02', '4-pairs', 1, 10, 8, 1, 1),
+              ('2024-05-02', '4-pairs', 2, 20, 15, 3, 2),
+              ('2024-05-02', '3-pairs', 1, 5, 5, 0, 0),
+              ('2024-05-03', '4-pairs', 1, 7, 7, 0, 0)])
+        conn.commit()
+        conn.close()
+
+        db_manager = DatabaseManager(path, persistent=False)
+        rows = {row['configuration']: row for row in db_manager.get_daily_statistics('2024-05-02')}
+        assert len(rows) == 2
+        assert (rows['4-pairs']['total_cycles'], rows['4-pairs']['total_checked'],
+                rows['4-pairs']['total_good'], rows['4-pairs']['total_open']) == (3, 30, 23, 3)
+        assert rows['3-pairs']['total_checked'] == 5
+        assert db_manager.get_daily_statistics('2024-05-03')[0]['total_checked'] == 7
+        DatabaseManager(path, persistent=False)  # opening again changes nothing
+        assert len(db_manager.get_daily_statistics('2024-05-02')) == 2
+    print("✓ Duplicate rows merged before the unique index is added")
+
+# The history queries of DatabaseManager and the index each must use
+HISTORY_QUERIES = [
+    ('''SELECT * FROM cycle_events WHERE cycle_id = ? ORDER BY timestamp''',
+     ('x',), 'COVERING INDEX idx_cycle_events_cycle'),
+    ('''SELECT cycle_id, start_time, end_time, configuration, total_checked, good_count,
+              not_good_count, open_count, status
+       FROM cycles ORDER BY start_time DESC LIMIT ?''',
+     (50,), 'INDEX idx_cycles_start_time'),
+    ('''SELECT COUNT(*) FROM cycles WHERE status = 'completed' AND exported_at IS NULL''',
+     (), 'COVERING INDEX idx_cycles_export'),
+    ('''SELECT configuration, total_cycles, total_checked, total_good, total_not_good, total_open
+       FROM statistics WHERE date = ?''',
+     ('2024-05-02',), 'INDEX idx_statistics_day'),
+    ('''SELECT inserted_at, verdict_at, removed_at, verdict, pair_mask, fault_mask,
+              pin_count, connectivity
+       FROM inspections WHERE cycle_id = ? ORDER BY inserted_at''',
+     ('x',), 'INDEX idx_inspections_cycle'),
+    ('''SELECT * FROM cycles WHERE cycle_id = ?''',
+     ('x',), 'INDEX sqlite_autoindex_cycles_1'),
+]
+
+def test_query_plans():
+    """Test that history queries stay index-backed"""
+    print("\nTesting query plans...")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'wire_checker.db')
+        db_manager = DatabaseManager(path, persistent=False)
+        conn = sqlite3.connect(path)
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == len(SCHEMA_MIGRATIONS)
+        for query, parameters, index in HISTORY_QUERIES:
+            plan = " | ".join(row[3] for row in
+                              conn.execute('EXPLAIN QUERY PLAN ' + query, parameters))
+            assert index in plan, plan
+            assert 'TEMP B-TREE' not in plan, plan
+        conn.close()
+        print("✓ Every history query searches an index and needs no sort")
+
+        # An older file gets the indexes on its next start
+        conn = sqlite3.connect(path)
+        conn.execute('DROP INDEX idx_cycle_events_cycle')
+        conn.execute('PRAGMA user_version = 1')
+        conn.commit()
+        conn.close()
+        DatabaseManager(path, persistent=False)
+        conn = sqlite3.connect(path)
+        names = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+        assert 'idx_cycle_events_cycle' in names
+        assert conn.execute('PRAGMA user_version').fetchone()[0] == len(SCHEMA_MIGRATIONS)
+        conn.close()
+    print("✓ Schema upgrades tracked in user_version")
+
+def main():
+    """Run all tests"""
+    print("=== Database Manager Test Suite ===\n")
+
+    try:
+        test_modes_agree()
+        test_persistent_connections()
+        test_counters_and_statistics()
+        test_statistics_migration()
+        test_query_plans()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
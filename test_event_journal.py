@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Test script for the Event Journal
+Checks batched write-behind of cycle events and inspections (no display needed)
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from database_manager import DatabaseManager
+from event_journal import EventJournal, STATUS_CHANGE
+from instrumentation import PhaseTimers
+from inspections import InspectionTracker, unpack_connectivity
+from scan_engine import HarnessLayout, ScanResult
+
+class SlowWriter:
+    """Stands in for an SD card that takes delay seconds per transaction"""
+
+    def __init__(self, delay=0.0, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.batches = []
+
+    def __call__(self, batch):
+        time.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise OSError("disk I/O error")
+        self.batches.append(batch)
+
+def statuses(entries):
+    return [row[1] for kind, row in entries if kind == STATUS_CHANGE]
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+def test_batching():
+    """Test batch size, flush interval and append latency"""
+    print("Testing batched writes...")
+    writer = SlowWriter(delay=0.2)
+    timers = PhaseTimers(enabled=True)
+    journal = EventJournal(writer, batch_size=10, flush_interval=0.05, phase_timers=timers)
+    slowest = 0.0
+    for n in range(25):
+        started = time.perf_counter()
+        assert journal.append('cycle', "GOOD" if n % 2 else "OPEN")
+        slowest = max(slowest, time.perf_counter() - started)
+    assert slowest < 0.02, slowest
+    print(f"✓ Appends return in {slowest * 1000:.2f} ms while each write takes 200 ms")
+
+    assert wait_for(lambda: journal.written == 25)
+    assert sum(len(batch) for batch in writer.batches) == 25
+    assert len(writer.batches) < 25 and all(len(batch) <= 10 for batch in writer.batches)
+    assert statuses([entry for batch in writer.batches for entry in batch])[:2] == ["OPEN", "GOOD"]
+    print(f"✓ 25 events committed in {len(writer.batches)} transactions, in order")
+
+    commits = timers.summary()['db_write']
+    assert commits['count'] == len(writer.batches) and commits['p50_us'] >= 190000
+    print("✓ Each commit timed as db_write")
+
+    journal.append('cycle', "GOOD")
+    assert wait_for(lambda: journal.written == 26, timeout=1.0)
+    print("✓ A lone event is written after the flush interval")
+    journal.close()
+
+def test_flush_close_and_overflow():
+    """Test flush, shutdown drain, overflow and retries"""
+    print("\nTesting flush and shutdown...")
+    writer = SlowWriter()
+    journal = EventJournal(writer, batch_size=100, flush_interval=60.0, capacity=5)
+    for _ in range(3):
+        journal.append('cycle', "GOOD")
+    journal.flush()
+    assert journal.pending() == 0 and journal.written == 3
+    print("✓ flush() writes everything queued before it returns")
+
+    for _ in range(5):
+        journal.append('cycle', "OPEN")
+    assert not journal.append('cycle', "NOT GOOD")
+    assert journal.overflows == 1 and statuses(writer.batches[-1]) == ["NOT GOOD"]
+    print("✓ A full queue is written in place instead of dropped")
+
+    journal.close()
+    assert journal.pending() == 0 and journal.written == 8 and journal.thread is None
+    assert journal.append('cycle', "GOOD") and journal.thread is not None
+    journal.close()
+    print("✓ close() drains the queue; the journal restarts on the next event")
+
+    writer = SlowWriter(failures=1)
+    journal = EventJournal(writer, batch_size=2, flush_interval=0.01)
+    journal.append('cycle', "GOOD")
+    journal.append('cycle', "OPEN")
+    assert wait_for(lambda: journal.written == 2, timeout=3.0)
+    assert statuses(writer.batches[0]) == ["GOOD", "OPEN"]
+    journal.close()
+    print("✓ A failed batch is retried")
+
+def test_cycle_counts():
+    """Test counters written through DatabaseManager's journal"""
+    print("\nTesting cycle counts through the journal...")
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = DatabaseManager(os.path.join(directory, 'wire_checker.db'), persistent=True)
+        cycle_id = db_manager.create_new_cycle("4-pairs")
+
+        def scan_loop():
+            for n in range(300):
+                db_manager.journal.append(cycle_id, ("GOOD", "OPEN", "NOT GOOD")[n % 3])
+        threads = [threading.Thread(target=scan_loop) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        db_manager.update_cycle_count(cycle_id, "OPEN")
+        db_manager.end_cycle(cycle_id)
+
+        cycle = db_manager.get_current_cycle(cycle_id)
+        assert (cycle['total_checked'], cycle['good_count'], cycle['open_count'],
+                cycle['not_good_count']) == (601, 200, 201, 200)
+        assert len(db_manager.export_cycle_data(cycle_id)['events']) == 601
+        assert db_manager.get_daily_statistics()[0]['total_checked'] == 601
+        assert db_manager.journal.batches < 600
+        print(f"✓ 600 queued events in {db_manager.journal.batches} transactions, "
+              "all counted by end_cycle")
+
+        db_manager.journal.append(cycle_id, "GOOD")
+        db_manager.close()
+        reopened = DatabaseManager(os.path.join(directory, 'wire_checker.db'), persistent=False)
+        assert reopened.get_current_cycle(cycle_id)['good_count'] == 201
+    print("✓ Queued events survive a clean shutdown")
+
+def test_inspections():
+    """Test one inspection row per harness, written with the journal"""
+    print("\nTesting inspection records...")
+    layout = HarnessLayout([(17, 27), (22, 10)])  # rows: OUT1, OUT2, IN1, IN2
+    scans = {
+        'empty': [0, 0, 0, 0],
+        'partial': [0b0100, 0, 0b0001, 0],
+        'cross': [0b1100, 0b1000, 0b0001, 0b0010],
+        'good': [0b0100, 0b1000, 0b0001, 0b0010],
+    }
+    start = datetime(2024, 5, 2, 8, 0, 0)
+    sequence = ['empty', 'partial', 'cross', 'good', 'good', 'partial', 'empty', 'partial']
+    tracker = InspectionTracker()
+    records = []
+    for second, name in enumerate(sequence):
+        record = tracker.observe(ScanResult(layout, scans[name], 0), start + timedelta(seconds=second))
+        if record:
+            records.append(record)
+    records.append(tracker.finish())
+    assert tracker.finish() is None
+
+    first, second = records
+    assert first.inserted_at == start + timedelta(seconds=1)
+    assert first.verdict == "GOOD" and first.verdict_at == start + timedelta(seconds=3)
+    assert first.removed_at == start + timedelta(seconds=6)
+    assert (first.pair_mask, first.fault_mask, first.pin_count) == (0b11, 0, 4)
+    assert len(first.connectivity) == 5
+    assert unpack_connectivity(first.connectivity, 4) == (0, scans['good'])
+    assert second.verdict == "OPEN" and second.verdict_at is None and second.removed_at is None
+    assert second.pair_mask == 0b01
+    print("✓ Insert, verdict and removal times with the final connectivity matrix")
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = DatabaseManager(os.path.join(directory, 'wire_checker.db'), persistent=True)
+        cycle_id = db_manager.create_new_cycle("2-pairs")
+        started = time.perf_counter()
+        for record in records:
+            db_manager.journal.append_inspection(cycle_id, record)
+        assert time.perf_counter() - started < 0.01
+        db_manager.end_cycle(cycle_id)
+
+        stored = db_manager.get_inspections(cycle_id)
+        assert [row['verdict'] for row in stored] == ["GOOD", "OPEN"]
+        assert unpack_connectivity(stored[0]['connectivity'], stored[0]['pin_count'])[1] == scans['good']
+        exported = db_manager.export_cycle_data(cycle_id)['inspections']
+        assert exported[0]['connectivity'] == first.connectivity.hex()
+        db_manager.close()
+    print("✓ Inspections queued, stored and exported with the cycle")
+
+def main():
+    """Run all tests"""
+    print("=== Event Journal Test Suite ===\n")
+
+    try:
+        test_batching()
+        test_flush_close_and_overflow()
+        test_cycle_counts()
+        test_inspections()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the Metrics Endpoint
+Scrapes a station's Prometheus page over HTTP (no display needed)
+"""
+
+import os
+import socket
+import sys
+import tempfile
+import urllib.error
+import urllib.request
+from database_manager import DatabaseManager
+from instrumentation import PhaseTimers
+from metrics_server import StationMetrics, prometheus_histogram, start_metrics_server
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def parse(page):
+    """{'name{labels}': value} from a Prometheus text page"""
+    samples = {}
+    for line in page.splitlines():
+        if line and not line.startswith('#'):
+            name, value = line.rsplit(' ', 1)
+            samples[name] = float(value)
+    return samples
+
+def test_histogram_buckets():
+    """Test converting a phase histogram into Prometheus buckets"""
+    print("Testing latency buckets...")
+    timers = PhaseTimers(enabled=True)
+    for seconds in (0.0005, 0.003, 0.003, 0.04, 3.0):
+        timers.record('loop', seconds)
+    samples = parse("\n".join(prometheus_histogram('latency', "test", timers.histograms['loop'])))
+    assert samples['latency_bucket{le="0.001"}'] == 1
+    assert samples['latency_bucket{le="0.005"}'] == 3
+    assert samples['latency_bucket{le="0.05"}'] == 4
+    assert samples['latency_bucket{le="2.5"}'] == 4
+    assert samples['latency_bucket{le="+Inf"}'] == samples['latency_count'] == 5
+    assert abs(samples['latency_sum'] - 3.0465) < 0.001
+    print("✓ Cumulative buckets, count and sum in seconds")
+
+def test_scrape():
+    """Test the /metrics page of a station with a cycle in progress"""
+    print("\nTesting /metrics endpoint...")
+    with tempfile.TemporaryDirectory() as directory:
+        db_manager = DatabaseManager(os.path.join(directory, 'wire_checker.db'))
+        cycle_id = db_manager.create_new_cycle("4-pairs")
+        for status in ("GOOD", "OPEN", "GOOD", "NOT GOOD"):
+            db_manager.update_cycle_count(cycle_id, status)
+        finished = db_manager.create_new_cycle("3-pairs")
+        db_manager.end_cycle(finished)
+
+        timers = PhaseTimers()
+        state = {'configuration': "4-pairs", 'status': "GOOD", 'cycle_id': cycle_id}
+        metrics = StationMetrics(db_manager, lambda: state, timers)
+        assert start_metrics_server(metrics, port=0) is None
+        assert not timers.enabled
+        print("✓ Port 0 leaves the endpoint and loop timing off")
+
+        server = start_metrics_server(metrics, port=free_port(), address='127.0.0.1')
+        assert server is not None and timers.enabled
+        for _ in range(10):
+            timers.count_scan()
+            timers.record('verdict', 0.002)
+        timers.record('loop', 0.001)
+        timers.record('db_write', 0.004)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}"
+            with urllib.request.urlopen(url + "/metrics", timeout=5) as response:
+                assert response.headers['Content-Type'].startswith('text/plain')
+                samples = parse(response.read().decode('utf-8'))
+
+            assert samples['wire_checker_up'] == 1
+            assert samples['wire_checker_scans_total'] == 10
+            assert samples['wire_checker_verdict_latency_seconds_count'] == 10
+            assert samples['wire_checker_db_write_latency_seconds_bucket{le="0.005"}'] == 1
+            assert samples['wire_checker_status{status="GOOD"}'] == 1
+            assert samples['wire_checker_status{status="OPEN"}'] == 0
+            labels = f'cycle="{cycle_id[:8]}",configuration="4-pairs"'
+            assert samples[f'wire_checker_cycle_checks{{{labels},status="GOOD"}}'] == 2
+            assert samples[f'wire_checker_cycle_checks{{{labels},status="NOT GOOD"}}'] == 1
+            assert samples['wire_checker_export_backlog'] == 1
+            print("✓ Scans, latency, status, cycle counts and export backlog served")
+
+            db_manager.mark_cycle_exported(finished)
+            metrics.db_read_at = None
+            assert parse(metrics.render())['wire_checker_export_backlog'] == 0
+            print("✓ Exported cycles leave the backlog")
+
+            try:
+                urllib.request.urlopen(url + "/other", timeout=5)
+                assert False, "expected 404"
+            except urllib.error.HTTPError as e:
+                assert e.code == 404
+            print("✓ Only /metrics is served")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+def main():
+    """Run all tests"""
+    print("=== Metrics Endpoint Test Suite ===\n")
+
+    try:
+        test_histogram_buckets()
+        test_scrape()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test script for Real-time Scheduling
+Checks core selection and the settle jitter report (no display needed)
+"""
+
+import os
+import sys
+import tempfile
+import types
+import gpio_backend
+import mock_gpio
+import realtime
+from harness_simulator import HarnessNetlist, SimulatedClock
+from scan_engine import ScanEngine
+
+WIRE_PAIRS = [(17, 27), (22, 10), (9, 11), (5, 6)]
+
+def test_cpu_selection():
+    """Test isolcpus parsing and the default scan core"""
+    print("Testing scan core selection...")
+    assert realtime.parse_cpu_list("2-3,5\n") == [2, 3, 5]
+    assert realtime.parse_cpu_list("\n") == []
+
+    with tempfile.NamedTemporaryFile('w', delete=False) as f:
+        f.write("3\n")
+    saved = os.environ.pop(realtime.CPU_ENV, None)
+    isolated_cpus = realtime.isolated_cpus
+    try:
+        assert realtime.isolated_cpus(f.name) == [3]
+        assert realtime.isolated_cpus(f.name + '.missing') == []
+        realtime.isolated_cpus = lambda: isolated_cpus(f.name)
+        assert realtime.default_cpu() == 3
+        os.environ[realtime.CPU_ENV] = '1'
+        assert realtime.default_cpu() == 1
+        print("✓ WIRE_CHECKER_SCAN_CPU, then the last isolated core")
+    finally:
+        realtime.isolated_cpus = isolated_cpus
+        os.environ.pop(realtime.CPU_ENV, None)
+        if saved is not None:
+            os.environ[realtime.CPU_ENV] = saved
+        os.remove(f.name)
+
+def test_settle_jitter():
+    """Test recording actual against requested settle waits"""
+    print("\nTesting settle jitter report...")
+    clock = SimulatedClock()
+    backend = gpio_backend.SimulatedBackend(netlist=HarnessNetlist(WIRE_PAIRS), clock=clock)
+    engine = ScanEngine(backend, WIRE_PAIRS, settle_time=0.001)
+    engine.setup_pins()
+
+    engine.scan()
+    report = realtime.measure_jitter(engine, 0.1)
+    assert engine.jitter is None
+    # One baseline plus one window per pin on every scan
+    assert report['samples'] > 0 and report['samples'] % (len(engine.pins) + 1) == 0
+    assert report['requested_us'] == 1000.0
+    assert report['max_us'] < 1.0  # the simulated clock sleeps exactly
+    print(f"✓ {report['samples']} settle windows, no overshoot on the simulated clock")
+
+    jitter = realtime.SettleJitter(size=4)
+    for actual in (0.0015, 0.001, 0.002, 0.0012, 0.001):
+        jitter.requested.append(0.001)
+        jitter.actual.append(actual)
+    report = jitter.report()
+    assert report['samples'] == 4
+    assert report['p50_us'] == 200.0 and report['max_us'] == 1000.0
+    assert realtime.SettleJitter().report() == {'samples': 0}
+    print("✓ Overshoot percentiles over the most recent windows")
+
+class StrictGPIO(mock_gpio.MockGPIO):
+    """RPi.GPIO's rule: no pin setup before setmode()"""
+    mode = None
+
+    @classmethod
+    def setmode(cls, mode):
+        cls.mode = mode
+
+    @classmethod
+    def setup(cls, pin, mode, pull_up_down=None):
+        if cls.mode is None:
+            raise RuntimeError("Please set pin numbering mode using GPIO.setmode")
+        super().setup(pin, mode, pull_up_down)
+
+def test_jitter_command():
+    """Test the jitter report command on the RPi.GPIO backend"""
+    print("\nTesting jitter report command...")
+    rpi = types.ModuleType('RPi')
+    rpi.GPIO = StrictGPIO
+    saved_modules = {name: sys.modules.get(name) for name in ('RPi', 'RPi.GPIO')}
+    saved_env = os.environ.pop('WIRE_CHECKER_GPIO_BACKEND', None)
+    saved = (sys.argv, realtime.apply)
+    sys.modules['RPi'] = rpi
+    sys.modules['RPi.GPIO'] = StrictGPIO
+    # Scheduling this test process real-time is not part of the check
+    realtime.apply = lambda cpu, priority=None: {'cpu': cpu, 'fifo_priority': None,
+                                                 'memory_locked': False}
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, 'jitter_report.json')
+        sys.argv = ['realtime.py', '--seconds', '0.05', '--output', output]
+        try:
+            realtime.main()
+        finally:
+            sys.argv, realtime.apply = saved
+            for name, module in saved_modules.items():
+                if module is None:
+                    sys.modules.pop(name, None)
+                else:
+                    sys.modules[name] = module
+            if saved_env is not None:
+                os.environ['WIRE_CHECKER_GPIO_BACKEND'] = saved_env
+        assert StrictGPIO.mode == StrictGPIO.BCM
+        assert os.path.exists(output)
+    print("✓ BCM numbering set before the harness pins are set up")
+
+def main():
+    """Run all tests"""
+    print("=== Real-time Scheduling Test Suite ===\n")
+
+    try:
+        test_cpu_selection()
+        test_settle_jitter()
+        test_jitter_command()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Test script for the Scan Engine
+Runs connectivity scans against a wired fake GPIO (no hardware needed)
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from scan_engine import (ScanEngine, InsertionWatcher, HoldWatcher, MajorityVote, iter_bits,
+                         count_bits)
+import settle_calibration
+import gpio_backend
+from harness_simulator import HarnessNetlist, SimulatedClock
+from mock_gpio import GPIO as MockGPIO
+
+WIRE_PAIRS = [(17, 27), (22, 10), (9, 11), (5, 6)]
+
+class WiredGPIO:
+    """Minimal GPIO double where pins are joined by a fixed set of wires"""
+    OUT = "OUT"
+    IN = "IN"
+    HIGH = True
+    LOW = False
+    PUD_DOWN = "PUD_DOWN"
+
+    def __init__(self, wires):
+        self.wires = [set(wire) for wire in wires]
+        self.modes = {}
+        self.levels = {}
+
+    def setup(self, pin, mode, pull_up_down=None):
+        self.modes[pin] = mode
+        if mode == self.OUT:
+            self.levels[pin] = self.LOW
+
+    def output(self, pin, state):
+        self.levels[pin] = state
+
+    def input(self, pin):
+        net = {pin}
+        for wire in self.wires:
+            if pin in wire:
+                net |= wire
+        return any(self.modes.get(p) == self.OUT and self.levels.get(p) for p in net)
+
+def run_scan(wires):
+    engine = ScanEngine(WiredGPIO(wires), WIRE_PAIRS, settle_time=0)
+    engine.setup_pins()
+    return engine.scan()
+
+def test_good_harness():
+    """Test that a correctly wired harness reads GOOD"""
+    print("Testing good harness...")
+    result = run_scan(WIRE_PAIRS)
+    assert result.pair_results == [True, True, True, True]
+    assert not result.has_cross_connections
+    assert result.verdict == "GOOD"
+    print("✓ Good harness reads GOOD")
+
+def test_open_pair():
+    """Test that a missing wire reads OPEN"""
+    print("\nTesting open pair...")
+    result = run_scan([(17, 27), (22, 10), (5, 6)])
+    assert result.pair_results == [True, True, False, True]
+    assert result.verdict == "OPEN"
+    print("✓ Open pair reads OPEN")
+
+def test_cross_and_shorts():
+    """Test cross, IN-to-IN and OUT-to-OUT detection"""
+    print("\nTesting cross connections...")
+    result = run_scan([(17, 10), (22, 27), (9, 11), (5, 6)])
+    assert (0, 1) in result.cross_connections
+    assert (1, 0) in result.cross_connections
+    assert result.verdict == "NOT GOOD"
+    print("✓ Cross connection detected")
+
+    result = run_scan(WIRE_PAIRS + [(27, 11)])
+    assert (0, 2) in result.in_to_in_connections
+    assert result.verdict == "NOT GOOD"
+    print("✓ IN-to-IN connection detected")
+
+    result = run_scan(WIRE_PAIRS + [(22, 5)])
+    assert (1, 3) in result.out_to_out_connections
+    assert result.verdict == "NOT GOOD"
+    print("✓ OUT-to-OUT connection detected")
+
+def test_single_drive_per_pin():
+    """Test that each pin is driven exactly once per scan"""
+    print("\nTesting drive count...")
+    gpio = WiredGPIO(WIRE_PAIRS)
+    drives = []
+    original_output = gpio.output
+
+    def counting_output(pin, state):
+        if state:
+            drives.append(pin)
+        original_output(pin, state)
+
+    gpio.output = counting_output
+    engine = ScanEngine(gpio, WIRE_PAIRS, settle_time=0)
+    engine.setup_pins()
+    engine.scan()
+    assert sorted(drives) == sorted(engine.pins)
+    print(f"✓ {len(drives)} drive steps for {len(WIRE_PAIRS)} pairs")
+
+def test_bitmask_rows():
+    """Test bit-packed rows, expected netlist and pass-to-pass diff"""
+    print("\nTesting bitmask representation...")
+    engine = ScanEngine(WiredGPIO(WIRE_PAIRS), WIRE_PAIRS, settle_time=0)
+    assert engine.expected[0] == 1 << 4
+    assert engine.expected[4] == 1 << 0
+    engine.setup_pins()
+    good = engine.scan()
+    assert good.rows == engine.expected
+    assert good.fault_mask == 0
+    assert good.changed_pins(good) == 0
+    print("✓ Good harness rows match the expected netlist")
+
+    result = run_scan([(17, 27), (22, 10), (5, 6)])
+    assert list(iter_bits(result.open_mask)) == [2]
+    assert count_bits(result.pair_mask) == 3
+    assert list(iter_bits(result.changed_pins(good))) == [2, 6]
+    print("✓ Open pair and changed pins found with mask operations")
+
+def test_settle_calibration():
+    """Test settle measurement, config round trip and the error monitor"""
+    print("\nTesting settle calibration...")
+    settle_times = settle_calibration.calibrate(WiredGPIO(WIRE_PAIRS), WIRE_PAIRS, repeats=3)
+    assert set(settle_times) == {pin for pair in WIRE_PAIRS for pin in pair}
+    assert all(settle_calibration.MIN_SETTLE_TIME <= t <= settle_calibration.DEFAULT_SETTLE_TIME
+               for t in settle_times.values())
+    print("✓ Every pin calibrated within bounds")
+
+    open_times = settle_calibration.calibrate(WiredGPIO([]), [(17, 27)], repeats=1)
+    assert open_times[17] == settle_calibration.DEFAULT_SETTLE_TIME
+    print("✓ Unsettled line keeps the default budget")
+
+    config_file = 'test_settle_configuration.json'
+    settle_calibration.save_settle_times(settle_times, config_file=config_file)
+    assert not os.path.exists(config_file)
+    with open(config_file, 'w') as f:
+        json.dump({'wire_pairs': []}, f)
+    settle_calibration.save_settle_times(settle_times, config_file=config_file)
+    loaded = settle_calibration.load_settle_times(config_file=config_file)
+    assert set(loaded) == set(settle_times)
+    os.remove(config_file)
+    print("✓ Settle times saved to and loaded from an existing configuration only")
+
+    settle_file = 'test_settle_times.json'
+    settle_calibration.save_settle_times({17: 0.001}, "3-pairs", settle_file)
+    settle_calibration.save_settle_times({17: 0.004}, "4-pairs", settle_file)
+    assert settle_calibration.load_settle_times("3-pairs", settle_file) == {17: 0.001}
+    assert settle_calibration.load_settle_times("4-pairs", settle_file) == {17: 0.004}
+    assert settle_calibration.load_settle_times("rfid", settle_file) == {}
+    os.remove(settle_file)
+    print("✓ Each product keeps its own budgets for the same pin")
+
+    engine = ScanEngine(WiredGPIO(WIRE_PAIRS), WIRE_PAIRS, settle_times={17: 0.0})
+    assert engine.settle_budgets[0] == 0.0
+    assert engine.settle_budgets[1] == settle_calibration.DEFAULT_SETTLE_TIME
+
+    monitor = settle_calibration.SettleMonitor(window=10, max_error_rate=0.1)
+    for i in range(10):
+        monitor.record(i % 3 == 0)
+    assert monitor.needs_recalibration
+    monitor.reset()
+    assert not monitor.needs_recalibration
+    print("✓ Error monitor flags recalibration")
+
+class EdgeGPIO(WiredGPIO):
+    """WiredGPIO with RPi.GPIO style edge callbacks"""
+    RISING = "RISING"
+
+    def __init__(self, wires):
+        super().__init__(wires)
+        self.callbacks = {}
+
+    def add_event_detect(self, pin, edge, callback=None, bouncetime=None):
+        self.callbacks[pin] = callback
+
+    def remove_event_detect(self, pin):
+        self.callbacks.pop(pin, None)
+
+    def insert(self, wire):
+        self.wires.append(set(wire))
+        for pin in wire:
+            if pin in self.callbacks and self.input(pin):
+                self.callbacks[pin](pin)
+
+def test_insertion_watcher():
+    """Test idle insertion detection with and without edge interrupts"""
+    print("\nTesting insertion watcher...")
+    gpio = WiredGPIO([])
+    engine = ScanEngine(gpio, WIRE_PAIRS, settle_time=0)
+    engine.setup_pins()
+    watcher = InsertionWatcher(engine, poll_interval=0.001, max_idle=0.05)
+    assert not watcher.wait()
+    assert not watcher.use_interrupts
+    gpio.wires.append({9, 11})
+    assert watcher.wait()
+    assert all(mode == gpio.IN for mode in gpio.modes.values())
+    print("✓ Polling fallback detects insertion and restores idle pins")
+
+    gpio = EdgeGPIO([])
+    engine = ScanEngine(gpio, WIRE_PAIRS, settle_time=0)
+    engine.setup_pins()
+    watcher = InsertionWatcher(engine, max_idle=5.0)
+    threading.Timer(0.02, gpio.insert, args=((5, 6),)).start()
+    assert watcher.wait()
+    assert watcher.use_interrupts
+    assert not gpio.callbacks
+    print("✓ Edge callback wakes the watcher")
+
+def test_gpio_backends():
+    """Test bulk read/write on the simulated backend and the gpiochip ABI"""
+    print("\nTesting GPIO backends...")
+    backend = gpio_backend.SimulatedBackend(WIRE_PAIRS)
+    engine = ScanEngine(backend, WIRE_PAIRS, settle_time=0)
+    engine.setup_pins()
+    assert engine.scan().verdict == "GOOD"
+    backend.write_mask(0b1)
+    assert backend.read_all() == 0b10001
+    backend.write_mask(0)
+    assert backend.read_all() == 0
+    print("✓ Simulated backend scans a good harness in bulk")
+
+    wrapped = gpio_backend.as_backend(WiredGPIO(WIRE_PAIRS))
+    wrapped.claim([17, 27])
+    wrapped.write_mask(0b1)
+    assert wrapped.read_all() == 0b11
+    assert gpio_backend.as_backend(backend) is backend
+    print("✓ RPi.GPIO style modules are wrapped")
+
+    # struct sizes must match include/uapi/linux/gpio.h
+    assert gpio_backend.ctypes.sizeof(gpio_backend._LineRequest) == 592
+    assert gpio_backend.ctypes.sizeof(gpio_backend._LineConfig) == 272
+    assert gpio_backend.GPIO_V2_GET_LINE_IOCTL == 0xC250B407
+    print("✓ gpiochip line request layout matches the kernel uAPI")
+
+def sim_engine(netlist, settle_time=0.001, seed=0):
+    backend = gpio_backend.SimulatedBackend(netlist=netlist, clock=SimulatedClock(), seed=seed)
+    engine = ScanEngine(backend, WIRE_PAIRS, settle_time=settle_time)
+    engine.setup_pins()
+    return engine
+
+def test_harness_simulator():
+    """Test netlist faults, RC delays and the simulated clock"""
+    print("\nTesting harness simulator...")
+    assert sim_engine(HarnessNetlist(WIRE_PAIRS)).scan().verdict == "GOOD"
+    assert sim_engine(HarnessNetlist(WIRE_PAIRS, opens=[2])).scan().open_mask == 0b100
+    result = sim_engine(HarnessNetlist(WIRE_PAIRS, cross_wires=[(0, 1)])).scan()
+    assert sorted(result.cross_connections) == [(0, 1), (1, 0)]
+    result = sim_engine(HarnessNetlist(WIRE_PAIRS, shorts=[(27, 11)])).scan()
+    assert (0, 2) in result.in_to_in_connections
+    assert sim_engine(HarnessNetlist(WIRE_PAIRS, inserted=False)).scan().is_empty
+    print("✓ Opens, cross-wires, shorts and empty fixture resolve from the netlist")
+
+    netlist = HarnessNetlist(WIRE_PAIRS)
+    netlist.set_settle(9, 11, 0.002)
+    assert sim_engine(netlist, settle_time=0.001).scan().open_mask == 0b100
+    engine = sim_engine(netlist, settle_time=0.003)
+    assert engine.scan().verdict == "GOOD"
+    settle_times = settle_calibration.calibrate(engine.backend, WIRE_PAIRS, repeats=2)
+    assert 0.0055 < settle_times[9] < 0.007
+    assert settle_times[17] == settle_calibration.MIN_SETTLE_TIME
+    print("✓ RC settle delay is honoured and measured by calibration")
+
+    def verdicts(seed):
+        engine = sim_engine(HarnessNetlist(WIRE_PAIRS, intermittents={(22, 5): 0.3}), seed=seed)
+        return [engine.scan().verdict for _ in range(50)]
+    assert verdicts(1) == verdicts(1)
+    assert set(verdicts(1)) == {"GOOD", "NOT GOOD"}
+    print("✓ Intermittent contact is reproducible for a given seed")
+
+    engine = sim_engine(HarnessNetlist(WIRE_PAIRS))
+    start = time.perf_counter()
+    for _ in range(1000):
+        engine.scan()
+    elapsed = time.perf_counter() - start
+    assert engine.backend.clock.monotonic() >= 1000 * 9 * 0.001
+    assert elapsed < 5.0
+    print(f"✓ 1000 scans of simulated time in {elapsed:.2f} s")
+
+    netlist = HarnessNetlist(WIRE_PAIRS, inserted=False)
+    engine = sim_engine(netlist)
+    engine.backend.simulator.schedule(2.5, HarnessNetlist.insert)
+    assert InsertionWatcher(engine, max_idle=5.0).wait()
+    assert 2.5 <= engine.backend.clock.monotonic() < 2.6
+    print("✓ Scheduled insertion wakes the watcher at the simulated time")
+
+    MockGPIO.attach_netlist(HarnessNetlist(WIRE_PAIRS, opens=[3]))
+    try:
+        engine = ScanEngine(MockGPIO, WIRE_PAIRS, settle_time=0)
+        engine.setup_pins()
+        assert engine.scan().open_mask == 0b1000
+    finally:
+        MockGPIO.detach_netlist()
+        MockGPIO.cleanup()
+    print("✓ mock_gpio resolves inputs from an attached netlist")
+
+def test_coded_stimulus():
+    """Test that coded patterns give the single-drive rows in fewer steps"""
+    print("\nTesting coded stimulus...")
+    pairs = [(i, 24 + i) for i in range(24)]
+    netlists = [
+        {},
+        {'opens': [3]},
+        {'cross_wires': [(0, 5)]},
+        {'shorts': [(24, 40)]},
+        {'shorts': [(2, 9)], 'opens': [9]},
+        {'opens': [1], 'shorts': [(25, 0)]},
+        {'inserted': False},
+    ]
+    for faults in netlists:
+        results = {}
+        for stimulus in ('single', 'coded'):
+            backend = gpio_backend.SimulatedBackend(netlist=HarnessNetlist(pairs, **faults),
+                                                    clock=SimulatedClock())
+            engine = ScanEngine(backend, pairs, settle_time=0.001, stimulus=stimulus)
+            engine.setup_pins()
+            results[stimulus] = engine.scan()
+        assert results['coded'].rows == results['single'].rows, faults
+        assert results['coded'].verdict == results['single'].verdict
+        assert results['coded'].drive_steps < results['single'].drive_steps
+    print("✓ Coded scan matches the single-drive scan for opens, crosses and shorts")
+
+    engine = ScanEngine(gpio_backend.SimulatedBackend(pairs), pairs, settle_time=0,
+                        stimulus='coded')
+    engine.setup_pins()
+    assert engine.scan().drive_steps == 6
+    print("✓ Good 24-pair harness needs 6 drive steps instead of 48")
+
+def test_hold_watcher():
+    """Test holding a GOOD verdict until the harness changes"""
+    print("\nTesting hold watcher...")
+    engine = sim_engine(HarnessNetlist(WIRE_PAIRS))
+    hold = HoldWatcher(engine, poll_interval=0.02, max_hold=5.0)
+    assert engine.scan().verdict == "GOOD"
+    assert hold.wait()
+    assert engine.backend.drive_mask == 0
+    print(f"✓ Unchanged harness held for max_hold with {hold.checks} continuity checks")
+
+    clock = engine.backend.clock
+    removed_at = clock.monotonic() + 1.0
+    engine.backend.simulator.schedule(removed_at, HarnessNetlist.remove)
+    assert not hold.wait()
+    assert clock.monotonic() - removed_at <= 0.021
+    assert engine.scan().is_empty
+    print("✓ Removal ends the hold within one check interval")
+
+    engine = sim_engine(HarnessNetlist(WIRE_PAIRS, opens=[1]))
+    assert not HoldWatcher(engine).wait()
+    print("✓ Harness that does not read GOOD is not held")
+
+def test_majority_vote():
+    """Test the N-of-M pin vote and that glitches do not reach the verdict"""
+    print("\nTesting majority vote...")
+    vote = MajorityVote(samples=5, votes=4)
+    for levels in (0b0111, 0b0001, 0b0111, 0b0001, 0b0101):
+        vote.add(levels)
+    high, undecided = vote.decide(0b1111)
+    assert high == 0b0001
+    assert undecided == 0b0110
+    print("✓ Pins get HIGH, LOW or undecided from their last 5 samples")
+
+    try:
+        MajorityVote(samples=4, votes=2)
+        assert False, "2 of 4 is not a majority"
+    except ValueError:
+        pass
+    print("✓ Vote thresholds without a majority are rejected")
+
+    def verdicts(samples, votes):
+        netlist = HarnessNetlist(WIRE_PAIRS, intermittents={(22, 5): 0.1})
+        backend = gpio_backend.SimulatedBackend(netlist=netlist, clock=SimulatedClock(), seed=7)
+        engine = ScanEngine(backend, WIRE_PAIRS, settle_time=0.001, samples=samples, votes=votes)
+        engine.setup_pins()
+        results = [engine.scan() for _ in range(200)]
+        return [result.verdict for result in results if result.is_stable]
+    assert "NOT GOOD" in verdicts(1, 1)
+    assert "NOT GOOD" not in verdicts(5, 4)
+    print("✓ Brief contact glitches are outvoted instead of reported NOT GOOD")
+
+def main():
+    """Run all tests"""
+    print("=== Scan Engine Test Suite ===\n")
+
+    try:
+        test_good_harness()
+        test_open_pair()
+        test_cross_and_shorts()
+        test_single_drive_per_pin()
+        test_bitmask_rows()
+        test_settle_calibration()
+        test_insertion_watcher()
+        test_gpio_backends()
+        test_harness_simulator()
+        test_coded_stimulus()
+        test_hold_watcher()
+        test_majority_vote()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Test script for the Scan Worker
+Runs the worker process on a simulated harness (no display needed)
+"""
+
+import sys
+import threading
+import time
+from collections import namedtuple
+from functools import partial
+import gpio_backend
+from harness_simulator import HarnessNetlist
+from scan_engine import ScanEngine
+from scan_worker import StatusBlock, ScanWorker
+
+WIRE_PAIRS = [(17, 27), (22, 10), (9, 11), (5, 6)]
+
+FakeResult = namedtuple('FakeResult', 'verdict pair_mask fault_mask baseline undecided rows')
+
+def sim_backend(**faults):
+    """Backend factory for the worker process (must pickle)"""
+    return partial(gpio_backend.SimulatedBackend, netlist=HarnessNetlist(WIRE_PAIRS, **faults))
+
+def test_status_block():
+    """Test publishing a scan and reading it back"""
+    print("Testing shared status block...")
+    engine = ScanEngine(sim_backend(opens=[2])(), WIRE_PAIRS, settle_time=0.001)
+    engine.setup_pins()
+    result = engine.scan()
+    block = StatusBlock(len(engine.pins))
+    try:
+        assert block.read().seq == 0
+        block.publish(result, 1, 0, 0)
+        snapshot = block.read()
+        assert snapshot.seq == 2 and snapshot.scans == 1
+        assert snapshot.verdict == "OPEN"
+        assert snapshot.pair_mask == result.pair_mask == 0b1011
+        assert list(snapshot.rows) == result.rows
+        print("✓ Verdict, pair masks and connectivity rows round-trip")
+    finally:
+        block.close()
+
+def test_torn_reads():
+    """Test that readers never see a half-written scan"""
+    print("\nTesting lock-free reads against a busy writer...")
+    pin_count = len(WIRE_PAIRS) * 2
+    block = StatusBlock(pin_count)
+    done = threading.Event()
+
+    def writer():
+        for n in range(1, 20001):
+            block.publish(FakeResult("GOOD", n & 0xF, 0, n, 0, [n] * pin_count), n, n, n)
+        done.set()
+
+    try:
+        thread = threading.Thread(target=writer)
+        thread.start()
+        reads = 0
+        while not done.is_set():
+            snapshot = block.read()
+            assert set(snapshot.rows) <= {snapshot.scans}, snapshot
+            assert snapshot.baseline == snapshot.good == snapshot.scans
+            reads += 1
+        thread.join()
+        assert block.read().scans == 20000
+        print(f"✓ {reads} snapshots read during 20000 writes, none torn")
+    finally:
+        block.close()
+
+def test_worker_process():
+    """Test verdicts published by the worker process"""
+    print("\nTesting scan worker process...")
+    for label, faults, verdict, pair_mask in (("GOOD", {}, "GOOD", 0b1111),
+                                              ("OPEN", {'opens': [1]}, "OPEN", 0b1101),
+                                              ("cross", {'cross_wires': [(0, 3)]},
+                                               "NOT GOOD", None)):
+        worker = ScanWorker(WIRE_PAIRS, backend_factory=sim_backend(**faults))
+        worker.start()
+        try:
+            result = worker.next_result(5.0)
+            assert result is not None, f"{label}: no scan published"
+            assert result.verdict == verdict, f"{label}: {result.verdict}"
+            if pair_mask is not None:
+                assert result.pair_mask == pair_mask
+            snapshot = worker.snapshot()
+            assert snapshot.scans >= 1 and snapshot.verdict == verdict
+            assert worker.process.pid is not None
+        finally:
+            process = worker.process
+            start = time.monotonic()
+            worker.stop()
+            elapsed = time.monotonic() - start
+        assert not process.is_alive() and worker.snapshot() is None
+        assert worker.next_result(0.01) is None
+        assert elapsed < 1.0, f"{label}: stop took {elapsed:.3f}s"
+        print(f"✓ {label} harness: {verdict} published, worker stopped in "
+              f"{elapsed * 1000:.0f} ms")
+
+def test_stop_while_reading():
+    """Test stopping the worker under a scan loop that has not parked"""
+    print("\nTesting stop without a parked scan loop...")
+    worker = ScanWorker(WIRE_PAIRS, backend_factory=sim_backend())
+    worker.start()
+    try:
+        assert worker.next_result(5.0) is not None
+        process, block = worker.process, worker.block
+        worker.stop(free_block=False)
+        assert not process.is_alive() and worker.process is None
+        assert block.read().verdict == "GOOD"
+        assert worker.next_result(0.01) is None
+        print("✓ Worker stopped, its block still readable by the loop")
+
+        worker.start()
+        assert worker.next_result(5.0).verdict == "GOOD"
+        assert block.buf is not None
+    finally:
+        worker.stop()
+    assert block.buf is None and worker.retired_blocks == []
+    print("✓ Restarted worker scans; the old block is freed by the next stop")
+
+def main():
+    """Run all tests"""
+    print("=== Scan Worker Test Suite ===\n")
+
+    try:
+        test_status_block()
+        test_torn_reads()
+        test_worker_process()
+        test_stop_while_reading()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
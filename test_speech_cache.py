@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test script for the Spoken Diagnostics Cache
+Uses a fake renderer, so espeak is not needed
+"""
+
+import os
+import sys
+import tempfile
+import gpio_backend
+from harness_simulator import HarnessNetlist, SimulatedClock
+from scan_engine import ScanEngine
+from speech_cache import (DEFAULT_VOICE, build_cache, config_hash,
+                          diagnostic_keys, diagnostic_phrases, load_clips)
+
+WIRE_PAIRS = [(17, 27), (22, 10), (9, 11), (5, 6)]
+
+class FakeRenderer:
+    """Writes the phrase text instead of audio and counts calls"""
+
+    def __init__(self):
+        self.rendered = []
+
+    def __call__(self, text, path, voice):
+        self.rendered.append(text)
+        with open(path, 'w') as f:
+            f.write(text)
+
+def scan(netlist):
+    backend = gpio_backend.SimulatedBackend(netlist=netlist, clock=SimulatedClock())
+    engine = ScanEngine(backend, WIRE_PAIRS, settle_time=0.001)
+    engine.setup_pins()
+    return engine.scan()
+
+def test_phrases_and_hash():
+    """Test phrase enumeration and cache keys"""
+    print("Testing phrase enumeration...")
+    phrases = diagnostic_phrases(WIRE_PAIRS)
+    # 4 opens, 12 ordered crosses, 6 IN-to-IN and 6 OUT-to-OUT shorts
+    assert len(phrases) == 4 + 12 + 6 + 6
+    assert phrases['open_2'] == "Pair 3 open"
+    assert phrases['cross_0_1'] == "Pair 1 output wired to pair 2 input"
+    print(f"✓ {len(phrases)} phrases for 4 pairs")
+
+    assert config_hash(WIRE_PAIRS) == config_hash(list(WIRE_PAIRS))
+    assert config_hash(WIRE_PAIRS) != config_hash(WIRE_PAIRS[:3])
+    assert config_hash(WIRE_PAIRS) != config_hash(WIRE_PAIRS, dict(DEFAULT_VOICE, voice='en-gb'))
+    print("✓ Cache key changes with pairs and voice")
+
+def test_build_and_load():
+    """Test that the build renders each phrase once and the checker can load it"""
+    print("\nTesting cache build...")
+    with tempfile.TemporaryDirectory() as root:
+        assert load_clips(WIRE_PAIRS, root=root) == {}
+        renderer = FakeRenderer()
+        build_cache(WIRE_PAIRS, root=root, render=renderer)
+        assert len(renderer.rendered) == len(diagnostic_phrases(WIRE_PAIRS))
+
+        build_cache(WIRE_PAIRS, root=root, render=renderer)
+        assert len(renderer.rendered) == len(diagnostic_phrases(WIRE_PAIRS))
+        print("✓ Rebuild renders nothing when the cache is complete")
+
+        clips = load_clips(WIRE_PAIRS, root=root)
+        assert set(clips) == set(diagnostic_phrases(WIRE_PAIRS))
+        with open(clips['open_0']) as f:
+            assert f.read() == "Pair 1 open"
+        assert load_clips(WIRE_PAIRS[:3], root=root) == {}
+        print("✓ Clips load by configuration; other configurations miss")
+
+        os.remove(clips['open_0'])
+        build_cache(WIRE_PAIRS, root=root, render=renderer)
+        assert renderer.rendered[-1] == "Pair 1 open"
+        print("✓ Missing clip is re-rendered")
+
+def test_diagnostic_keys():
+    """Test that scan results map onto cached phrases"""
+    print("\nTesting diagnostic keys...")
+    phrases = diagnostic_phrases(WIRE_PAIRS)
+    assert diagnostic_keys(scan(HarnessNetlist(WIRE_PAIRS))) == []
+
+    keys = diagnostic_keys(scan(HarnessNetlist(WIRE_PAIRS, cross_wires=[(0, 1)])))
+    assert keys == ['cross_0_1', 'cross_1_0', 'open_0', 'open_1']
+    # Shorting two inputs joins both pairs: crosses plus one short per side
+    keys = diagnostic_keys(scan(HarnessNetlist(WIRE_PAIRS, shorts=[(27, 11)])))
+    assert keys == ['cross_0_2', 'cross_2_0', 'in_in_0_2', 'out_out_0_2']
+    assert all(key in phrases for key in keys)
+    assert diagnostic_keys(scan(HarnessNetlist(WIRE_PAIRS, opens=[3]))) == ['open_3']
+    print("✓ Cross, short and open faults name cached phrases")
+
+    keys = diagnostic_keys(scan(HarnessNetlist(WIRE_PAIRS, shorts=[(27, 11)], opens=[3])))
+    assert keys == ['cross_0_2', 'cross_2_0', 'in_in_0_2', 'out_out_0_2']
+    print("✓ Spoken diagnostics are capped, faults first")
+
+def main():
+    """Run all tests"""
+    print("=== Speech Cache Test Suite ===\n")
+
+    try:
+        test_phrases_and_hash()
+        test_build_and_load()
+        test_diagnostic_keys()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test script for the Startup Profile
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+import startup_profile
+
+IMPORTTIME_LOG = """\
+import time: self [us] | cumulative | imported package
+import time:       277 |        277 |       copyreg
+import time:       824 |      10732 |     re
+import time:       678 |      12457 |   json.decoder
+import time:       406 |      13632 | json
+Starting Wire Checker System...
+import time:      1500 |     250000 | pygame
+import time:       300 |       4000 |   pygame.mixer
+"""
+
+def test_parse_importtime():
+    """Test reading a python -X importtime log"""
+    print("Testing importtime parsing...")
+    rows = startup_profile.parse_importtime(IMPORTTIME_LOG.splitlines())
+    assert len(rows) == 6
+    assert rows[0] == ('copyreg', 277, 277, 3)
+    top = startup_profile.top_imports(rows)
+    assert [row[0] for row in top] == ['pygame', 'json']
+    print("✓ Nested and unrelated lines skipped, slowest top-level import first")
+
+def test_budget_report():
+    """Test milestones, the budget check and the report file"""
+    print("\nTesting startup budget...")
+    saved = startup_profile.LAUNCHED_AT
+    try:
+        startup_profile.LAUNCHED_AT = None
+        startup_profile.finish()
+        assert not startup_profile.finished.is_set()
+        print("✓ Nothing recorded without a launch time")
+
+        with tempfile.TemporaryDirectory() as directory:
+            report_file = os.path.join(directory, 'startup_profile.json')
+            startup_profile.LAUNCHED_AT = time.time() - 1.0
+            startup_profile.mark('menu_shown')
+            startup_profile.finish(report_file=report_file)
+            with open(report_file) as f:
+                report = json.load(f)
+            assert report['within_budget']
+            assert 1.0 <= report['marks']['first_scan'] < report['budget']
+            assert report['marks']['menu_shown'] <= report['marks']['first_scan']
+
+            os.remove(report_file)
+            startup_profile.finish(report_file=report_file)
+            assert not os.path.exists(report_file)
+            print("✓ First scan reported once, within the budget")
+    finally:
+        startup_profile.LAUNCHED_AT = saved
+        startup_profile.marks.clear()
+        startup_profile.finished.clear()
+
+def test_fast_start_flag():
+    """Test the fast-start environment switch"""
+    print("\nTesting fast-start flag...")
+    saved = os.environ.get(startup_profile.FAST_START_ENV)
+    try:
+        for value, expected in (('1', True), ('0', False), ('', False)):
+            os.environ[startup_profile.FAST_START_ENV] = value
+            assert startup_profile.fast_start() == expected
+        del os.environ[startup_profile.FAST_START_ENV]
+        assert not startup_profile.fast_start()
+        print("✓ WIRE_CHECKER_FAST_START=1 enables fast start, unset or 0 disables it")
+    finally:
+        if saved is not None:
+            os.environ[startup_profile.FAST_START_ENV] = saved
+
+def main():
+    """Run all tests"""
+    print("=== Startup Profile Test Suite ===\n")
+
+    try:
+        test_parse_importtime()
+        test_budget_report()
+        test_fast_start_flag()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test script for Event Tracing
+Checks the span ring buffer and Chrome trace dumps (no display needed)
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import deque
+import instrumentation
+import tracing
+from tracing import Tracer
+
+def test_ring_buffer():
+    """Test span recording and the Chrome trace format"""
+    print("Testing span ring buffer...")
+    tracer = Tracer(capacity=3)
+    with tracer.span('ignored', 'db'):
+        pass
+    assert not tracer.events
+    print("✓ Nothing recorded while disabled")
+
+    tracer.enabled = True
+    for n in range(5):
+        with tracer.span(f'span{n}', 'db', {'n': n}):
+            time.sleep(0.001)
+    assert [event['name'] for event in tracer.events] == ['span2', 'span3', 'span4']
+
+    trace = tracer.chrome_trace('manual')
+    json.dumps(trace)
+    metadata = [event for event in trace['traceEvents'] if event['ph'] == 'M']
+    spans = [event for event in trace['traceEvents'] if event['ph'] == 'X']
+    assert metadata[0]['args']['name'] == 'MainThread'
+    assert len(spans) == 3 and spans[0]['args'] == {'n': 2}
+    assert all(span['dur'] >= 1000 and span['pid'] == os.getpid() for span in spans)
+    assert spans[0]['ts'] < spans[1]['ts'] < spans[2]['ts']
+    print("✓ Oldest spans dropped, complete events in microseconds")
+
+def test_traced_and_timers():
+    """Test the decorator and the scan loop phase timers feeding the tracer"""
+    print("\nTesting traced calls and loop phases...")
+
+    @tracing.traced('db')
+    def update_cycle_count():
+        return 42
+
+    timers = instrumentation.timers
+    saved = (tracing.tracer.events, timers.enabled)
+    tracing.tracer.events = deque(maxlen=100)
+    timers.enabled = False
+    try:
+        assert update_cycle_count() == 42 and not tracing.tracer.events
+        assert timers.start() == 0.0
+
+        tracing.tracer.enable()
+        assert update_cycle_count() == 42
+        started = timers.start()
+        assert started
+        timers.stop('scan', started)
+        timers.record('scan', 0.002)
+        names = [(event['cat'], event['name']) for event in tracing.tracer.events]
+        assert names == [('db', 'update_cycle_count'), ('loop', 'scan'), ('loop', 'scan')]
+        assert timers.summary()['scan']['count'] == 0
+        print("✓ Calls and loop phases traced without turning the histograms on")
+    finally:
+        tracing.tracer.enable(False)
+        tracing.tracer.events, timers.enabled = saved
+    assert timers.tracer is None
+
+def test_slow_verdict_dump():
+    """Test the slow-verdict trigger and manual dumps"""
+    print("\nTesting trace dumps...")
+    with tempfile.TemporaryDirectory() as directory:
+        tracer = Tracer(slow_verdict=0.1, trace_dir=directory)
+        tracer.enabled = True
+        now = time.perf_counter()
+        tracer.complete('scan', 'loop', now, 0.05)
+        tracer.complete('loop', 'loop', now, 0.05)
+        assert tracer.last_slow_dump is None
+
+        tracer.complete('loop', 'loop', now, 0.2)
+        tracer.complete('loop', 'loop', now, 0.2)  # within SLOW_DUMP_INTERVAL
+        deadline = time.monotonic() + 2.0
+        while not tracer.dumps and time.monotonic() < deadline:
+            time.sleep(0.01)
+        files = os.listdir(directory)
+        assert len(files) == 1 and files[0].endswith('-slow_verdict.json'), files
+        with open(os.path.join(directory, files[0])) as f:
+            trace = json.load(f)
+        assert trace['otherData']['reason'] == 'slow_verdict'
+        print("✓ One dump per slow verdict burst")
+
+        path = tracer.dump('manual')
+        assert os.path.exists(path) and len(os.listdir(directory)) == 2
+        print("✓ Manual dump written next to it")
+
+def main():
+    """Run all tests"""
+    print("=== Event Tracing Test Suite ===\n")
+
+    try:
+        test_ring_buffer()
+        test_traced_and_timers()
+        test_slow_verdict_dump()
+
+        print("\n=== All Tests Passed! ===")
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
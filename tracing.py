@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Event Tracing for Wire Checker
+Records what the station was doing (scan loop phases, sqlite calls, audio
+cues, Tk redraws) as begin/end spans in a ring buffer holding the most
+recent events, and writes them as Chrome trace JSON. Open a dump in
+chrome://tracing or https://ui.perfetto.dev to see the timeline of the last
+seconds before an incident, one row per thread.
+
+Off unless WIRE_CHECKER_TRACE=1; while off, traced functions run straight
+through. A trace is written to traces/:
+- when a scan loop pass takes longer than WIRE_CHECKER_TRACE_SLOW_MS
+  (default 300 ms), at most once per SLOW_DUMP_INTERVAL
+- on SIGUSR2, sent by: python3 tracing.py [--pid PID]
+"""
+
+import argparse
+import functools
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+import instrumentation
+
+TRACE_ENV = 'WIRE_CHECKER_TRACE'
+SLOW_VERDICT_ENV = 'WIRE_CHECKER_TRACE_SLOW_MS'
+TRACE_DIR = 'traces'
+
+# Spans kept; at a few spans per scan this covers well over a minute
+TRACE_EVENTS = 20000
+
+# A scan loop pass slower than this dumps the buffer (seconds)
+SLOW_VERDICT = 0.3
+
+# Least time between two slow-verdict dumps (seconds)
+SLOW_DUMP_INTERVAL = 30.0
+
+# Traces kept in TRACE_DIR; older ones are removed
+MAX_TRACE_FILES = 20
+
+# Longest wait for a running station to write its trace (seconds)
+DUMP_TIMEOUT = 3.0
+
+class _NoSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NO_SPAN = _NoSpan()
+
+class _Span:
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.complete(self.name, self.category, self.started,
+                             time.perf_counter() - self.started, self.args)
+        return False
+
+class Tracer:
+    """Ring buffer of complete spans, dumped as Chrome trace JSON"""
+
+    def __init__(self, capacity=TRACE_EVENTS, slow_verdict=None, trace_dir=TRACE_DIR):
+        self.events = deque(maxlen=capacity)
+        self.thread_names = {}
+        self.enabled = False
+        if slow_verdict is None:
+            slow_verdict = float(os.environ.get(SLOW_VERDICT_ENV, SLOW_VERDICT * 1000)) / 1000
+        self.slow_verdict = slow_verdict
+        self.trace_dir = trace_dir
+        self.last_slow_dump = None
+        self.dumps = 0
+
+    def enable(self, enabled=True):
+        """Start or stop recording; the scan loop phase timers feed the tracer"""
+        self.enabled = enabled
+        instrumentation.timers.tracer = self if enabled else None
+
+    def complete(self, name, category, started, duration, args=None):
+        """Record a span that started at perf_counter() time started"""
+        if not self.enabled:
+            return
+        thread = threading.current_thread()
+        tid = thread.ident
+        if tid not in self.thread_names:
+            self.thread_names[tid] = thread.name
+        event = {'name': name, 'cat': category, 'ph': 'X', 'tid': tid,
+                 'ts': round(started * 1e6, 1), 'dur': round(duration * 1e6, 1)}
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+        if name == 'loop' and duration > self.slow_verdict:
+            now = time.monotonic()
+            if self.last_slow_dump is None or now - self.last_slow_dump > SLOW_DUMP_INTERVAL:
+                self.last_slow_dump = now
+                self.dump_async('slow_verdict')
+
+    def span(self, name, category, args=None):
+        """Context manager timing a block; free while disabled"""
+        if not self.enabled:
+            return NO_SPAN
+        return _Span(self, name, category, args)
+
+    def chrome_trace(self, reason):
+        """The buffered spans as a Chrome trace document"""
+        pid = os.getpid()
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                   'args': {'name': name}}
+                  for tid, name in list(self.thread_names.items())]
+        for event in list(self.events):
+            event = dict(event)
+            event['pid'] = pid
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'reason': reason, 'dumped_at': datetime.now().isoformat()}}
+
+    def dump(self, reason='manual', path=None):
+        """Write the buffer to path (default: a new file in trace_dir)"""
+        trace = self.chrome_trace(reason)
+        if path is None:
+            os.makedirs(self.trace_dir, exist_ok=True)
+            stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+            path = os.path.join(self.trace_dir, f'trace-{stamp}-{reason}.json')
+        # Written under a temporary name so a reader never sees half a file
+        with open(path + '.tmp', 'w') as f:
+            json.dump(trace, f)
+        os.replace(path + '.tmp', path)
+        self.dumps += 1
+        self._prune()
+        print(f"Trace written to {path} ({len(trace['traceEvents'])} events, {reason})")
+        return path
+
+    def dump_async(self, reason):
+        """Dump from a background thread so the caller is not held up by file I/O"""
+        def run():
+            try:
+                self.dump(reason)
+            except Exception as e:
+                print(f"Error writing trace: {e}")
+        threading.Thread(target=run, name='trace-dump', daemon=True).start()
+
+    def _prune(self):
+        try:
+            names = sorted(name for name in os.listdir(self.trace_dir)
+                           if name.startswith('trace-') and name.endswith('.json'))
+        except OSError:
+            return
+        for name in names[:-MAX_TRACE_FILES]:
+            try:
+                os.remove(os.path.join(self.trace_dir, name))
+            except OSError:
+                pass
+
+# Shared by every subsystem of this process
+tracer = Tracer()
+
+def traced(category, name=None):
+    """Decorator recording each call as a span while tracing is on"""
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.complete(label, category, started, time.perf_counter() - started)
+        return wrapper
+    return decorate
+
+def install_dump_signal():
+    """Write a trace on SIGUSR2 (the station's pid is noted by instrumentation)"""
+    if not hasattr(signal, 'SIGUSR2') or threading.current_thread() is not threading.main_thread():
+        return False
+
+    def on_signal(signum, frame):
+        if tracer.enabled:
+            tracer.dump_async('signal')
+        else:
+            print("Trace requested but tracing is off (WIRE_CHECKER_TRACE=1)")
+
+    signal.signal(signal.SIGUSR2, on_signal)
+    return True
+
+if os.environ.get(TRACE_ENV, '') not in ('', '0'):
+    tracer.enable()
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a trace from a running wire checker")
+    parser.add_argument('--pid', type=int,
+                        help=f"station process (default: from {instrumentation.PID_FILE})")
+    args = parser.parse_args()
+
+    pid = args.pid
+    if pid is None:
+        try:
+            with open(instrumentation.PID_FILE, 'r') as f:
+                pid = int(f.read().strip())
+        except (OSError, ValueError):
+            print(f"No running wire checker found ({instrumentation.PID_FILE} missing) - pass --pid")
+            sys.exit(1)
+
+    def traces():
+        if not os.path.isdir(TRACE_DIR):
+            return set()
+        return set(os.listdir(TRACE_DIR))
+
+    before = traces()
+    try:
+        os.kill(pid, signal.SIGUSR2)
+    except OSError as e:
+        print(f"Could not signal process {pid}: {e}")
+        sys.exit(1)
+
+    deadline = time.monotonic() + DUMP_TIMEOUT
+    while True:
+        new = sorted(name for name in traces() - before if name.endswith('-signal.json'))
+        if new:
+            break
+        if time.monotonic() > deadline:
+            print(f"Process {pid} did not write a trace (is WIRE_CHECKER_TRACE=1 set?)")
+            sys.exit(1)
+        time.sleep(0.05)
+
+    path = os.path.join(TRACE_DIR, new[-1])
+    print(f"✓ {path} - open it in https://ui.perfetto.dev or chrome://tracing")
+
+if __name__ == '__main__':
+    main()
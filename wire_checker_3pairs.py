@@ -7,6 +7,16 @@ import os
 import subprocess
 import sys
 from database_manager import DatabaseManager
+from gpio_backend import get_backend
+from settle_calibration import load_settle_times, save_settle_times
+from actuator_scheduler import ActuatorScheduler
+from screen_router import CheckerRunner
+from scan_worker import ScanWorker, scan_worker_enabled
+import startup_profile
+from instrumentation import timers, DebugOverlay, install_dump_signal
+import tracing
+from scan_engine import ScanEngine, InsertionWatcher, HoldWatcher
+from inspections import InspectionTracker
 
 # GPIO pin assignments
 RED_LED = 2
@@ -23,10 +33,15 @@ WIRE_PAIRS = [
     (9, 11)    # Pair 3
 ]
 
+# Key of this product's settle budgets in settle_times.json
+SETTLE_PRODUCT = "3-pairs"
+
 # Global variables for status
 current_status = "INITIALIZING"
 status_lock = threading.Lock()
-buzzer_lock = threading.Lock()
+
+# Insert, verdict and removal of the harness in the fixture
+inspection_tracker = InspectionTracker()
 
 # Cycle management
 cycle_id = os.environ.get('WIRE_CHECKER_CYCLE_ID', None)
@@ -47,125 +62,62 @@ GPIO.setup(BUZZER, GPIO.OUT)
 GPIO.setup(SOLENOID, GPIO.OUT)
 GPIO.setup(SOLENOID2, GPIO.OUT)
 
-# Setup all output pins
-for output_pin, input_pin in WIRE_PAIRS:
-    GPIO.setup(output_pin, GPIO.OUT)
-    GPIO.setup(input_pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+# Setup all harness pins (idle as pulled-down inputs between drive steps)
+settle_times = load_settle_times(SETTLE_PRODUCT)
+scan_engine = ScanEngine(get_backend(GPIO), WIRE_PAIRS, settle_times=settle_times)
+insertion_watcher = InsertionWatcher(scan_engine)
+hold_watcher = HoldWatcher(scan_engine)
+
+# With WIRE_CHECKER_SCAN_WORKER=1 the scan loop runs in its own process and
+# scan_engine only describes the harness; the worker claims the pins. The
+# worker re-imports the main script, so a checker run on its own scans on a thread
+scan_worker = (ScanWorker(WIRE_PAIRS, settle_times, SETTLE_PRODUCT)
+               if scan_worker_enabled() and __name__ != '__main__' else None)
+if scan_worker is None:
+    scan_engine.setup_pins()
 
 # Initialize buzzer and solenoid to silent/off state
 GPIO.output(BUZZER, GPIO.HIGH)
 GPIO.output(SOLENOID, GPIO.HIGH)
 GPIO.output(SOLENOID2, GPIO.HIGH)
 
+def make_actuators():
+    """LEDs, buzzer and solenoids driven from their own thread, so a beep
+    pattern never holds up the scan loop or status_lock"""
+    return ActuatorScheduler(GPIO, {'red': RED_LED, 'yellow': YELLOW_LED, 'green': GREEN_LED,
+                                    'buzzer': BUZZER, 'solenoid': SOLENOID,
+                                    'solenoid2': SOLENOID2},
+                             inverted={'buzzer'})
+
+# Its thread runs from start_checker to stop_checker, so in the station
+# only the checker on screen drives the shared output pins
+actuators = make_actuators()
+
 def buzzer_control(enable):
     """Control buzzer - True to turn on, False to turn off"""
-    with buzzer_lock:
-        if enable:
-            GPIO.output(BUZZER, GPIO.LOW)
-        else:
-            GPIO.output(BUZZER, GPIO.HIGH)
+    actuators.set(buzzer=enable)
 
 def solenoid_control(enable):
     """Control solenoid - True to turn on, False to turn off"""
     if enable:
-        GPIO.output(SOLENOID, GPIO.HIGH)
+        actuators.set(solenoid=True)
     else:
-        GPIO.output(SOLENOID, GPIO.LOW)
+        actuators.set(solenoid=False)
 
 def solenoid2_control(enable):
     """Control solenoid2 - True to turn on, False to turn off"""
     if enable:
-        GPIO.output(SOLENOID2, GPIO.HIGH)
+        actuators.set(solenoid2=True)
     else:
-        GPIO.output(SOLENOID2, GPIO.LOW)
+        actuators.set(solenoid2=False)
 
 def beep_once():
     """Make one beep sound"""
-    buzzer_control(True)
-    time.sleep(0.1)
-    buzzer_control(False)
+    actuators.beep()
 
 def beep_multiple(times):
     """Make multiple beep sounds"""
-    for _ in range(times):
-        beep_once()
-        time.sleep(0.1)  # Small pause between beeps
-
-def test_wire_pair(output_pin, input_pin):
-    """Test if a wire pair is properly connected"""
-    # Send HIGH signal
-    GPIO.output(output_pin, GPIO.HIGH)
-    time.sleep(0.01)
-    high_received = GPIO.input(input_pin)
-    
-    # Send LOW signal
-    GPIO.output(output_pin, GPIO.LOW)
-    time.sleep(0.01)
-    low_received = GPIO.input(input_pin)
-    
-    # Return True if properly connected (HIGH when output is HIGH, LOW when output is LOW)
-    return high_received and not low_received
-
-def test_cross_connections():
-    """Test for cross connections between different pairs"""
-    cross_connections = []
-    
-    # Test if output from one pair affects input of another pair
-    for i, (out1, in1) in enumerate(WIRE_PAIRS):
-        for j, (out2, in2) in enumerate(WIRE_PAIRS):
-            if i != j:  # Don't test same pair
-                # Test if output from pair i affects input of pair j
-                GPIO.output(out1, GPIO.HIGH)
-                time.sleep(0.01)
-                if GPIO.input(in2):  # Cross connection detected
-                    cross_connections.append((i, j))
-                GPIO.output(out1, GPIO.LOW)
-                time.sleep(0.01)
-    
-    return cross_connections
-
-def test_in_to_in_connections():
-    """Test if any input pins are connected to each other"""
-    input_pins = [in_pin for _, in_pin in WIRE_PAIRS]
-    in_to_in_connections = []
-    
-    for i, in1 in enumerate(input_pins):
-        for j, in2 in enumerate(input_pins):
-            if i != j:
-                # Set one input as output temporarily to test connection
-                GPIO.setup(in1, GPIO.OUT)
-                GPIO.output(in1, GPIO.HIGH)
-                time.sleep(0.01)
-                if GPIO.input(in2):  # IN-to-IN connection detected
-                    in_to_in_connections.append((i, j))
-                GPIO.output(in1, GPIO.LOW)
-                GPIO.setup(in1, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)  # Restore as input
-    
-    return in_to_in_connections
-
-def test_out_to_out_connections():
-    """Test if any output pins are connected to each other"""
-    output_pins = [out_pin for out_pin, _ in WIRE_PAIRS]
-    out_to_out_connections = []
-    
-    for i, out1 in enumerate(output_pins):
-        for j, out2 in enumerate(output_pins):
-            if i != j:
-                # Set one output to HIGH, other to LOW, then check if they're connected
-                GPIO.output(out1, GPIO.HIGH)
-                GPIO.output(out2, GPIO.LOW)
-                time.sleep(0.01)
-                
-                # If they're connected, the HIGH should override the LOW
-                # We can detect this by temporarily setting out2 as input
-                GPIO.setup(out2, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
-                time.sleep(0.01)
-                if GPIO.input(out2):  # OUT-to-OUT connection detected
-                    out_to_out_connections.append((i, j))
-                GPIO.setup(out2, GPIO.OUT)  # Restore as output
-                GPIO.output(out2, GPIO.LOW)
-    
-    return out_to_out_connections
+    actuators.beep(times)
 
 def wire_checker_loop():
     """Main wire checker loop running in background thread"""
@@ -173,45 +125,59 @@ def wire_checker_loop():
     previous_status = None
     
     while True:
+        # Parked while this checker's screen is not shown; a resumed loop
+        # starts a fresh status sequence
+        if checker_runner.checkpoint():
+            previous_status = None
+        
         try:
-            # Test each pair individually
-            pair_results = []
-            for output_pin, input_pin in WIRE_PAIRS:
-                is_connected = test_wire_pair(output_pin, input_pin)
-                pair_results.append(is_connected)
+            if scan_worker:
+                # Scanned in the worker process: take the next scan it publishes
+                result = scan_worker.next_result(0.5)
+                if result is None:
+                    continue
+                pass_started = timers.start()
+                timers.record('scan', scan_worker.last_scan_seconds)
+                timers.record('classify', scan_worker.last_classify_seconds)
+            else:
+                # Single pass: every pair, cross, IN-to-IN and OUT-to-OUT result
+                # comes from the same connectivity matrix
+                pass_started = timers.start()
+                result = scan_engine.scan()
+                timers.stop('scan', pass_started)
+                timers.record('classify', scan_engine.classify_seconds)
             
-            # Test for various types of cross connections
-            cross_connections = test_cross_connections()
-            in_to_in_connections = test_in_to_in_connections()
-            out_to_out_connections = test_out_to_out_connections()
+            # Some pin's samples were too split to outvote: rescan rather
+            # than commit a status, cycle count or cue from a glitch
+            if not result.is_stable:
+                continue
+            timers.count_scan()
+            startup_profile.finish()  # First scan after a cold boot
+            
+            # Re-measure settle budgets once reads get unstable, using the
+            # harness that just passed as the reference
+            if scan_engine.recalibration_due and result.verdict == "GOOD":
+                save_settle_times(scan_engine.recalibrate(), SETTLE_PRODUCT)
             
             # Determine status
-            all_connected = all(pair_results)
-            any_open = not all_connected
-            has_cross_connections = (len(cross_connections) > 0 or 
-                                   len(in_to_in_connections) > 0 or 
-                                   len(out_to_out_connections) > 0)
+            all_connected = result.all_connected
+            has_cross_connections = result.has_cross_connections
             
             with status_lock:
+                started = timers.start()
                 if has_cross_connections:
                     current_status = "NOT GOOD"
-                    GPIO.output(RED_LED, GPIO.HIGH)
-                    GPIO.output(GREEN_LED, GPIO.LOW)
-                    GPIO.output(YELLOW_LED, GPIO.LOW)
+                    actuators.set(red=True, green=False, yellow=False)
                     solenoid_control(True)  # Turn off solenoid
                     solenoid2_control(False)  # Turn on solenoid2
                 elif all_connected:
                     current_status = "GOOD"
-                    GPIO.output(GREEN_LED, GPIO.HIGH)
-                    GPIO.output(RED_LED, GPIO.LOW)
-                    GPIO.output(YELLOW_LED, GPIO.LOW)
+                    actuators.set(green=True, red=False, yellow=False)
                     solenoid_control(False)   # Turn on solenoid
                     solenoid2_control(True)  # Turn off solenoid2
                 else:
                     current_status = "OPEN"
-                    GPIO.output(YELLOW_LED, GPIO.HIGH)
-                    GPIO.output(RED_LED, GPIO.LOW)
-                    GPIO.output(GREEN_LED, GPIO.LOW)
+                    actuators.set(yellow=True, red=False, green=False)
                     solenoid_control(False)  # Turn off solenoid
                     solenoid2_control(False)  # Turn off solenoid2
                 # Only beep when status changes
@@ -222,10 +188,19 @@ def wire_checker_loop():
                         beep_multiple(5)
                     # No beep for OPEN or INITIALIZING
                 
-                # Update cycle counts in database
+                timers.stop('actuator', started)
+                
+                # Queue the cycle count update; the journal writes it in a batch
                 if db_manager and cycle_id and current_status != previous_status:
                     if current_status in ["GOOD", "NOT GOOD", "OPEN"]:
-                        db_manager.update_cycle_count(cycle_id, current_status)
+                        started = timers.start()
+                        db_manager.journal.append(cycle_id, current_status)
+                        timers.stop('journal_append', started)
+                
+                # One inspection row per harness, queued when it is pulled
+                inspection = inspection_tracker.observe(result)
+                if inspection and db_manager and cycle_id:
+                    db_manager.journal.append_inspection(cycle_id, inspection)
                 
                 # Increment local counters only when transitioning from OPEN
                 if previous_status == "OPEN":
@@ -235,25 +210,92 @@ def wire_checker_loop():
                         not_good_counter += 1
                 
                 previous_status = current_status
+            timers.stop('loop', pass_started)
+            # From the start of the scan; the worker timestamps its own scans
+            if scan_worker:
+                timers.record('verdict', time.time() - scan_worker.last_scan_started)
+            else:
+                timers.stop('verdict', pass_started)
             
-            time.sleep(0.5)
+            if scan_worker:
+                pass  # The worker idles in the watchers itself
+            elif result.is_empty:
+                # Empty fixture: wait for continuity instead of rescanning
+                insertion_watcher.wait()
+            elif result.verdict == "GOOD":
+                # Passed: only re-check continuity until something changes
+                hold_watcher.wait()
+            else:
+                checker_runner.pause(0.5)
             
         except Exception as e:
             print(f"Error in wire checker loop: {e}")
             time.sleep(1)
 
+# Scan loop thread; parked while this checker's screen is not shown
+checker_runner = CheckerRunner(wire_checker_loop, [insertion_watcher, hold_watcher])
+
+def start_checker(new_cycle_id=None, manager=None):
+    """Start or resume checking for a cycle with fresh status and counters"""
+    global cycle_id, db_manager, current_status, good_counter, not_good_counter, actuators
+    with status_lock:
+        cycle_id = new_cycle_id
+        if manager is not None:
+            db_manager = manager
+        elif cycle_id and db_manager is None:
+            db_manager = DatabaseManager()
+        current_status = "INITIALIZING"
+        good_counter = 0
+        not_good_counter = 0
+    if not actuators.is_alive():
+        if actuators.ident is not None:
+            actuators = make_actuators()  # a stopped thread cannot restart
+        actuators.start()
+    if scan_worker:
+        scan_worker.start()
+    else:
+        scan_engine.setup_pins()
+    checker_runner.start()
+
+def stop_checker():
+    """Park the scan loop, switch the outputs off and release the harness pins"""
+    parked = checker_runner.stop()
+    if not parked:
+        print("Wire checker loop did not park in time")
+    # A harness still in the fixture is recorded without a removal time
+    inspection = inspection_tracker.finish()
+    if inspection and db_manager and cycle_id:
+        db_manager.journal.append_inspection(cycle_id, inspection)
+    actuators.set(red=False, green=False, yellow=False, buzzer=False,
+                  solenoid=False, solenoid2=False)
+    actuators.stop()
+    if not scan_worker:
+        scan_engine.backend.release()
+    else:
+        # A loop that did not park may still be reading the worker's status
+        # block: stop the worker anyway, but leave the block to the next stop
+        scan_worker.stop(free_block=parked)
+
+def shutdown_checker():
+    """Switch everything off on exit"""
+    stop_checker()
+
 class WireCheckerUI:
-    def __init__(self, root):
-        self.root = root
+    def __init__(self, parent, router=None):
+        # parent is the Tk root when run on its own, or a screen frame
+        # inside the station's single root when shown by the screen router
+        self.router = router
+        self.root = parent.winfo_toplevel()
         self.root.title("Wire Checker Status - 3 Pairs")
-        self.root.geometry("800x600")
-        self.root.configure(bg='#f0f0f0')
-        
-        # Center the window
-        self.root.eval('tk::PlaceWindow . center')
+        if router is None:
+            self.root.geometry("800x600")
+            self.root.configure(bg='#f0f0f0')
+            
+            # Center the window
+            self.root.eval('tk::PlaceWindow . center')
         
         # Create main frame
-        main_frame = tk.Frame(root, bg='#f0f0f0')
+        main_frame = tk.Frame(parent, bg='#f0f0f0')
         main_frame.pack(expand=True, fill='both', padx=40, pady=40)
         
         # Title
@@ -329,9 +371,14 @@ class WireCheckerUI:
                                  command=self.close_cycle)
             close_btn.pack(pady=(30, 0))
         
+        # F12: loop timing overlay (turns the instrumentation on)
+        self.overlay = DebugOverlay(parent)
+        self.root.bind('<F12>', self.overlay.toggle)
+        
         # Start updating the UI
         self.update_ui()
     
+    @tracing.traced('ui')
     def update_ui(self):
         """Update the UI with current status"""
         with status_lock:
@@ -371,8 +418,16 @@ class WireCheckerUI:
         current_time = time.strftime("%H:%M:%S")
         self.last_updated_label.config(text=f"Last updated: {current_time}")
         
+        self.overlay.refresh()
+        
         # Schedule next update
-        self.root.after(500, self.update_ui)
+        self.update_job = self.root.after(500, self.update_ui)
+    
+    def close(self):
+        """Stop refreshing and park the scan loop (screen router)"""
+        self.root.after_cancel(self.update_job)
+        self.root.unbind('<F12>')
+        stop_checker()
     
     def close_cycle(self):
         """Close the current cycle and return to main menu"""
@@ -387,14 +442,18 @@ class WireCheckerUI:
                 message = f"Cycle completed!\n\nTotal Checked: {cycle_data['total_checked']}\nGood: {cycle_data['good_count']}\nNot Good: {cycle_data['not_good_count']}\nOpen: {cycle_data['open_count']}"
                 messagebox.showinfo("Cycle Complete", message)
             
-            # Close current window and return to main menu
-            self.root.destroy()
-            subprocess.run([sys.executable, 'wire_checker_main.py'])
+            # Return to main menu
+            if self.router:
+                self.router.show('main')
+            else:
+                self.root.destroy()
+                subprocess.run([sys.executable, 'wire_checker_main.py'])
 
 def main():
     # Start the wire checker in a background thread
-    wire_checker_thread = threading.Thread(target=wire_checker_loop, daemon=True)
-    wire_checker_thread.start()
+    start_checker(cycle_id)
+    install_dump_signal()  # python3 instrumentation.py dumps loop timing
+    tracing.install_dump_signal()  # python3 tracing.py writes a trace
     
     # Create and run the Tkinter UI
     root = tk.Tk()
@@ -403,12 +462,7 @@ def main():
     # Handle window close
     def on_closing():
         print("Closing Wire Checker...")
-        buzzer_control(False)  # Ensure buzzer is off
-        solenoid_control(False)  # Ensure solenoid is off
-        solenoid2_control(False)  # Ensure solenoid2 is off
-        GPIO.output(RED_LED, GPIO.LOW)
-        GPIO.output(GREEN_LED, GPIO.LOW)
-        GPIO.output(YELLOW_LED, GPIO.LOW)
+        shutdown_checker()  # Buzzer, solenoids and LEDs off
         # GPIO.cleanup()
         root.destroy()
     
@@ -21,6 +21,36 @@ if [ ! -f "wire_checker_main.py" ]; then
     exit 1
 fi
 
+# Startup is timed from here to the first scan (see startup_profile.py).
+# Fast start sets up audio, the RFID serial port and network libraries on
+# first use; set WIRE_CHECKER_FAST_START=0 to load everything up front.
+export WIRE_CHECKER_LAUNCH_TIME="$(date +%s.%N)"
+export WIRE_CHECKER_FAST_START="${WIRE_CHECKER_FAST_START:-1}"
+
+# Scan in a worker process on its own core (see scan_worker.py); set
+# WIRE_CHECKER_SCAN_WORKER=0 to scan on a thread of the UI process, or
+# WIRE_CHECKER_REALTIME=1 for SCHED_FIFO and locked memory (see realtime.py)
+export WIRE_CHECKER_SCAN_WORKER="${WIRE_CHECKER_SCAN_WORKER:-1}"
+
+# Keep the database connections open in WAL mode (see database_manager.py)
+export WIRE_CHECKER_DB_PERSISTENT="${WIRE_CHECKER_DB_PERSISTENT:-1}"
+
+# Prometheus metrics on http://<station>:9731/metrics (0 turns them off)
+export WIRE_CHECKER_METRICS_PORT="${WIRE_CHECKER_METRICS_PORT:-9731}"
+
+# --profile-startup [screen]: open a checker without a cycle, exit after its
+# first scan and report import times and the startup budget. It scans on a
+# thread: a spawned scan worker would inherit -X importtime and stderr and
+# mix its own imports into the log
+if [ "$1" = "--profile-startup" ]; then
+    echo "Profiling Wire Checker startup..."
+    rm -f startup_profile.json
+    WIRE_CHECKER_SCAN_WORKER=0 python3 -X importtime wire_checker_main.py \
+        --profile-startup ${2:-4pairs} 2> startup_importtime.log
+    python3 startup_profile.py startup_importtime.log
+    exit $?
+fi
+
 # Launch the wire checker main application
 echo "Starting Wire Checker System..."
-python3 wire_checker_main.py 
\ No newline at end of file
+python3 wire_checker_main.py
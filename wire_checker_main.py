@@ -1,9 +1,14 @@
 import tkinter as tk
 from tkinter import ttk
-import subprocess
+import argparse
+import importlib
 import sys
-import os
-from database_manager import DatabaseManager
+import time
+import startup_profile
+from instrumentation import install_dump_signal
+import tracing
+from metrics_server import StationMetrics, start_metrics_server
+from screen_router import ScreenRouter
 
 # Handle GPIO import for Windows testing
 try:
@@ -12,21 +17,27 @@ except ImportError:
     print("RPi.GPIO not found. Using mock GPIO for testing.")
     from mock_gpio import GPIO
 
+# Checker screens: router name -> (module, cycle configuration)
+CHECKERS = {
+    '3pairs': ('wire_checker_3pairs', "3-pairs"),
+    '4pairs': ('wire_checker_4pairs', "4-pairs"),
+    '4pairs_speech': ('wire_checker_4pairs_speech', "4-pairs-speech"),
+}
+
+# Longest a --profile-startup run waits for its first scan (seconds)
+PROFILE_TIMEOUT = 60.0
+
 class WireCheckerSelector:
-    def __init__(self, root):
-        self.root = root
+    def __init__(self, parent, router):
+        self.router = router
+        self.root = parent.winfo_toplevel()
         self.root.title("Wire Checker - Select Configuration")
-        self.root.geometry("1024x768")  # Optimized for 7-inch TFT
-        self.root.configure(bg='#f0f0f0')
-        
-        # Initialize database manager
-        self.db_manager = DatabaseManager()
         
-        # Center the window
-        self.root.eval('tk::PlaceWindow . center')
+        # One database connection shared by every screen
+        self.db_manager = router.db_manager
         
         # Create main frame
-        main_frame = tk.Frame(root, bg='#f0f0f0')
+        main_frame = tk.Frame(parent, bg='#f0f0f0')
         main_frame.pack(expand=True, fill='both', padx=60, pady=60)
         
         # Title
@@ -106,87 +117,132 @@ class WireCheckerSelector:
                             font=('Arial', 20),
                             width=20, height=3,
                             bg='#dc3545', fg='white',
-                            command=self.root.destroy)
+                            command=self.router.shutdown)
         exit_btn.pack(pady=(40, 0))
     
-    def run_3pairs(self):
-        """Run the 3-pair wire checker"""
+    def run_checker(self, name):
+        """Swap in a checker screen for a new cycle"""
+        configuration = CHECKERS[name][1]
         try:
             # Create new cycle
-            cycle_id = self.db_manager.create_new_cycle("3-pairs")
+            cycle_id = self.db_manager.create_new_cycle(configuration)
             
-            # Close the selector window
-            self.root.destroy()
-            
-            # Run the 3-pair wire checker with cycle ID
-            env = os.environ.copy()
-            env['WIRE_CHECKER_CYCLE_ID'] = cycle_id
-            subprocess.run([sys.executable, 'wire_checker_3pairs.py'], env=env)
+            # Checker modules stay imported, so GPIO, audio and the scan
+            # thread are only set up the first time a checker is shown
+            self.router.show(name, cycle_id=cycle_id)
             
         except Exception as e:
-            print(f"Error running 3-pair wire checker: {e}")
+            print(f"Error running {configuration} wire checker: {e}")
+            self.router.show('main')
+    
+    def run_3pairs(self):
+        """Run the 3-pair wire checker"""
+        self.run_checker('3pairs')
     
     def run_4pairs(self):
         """Run the 4-pair wire checker"""
-        try:
-            # Create new cycle
-            cycle_id = self.db_manager.create_new_cycle("4-pairs")
-            
-            # Close the selector window
-            self.root.destroy()
-            
-            # Run the 4-pair wire checker with cycle ID
-            env = os.environ.copy()
-            env['WIRE_CHECKER_CYCLE_ID'] = cycle_id
-            subprocess.run([sys.executable, 'wire_checker_4pairs.py'], env=env)
-            
-        except Exception as e:
-            print(f"Error running 4-pair wire checker: {e}")
+        self.run_checker('4pairs')
     
     def run_4pairs_speech(self):
         """Run the 4-pair wire checker with speech"""
-        try:
-            # Create new cycle
-            cycle_id = self.db_manager.create_new_cycle("4-pairs-speech")
-            
-            # Close the selector window
-            self.root.destroy()
-            
-            # Run the 4-pair speech wire checker with cycle ID
-            env = os.environ.copy()
-            env['WIRE_CHECKER_CYCLE_ID'] = cycle_id
-            subprocess.run([sys.executable, 'wire_checker_4pairs_speech.py'], env=env)
-            
-        except Exception as e:
-            print(f"Error running 4-pair speech wire checker: {e}")
+        self.run_checker('4pairs_speech')
     
     def view_statistics(self):
         """View statistics and cycle data"""
         try:
-            # Close the selector window
-            self.root.destroy()
-            
-            # Run the statistics viewer
-            subprocess.run([sys.executable, 'statistics_viewer.py'])
+            self.router.show('statistics')
             
         except Exception as e:
             print(f"Error running statistics viewer: {e}")
+            self.router.show('main')
     
     def pin_configuration(self):
         """Open pin configuration form"""
         try:
-            # Close the selector window
-            self.root.destroy()
-            
-            # Run the pin configuration form
-            subprocess.run([sys.executable, 'pin_config_form.py'])
+            # Runs as its own program (it generates and runs custom checkers);
+            # the station window comes back when it closes
+            self.router.run_external([sys.executable, 'pin_config_form.py'])
             
         except Exception as e:
             print(f"Error running pin configuration form: {e}")
 
+def checker_screen(module_name):
+    """Screen factory for a checker module, imported on first use"""
+    def factory(parent, router, cycle_id=None):
+        checker = importlib.import_module(module_name)
+        startup_profile.mark('checker_imported')
+        router.add_shutdown_hook(checker.shutdown_checker)
+        checker.start_checker(cycle_id, router.db_manager)
+        try:
+            return checker.WireCheckerUI(parent, router)
+        except Exception:
+            checker.stop_checker()
+            raise
+    return factory
+
+def checker_state(router):
+    """Status and cycle of the checker on screen, for the metrics endpoint"""
+    if router.current_name not in CHECKERS:
+        return None
+    module_name, configuration = CHECKERS[router.current_name]
+    checker = sys.modules.get(module_name)
+    if checker is None:
+        return None
+    return {'configuration': configuration, 'status': checker.current_status,
+            'cycle_id': checker.cycle_id}
+
+def statistics_screen(parent, router):
+    from statistics_viewer import StatisticsViewer
+    return StatisticsViewer(parent, router)
+
 def main():
+    parser = argparse.ArgumentParser(description="Wire Checker station")
+    parser.add_argument('--profile-startup', metavar='SCREEN', nargs='?', const='4pairs',
+                        choices=sorted(CHECKERS),
+                        help="open SCREEN without a cycle and exit after its first scan")
+    args = parser.parse_args()
+    
     root = tk.Tk()
-    app = WireCheckerSelector(root)
+    root.geometry("1024x768")  # Optimized for 7-inch TFT
+    root.configure(bg='#f0f0f0')
+    
+    # Center the window
+    root.eval('tk::PlaceWindow . center')
+    
+    # Every screen lives in this root for the life of the process
+    router = ScreenRouter(root)
+    router.register('main', WireCheckerSelector)
+    for name, (module_name, _) in CHECKERS.items():
+        router.register(name, checker_screen(module_name))
+    router.register('statistics', statistics_screen)
+    
+    root.protocol("WM_DELETE_WINDOW", router.shutdown)
+    router.show('main')
+    root.after_idle(startup_profile.mark, 'menu_shown')
+    
+    if args.profile_startup:
+        root.after_idle(router.show, args.profile_startup)
+        deadline = time.monotonic() + PROFILE_TIMEOUT
+        
+        def check_profile():
+            if startup_profile.finished.is_set():
+                router.shutdown()
+            elif time.monotonic() > deadline:
+                print("Startup profile: no scan completed")
+                router.shutdown()
+            else:
+                root.after(50, check_profile)
+        
+        root.after(50, check_profile)
+    
+    # Prometheus endpoint for fleet monitoring (WIRE_CHECKER_METRICS_PORT)
+    metrics_server = start_metrics_server(
+        StationMetrics(router.db_manager, lambda: checker_state(router)))
+    if metrics_server:
+        router.add_shutdown_hook(metrics_server.shutdown)
+    
+    install_dump_signal()  # python3 instrumentation.py dumps loop timing
+    tracing.install_dump_signal()  # python3 tracing.py writes a trace
     root.mainloop()
 
 if __name__ == '__main__':
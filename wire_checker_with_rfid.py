@@ -15,6 +15,10 @@ import tkinter as tk
 from tkinter import ttk
 import os
 from rfid_manager import get_solenoid_lock_manager
+from gpio_backend import get_backend
+from settle_calibration import load_settle_times, save_settle_times
+from actuator_scheduler import ActuatorScheduler
+from scan_engine import ScanEngine, InsertionWatcher, HoldWatcher
 
 # GPIO pin assignments
 RED_LED = 2
@@ -30,6 +34,9 @@ WIRE_PAIRS = [
     (5, 6)     # Pair 4
 ]
 
+# Key of this product's settle budgets in settle_times.json
+SETTLE_PRODUCT = "rfid"
+
 # Global variables
 current_status = "INITIALIZING"
 status_lock = threading.Lock()
@@ -39,6 +46,12 @@ not_good_counter = 0
 # RFID Lock Manager
 lock_manager = get_solenoid_lock_manager()
 
+# Connectivity scan over all harness pins
+scan_engine = ScanEngine(get_backend(GPIO), WIRE_PAIRS,
+                         settle_times=load_settle_times(SETTLE_PRODUCT))
+insertion_watcher = InsertionWatcher(scan_engine)
+hold_watcher = HoldWatcher(scan_engine)
+
 # Setup GPIO
 if RASPBERRY_PI:
     GPIO.setmode(GPIO.BCM)
@@ -49,29 +62,18 @@ if RASPBERRY_PI:
     GPIO.setup(YELLOW_LED, GPIO.OUT)
     GPIO.setup(BUZZER, GPIO.OUT)
     
-    # Setup wire pairs
-    for output_pin, input_pin in WIRE_PAIRS:
-        GPIO.setup(output_pin, GPIO.OUT)
-        GPIO.setup(input_pin, GPIO.IN, pull_up_down=GPIO.PUD_DOWN)
+    # Setup wire pairs (idle as pulled-down inputs between drive steps)
+    scan_engine.setup_pins()
     
     # Initialize outputs
     GPIO.output(BUZZER, GPIO.HIGH)
 
-def test_wire_pair(output_pin, input_pin):
-    """Test if a wire pair is properly connected"""
-    if not RASPBERRY_PI:
-        import random
-        return random.choice([True, False])
-    
-    GPIO.output(output_pin, GPIO.HIGH)
-    time.sleep(0.01)
-    high_received = GPIO.input(input_pin)
-    
-    GPIO.output(output_pin, GPIO.LOW)
-    time.sleep(0.01)
-    low_received = GPIO.input(input_pin)
-    
-    return high_received and not low_received
+# Status LEDs and buzzer are driven from their own thread; the solenoids
+# belong to the RFID lock manager
+actuators = ActuatorScheduler(GPIO, {'red': RED_LED, 'yellow': YELLOW_LED, 'green': GREEN_LED,
+                                     'buzzer': BUZZER},
+                              inverted={'buzzer'})
+actuators.start()
 
 def wire_checker_loop():
     """Main wire checker loop with RFID locking"""
@@ -80,22 +82,32 @@ def wire_checker_loop():
     
     while True:
         try:
-            # Test each pair
-            pair_results = []
-            for output_pin, input_pin in WIRE_PAIRS:
-                is_connected = test_wire_pair(output_pin, input_pin)
-                pair_results.append(is_connected)
+            # Single pass over the full connectivity matrix
+            result = scan_engine.scan()
+            
+            # Some pin's samples were too split to outvote: rescan rather
+            # than commit a status, cycle count or cue from a glitch
+            if not result.is_stable:
+                continue
             
-            # Determine status
-            all_connected = all(pair_results)
+            # Re-measure settle budgets once reads get unstable, using the
+            # harness that just passed as the reference
+            if scan_engine.recalibration_due and result.verdict == "GOOD":
+                save_settle_times(scan_engine.recalibrate(), SETTLE_PRODUCT)
             
             with status_lock:
-                if all_connected:
+                if result.has_cross_connections:
+                    current_status = "NOT GOOD"
+                    if RASPBERRY_PI:
+                        actuators.set(red=True, green=False, yellow=False)
+                    
+                    # LOCK solenoids for NOT GOOD status
+                    lock_manager.lock_solenoids("NOT GOOD - Cross connection detected")
+                
+                elif result.all_connected:
                     current_status = "GOOD"
                     if RASPBERRY_PI:
-                        GPIO.output(GREEN_LED, GPIO.HIGH)
-                        GPIO.output(RED_LED, GPIO.LOW)
-                        GPIO.output(YELLOW_LED, GPIO.LOW)
+                        actuators.set(green=True, red=False, yellow=False)
                     
                     # Unlock solenoids for GOOD status
                     if lock_manager.is_locked:
@@ -104,29 +116,22 @@ def wire_checker_loop():
                     else:
                         lock_manager.control_solenoid(True)  # Enable solenoids
                 
+                elif result.pair_mask:
+                    # Partial connection: this station locks it like a fault
+                    current_status = "NOT GOOD"
+                    if RASPBERRY_PI:
+                        actuators.set(red=True, green=False, yellow=False)
+                    
+                    # LOCK solenoids for NOT GOOD status
+                    lock_manager.lock_solenoids("NOT GOOD - Cross connection detected")
+                
                 else:
-                    # Check if any pairs are connected (partial connection)
-                    any_connected = any(pair_results)
+                    current_status = "OPEN"
+                    if RASPBERRY_PI:
+                        actuators.set(yellow=True, red=False, green=False)
                     
-                    if any_connected:
-                        current_status = "NOT GOOD"
-                        if RASPBERRY_PI:
-                            GPIO.output(RED_LED, GPIO.HIGH)
-                            GPIO.output(GREEN_LED, GPIO.LOW)
-                            GPIO.output(YELLOW_LED, GPIO.LOW)
-                        
-                        # LOCK solenoids for NOT GOOD status
-                        lock_manager.lock_solenoids("NOT GOOD - Cross connection detected")
-                        
-                    else:
-                        current_status = "OPEN"
-                        if RASPBERRY_PI:
-                            GPIO.output(YELLOW_LED, GPIO.HIGH)
-                            GPIO.output(RED_LED, GPIO.LOW)
-                            GPIO.output(GREEN_LED, GPIO.LOW)
-                        
-                        # Don't lock for OPEN status, just disable solenoids
-                        lock_manager.control_solenoid(False)
+                    # Don't lock for OPEN status, just disable solenoids
+                    lock_manager.control_solenoid(False)
                 
                 # Update counters
                 if previous_status == "OPEN":
@@ -137,7 +142,14 @@ def wire_checker_loop():
                 
                 previous_status = current_status
             
-            time.sleep(0.5)
+            if result.is_empty:
+                # Empty fixture: wait for continuity instead of rescanning
+                insertion_watcher.wait()
+            elif result.verdict == "GOOD" and not lock_manager.is_locked:
+                # Passed: only re-check continuity until something changes
+                hold_watcher.wait()
+            else:
+                time.sleep(0.5)
             
         except Exception as e:
             print(f"Error in wire checker loop: {e}")
@@ -331,9 +343,8 @@ def main():
     
     def on_closing():
         if RASPBERRY_PI:
-            GPIO.output(RED_LED, GPIO.LOW)
-            GPIO.output(GREEN_LED, GPIO.LOW)
-            GPIO.output(YELLOW_LED, GPIO.LOW)
+            actuators.set(red=False, green=False, yellow=False)
+        actuators.stop()
         root.destroy()
     
     root.protocol("WM_DELETE_WINDOW", on_closing)